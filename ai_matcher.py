@@ -0,0 +1,59 @@
+from functools import lru_cache
+import re
+
+# AI-related keywords per language; outlets pick the languages they publish in
+AI_KEYWORDS = {
+    "en": ["ChatGPT", "automated", "robot", "AI tools", "data team", "OpenAI", "Otter.ai",
+           "AI-Based", "artificial intelligence", "machine learning", "AI model",
+           "AI technology", "AI-generated", "AI-assisted"],
+    "fr": ["intelligence artificielle", "apprentissage automatique", "IA générative",
+           "outils d'IA", "outil d'IA", "modèle d'IA", "technologie d'IA",
+           "générée par l'IA", "généré par l'IA", "assisté par l'IA", "assistée par l'IA",
+           "automatisé", "automatisée", "robot", "ChatGPT", "OpenAI"],
+}
+
+
+def _normalize(text):
+    return text.lower().replace("’", "'")
+
+
+# Every keyword compiled into one case-insensitive alternation, so a text is
+# scanned once no matter how many keywords there are. Keywords only match as
+# whole words (no "robotics" for "robot"), longer keywords win over shorter
+# ones sharing a prefix, and straight and curly apostrophes are interchangeable.
+class KeywordMatcher:
+    def __init__(self, keywords):
+        self.keywords = {}
+        for kw in keywords:
+            self.keywords.setdefault(_normalize(kw), kw)
+        alternatives = [
+            re.escape(kw).replace("'", "['’]")
+            for kw in sorted(self.keywords, key=len, reverse=True)
+        ]
+        self.pattern = re.compile(
+            r"(?<!\w)(?:" + "|".join(alternatives) + r")(?!\w)", re.IGNORECASE
+        )
+
+    # Returns {keyword: [offset, ...]} for every keyword found in text, keyed by
+    # the keyword as it was declared and in order of first appearance
+    def scan(self, text):
+        matches = {}
+        for m in self.pattern.finditer(text):
+            keyword = self.keywords[_normalize(m.group(0))]
+            matches.setdefault(keyword, []).append(m.start())
+        return matches
+
+
+@lru_cache(maxsize=None)
+def matcher_for(languages=("en",)):
+    keywords = []
+    for language in languages:
+        keywords.extend(AI_KEYWORDS[language])
+    return KeywordMatcher(keywords)
+
+
+# Sheet cell for a scan result, e.g. "True - ChatGPT (2), machine learning (1)"
+def format_matches(matches):
+    if not matches:
+        return "False"
+    return "True - " + ", ".join(f"{kw} ({len(offsets)})" for kw, offsets in matches.items())
@@ -0,0 +1,104 @@
+import asyncio
+from collections import OrderedDict
+import json
+import sqlite3
+import time
+from capture_index import canonical_url
+
+AUTHOR_CACHE_DB = 'author_cache.db' # Contacts found on author profile pages, kept across runs
+AUTHOR_CACHE_TTL = 7 * 24 * 3600 # Seconds before a profile is fetched again
+AUTHOR_CACHE_MAX_ENTRIES = 1000 # Least recently used profiles beyond this are evicted
+
+
+# Contact directory keyed by canonical profile URL. A profile is fetched at most
+# once per TTL; concurrent articles by the same author share a single in-flight
+# fetch, and a stale entry is still served if refreshing it fails. Entries live
+# in an in-memory LRU backed by SQLite, so the cache survives between runs.
+class AuthorCache:
+    def __init__(self, path=AUTHOR_CACHE_DB, ttl=AUTHOR_CACHE_TTL, max_entries=AUTHOR_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            """CREATE TABLE IF NOT EXISTS profiles (
+                url TEXT PRIMARY KEY,
+                contacts TEXT,
+                fetched_at REAL,
+                last_used REAL
+            )"""
+        )
+        self.conn.commit()
+        self._entries = OrderedDict(
+            (url, (json.loads(contacts), fetched_at))
+            for url, contacts, fetched_at in self.conn.execute(
+                "SELECT url, contacts, fetched_at FROM profiles ORDER BY last_used"
+            )
+        )
+        self._inflight = {}
+        self.hits = 0
+        self.misses = 0
+        self.shared = 0
+        self.stale = 0
+
+    # Contacts for profile_url as a set; fetch() is awaited to (re)load them
+    # when the entry is missing or older than the TTL
+    async def get(self, profile_url, fetch):
+        key = canonical_url(profile_url)
+        entry = self._entries.get(key)
+        if entry is not None and time.time() - entry[1] < self.ttl:
+            self.hits += 1
+            self._touch(key)
+            return set(entry[0])
+
+        task = self._inflight.get(key)
+        if task is None:
+            self.misses += 1
+            task = asyncio.ensure_future(self._refresh(key, entry, fetch))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.shared += 1
+        # Shielded so one cancelled article never cancels the fetch others await
+        return set(await asyncio.shield(task))
+
+    async def _refresh(self, key, entry, fetch):
+        try:
+            contacts = sorted(await fetch())
+        except Exception:
+            if entry is None:
+                raise
+            # Keep serving what we had until the profile can be fetched again
+            self.stale += 1
+            return entry[0]
+        self._store(key, contacts)
+        return contacts
+
+    def _touch(self, key):
+        self._entries.move_to_end(key)
+        self.conn.execute("UPDATE profiles SET last_used = ? WHERE url = ?", (time.time(), key))
+        self.conn.commit()
+
+    def _store(self, key, contacts):
+        now = time.time()
+        self._entries[key] = (contacts, now)
+        self._entries.move_to_end(key)
+        self.conn.execute(
+            """INSERT INTO profiles (url, contacts, fetched_at, last_used) VALUES (?, ?, ?, ?)
+               ON CONFLICT(url) DO UPDATE SET
+                   contacts = excluded.contacts,
+                   fetched_at = excluded.fetched_at,
+                   last_used = excluded.last_used""",
+            (key, json.dumps(contacts), now, now)
+        )
+        while len(self._entries) > self.max_entries:
+            evicted, _ = self._entries.popitem(last=False)
+            self.conn.execute("DELETE FROM profiles WHERE url = ?", (evicted,))
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    def report(self):
+        print(f"Author cache: {self.hits} hits, {self.misses} fetches, "
+              f"{self.shared} shared in-flight fetches, {self.stale} stale entries served, "
+              f"{len(self._entries)} profiles cached")
@@ -0,0 +1,265 @@
+import argparse
+import asyncio
+from contextlib import contextmanager
+import dataclasses
+import json
+import os
+import resource
+import sys
+import tempfile
+import threading
+import time
+import capture_all
+import capture_engine
+import cbc_capture
+import globalnews_capture
+import lapresse_capture
+from http_fetch import HttpFetcher
+import metrics
+from page_pool import PagePool
+from benchmarks.fake_google import ApiProfile, FakeDriveService, FakeGoogleClients, FakeSheetsService
+from benchmarks.fixtures import synthetic_store
+from benchmarks.replay_server import (
+    RecordingPolicy, RecordingStore, RecordingTransport, ReplayPolicy, ReplayServer, ReplayTransport
+)
+
+SCRIPTS = {
+    "cbc": cbc_capture,
+    "globalnews": globalnews_capture,
+    "lapresse": lapresse_capture,
+}
+DEFAULT_ARTICLES = 12 # Articles captured per outlet
+MEMORY_SAMPLE_INTERVAL = 0.25 # Seconds between RSS samples of the browser processes
+
+
+# Peak RSS of every process under this one (the Playwright driver and Chromium),
+# sampled in a background thread; needs psutil, and reports nothing without it
+class BrowserMemorySampler:
+    def __init__(self, interval=MEMORY_SAMPLE_INTERVAL):
+        self.interval = interval
+        self.peak_mb = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        try:
+            import psutil
+        except ImportError:
+            print("psutil is not installed, browser RSS will not be sampled")
+            return self
+        self.peak_mb = 0.0
+        me = psutil.Process()
+
+        def sample():
+            while not self._stop.is_set():
+                total = 0
+                for child in me.children(recursive=True):
+                    try:
+                        total += child.memory_info().rss
+                    except psutil.Error:
+                        pass
+                self.peak_mb = max(self.peak_mb, total / 1_000_000)
+                self._stop.wait(self.interval)
+
+        self._thread = threading.Thread(target=sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+
+@contextmanager
+def patched(module, **attrs):
+    saved = {name: getattr(module, name) for name in attrs}
+    for name, value in attrs.items():
+        setattr(module, name, value)
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            setattr(module, name, value)
+
+
+# Everything a script's main() talks to, swapped for local stand-ins: the
+# Google services, the browser's network (replayed or recorded) and the HTTP
+# fetcher's transport. Stage timings come from the run's own metrics.
+class BenchHarness:
+    def __init__(self, args, store, server):
+        self.args = args
+        self.store = store
+        self.server = server
+        self.drive = FakeDriveService(ApiProfile(
+            latency=args.drive_latency, quota_error_rate=args.quota_error_rate,
+            bandwidth_mbps=args.drive_bandwidth, seed=1
+        ))
+        self.sheets = FakeSheetsService(ApiProfile(
+            latency=args.sheets_latency, quota_error_rate=args.quota_error_rate, seed=2
+        ))
+        self.pools = []
+
+    def network_policy(self, adapter):
+        if self.server is None:
+            return RecordingPolicy(self.store, adapter.network_policy)
+        return ReplayPolicy(self.server, adapter.network_policy)
+
+    def http_fetcher(self, **kwargs):
+        if self.server is None:
+            return HttpFetcher(transport=RecordingTransport(self.store), **kwargs)
+        return HttpFetcher(transport=ReplayTransport(self.server), **kwargs)
+
+    def adapter(self, adapter):
+        return dataclasses.replace(
+            adapter, network_policy=self.network_policy(adapter), headless=not self.args.headed
+        )
+
+    @contextmanager
+    def installed(self):
+        harness = self
+        articles = self.args.articles
+
+        class TrackedPagePool(PagePool):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                harness.pools.append(self)
+
+        async def extract_article_links(page, adapter):
+            return (await extract(page, adapter))[:articles]
+
+        extract = capture_engine.extract_article_links
+        with patched(capture_engine, PagePool=TrackedPagePool, HttpFetcher=self.http_fetcher,
+                     authenticate_google_services=lambda: (FakeGoogleClients(), self.drive, self.sheets),
+                     extract_article_links=extract_article_links):
+            yield
+
+    # Run one script's main(), or capture_all's with name "all"
+    async def run(self, name):
+        if name == "all":
+            adapters = [self.adapter(a) for a in capture_all.ADAPTERS]
+            context = patched(capture_all, ADAPTERS=adapters)
+            main = capture_all.main
+        else:
+            adapters = [self.adapter(SCRIPTS[name].ADAPTER)]
+            context = patched(SCRIPTS[name], ADAPTER=adapters[0])
+            main = SCRIPTS[name].main
+
+        sampler = BrowserMemorySampler().start()
+        started = time.monotonic()
+        with self.installed(), context:
+            await main()
+        elapsed = time.monotonic() - started
+        sampler.stop()
+
+        articles = self.sheets.rows_written()
+        recorded = metrics.RUN_METRICS
+        return {
+            "script": name,
+            "articles": articles,
+            "elapsed_s": round(elapsed, 1),
+            "articles_per_min": round(articles / elapsed * 60, 1) if elapsed else 0.0,
+            "stages": recorded.summary(by_site=False),
+            "stages_by_site": {f"{site}/{stage}": s for (site, stage), s in recorded.summary().items()},
+            "counters": {
+                counter + "".join(f" {k}={v}" for k, v in labels): value
+                for (counter, labels), value in sorted(recorded.counters.items())
+            },
+            "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+            "peak_browser_rss_mb": None if sampler.peak_mb is None else round(sampler.peak_mb, 1),
+            "peak_js_heap_mb": round(max((p.peak_heap_mb for p in self.pools), default=0.0), 1),
+            "contexts": [{"site": p.label, **s} for p in self.pools for s in p.stats()],
+            "drive": {"calls": self.drive.profile.calls, "quota_errors": self.drive.profile.quota_errors,
+                      "files": self.drive.files_created, "bytes": self.drive.bytes_uploaded},
+            "sheets": {"calls": self.sheets.profile.calls, "quota_errors": self.sheets.profile.quota_errors},
+            "unrecorded_requests": sum(getattr(a.network_policy, "unrecorded", 0) for a in adapters),
+        }
+
+
+def print_result(result):
+    print(f"\n=== {result['script']}: {result['articles']} articles in {result['elapsed_s']}s "
+          f"({result['articles_per_min']} articles/min) ===")
+    print(f"{'stage':<16}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'total s':>10}")
+    for stage, s in result["stages"].items():
+        print(f"{stage:<16}{s['count']:>7}{s['p50_ms']:>10}{s['p95_ms']:>10}{s['total_s']:>10}")
+    browser = result["peak_browser_rss_mb"]
+    print(f"Peak RSS: {result['peak_rss_mb']} MB Python, "
+          f"{'n/a' if browser is None else browser} MB browser, "
+          f"{result['peak_js_heap_mb']} MB JS heap per context")
+    print(f"Drive: {result['drive']['calls']} calls, {result['drive']['quota_errors']} quota errors; "
+          f"Sheets: {result['sheets']['calls']} calls, {result['sheets']['quota_errors']} quota errors; "
+          f"{result['unrecorded_requests']} unrecorded requests aborted")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Run the capture scripts end to end against replayed sites and fake Google APIs."
+    )
+    parser.add_argument("--scripts", nargs="+", default=list(SCRIPTS),
+                        choices=[*SCRIPTS, "all"], help="scripts whose main() to run; 'all' runs capture_all.py")
+    parser.add_argument("--articles", type=int, default=DEFAULT_ARTICLES, help="articles captured per outlet")
+    parser.add_argument("--recordings", help="replay this recording directory instead of synthetic pages")
+    parser.add_argument("--record", metavar="DIR", help="capture the live sites and save what they served to DIR")
+    parser.add_argument("--origin-latency", type=float, default=0.05, help="seconds added to each replayed response")
+    parser.add_argument("--drive-latency", type=float, default=0.3, help="seconds per fake Drive call")
+    parser.add_argument("--drive-bandwidth", type=float, default=50.0, help="fake Drive upload speed in Mbit/s")
+    parser.add_argument("--sheets-latency", type=float, default=0.4, help="seconds per fake Sheets call")
+    parser.add_argument("--quota-error-rate", type=float, default=0.0,
+                        help="share of fake Google calls that fail with 429")
+    parser.add_argument("--headed", action="store_true", help="show the browser")
+    parser.add_argument("--out", help="also write the results as JSON to this file")
+    return parser.parse_args(argv)
+
+
+async def run_benchmarks(args):
+    server = None
+    if args.record:
+        store = RecordingStore()
+    elif args.recordings:
+        store = RecordingStore.load(args.recordings)
+    else:
+        sites = [a.file_prefix for a in capture_all.ADAPTERS] if "all" in args.scripts else args.scripts
+        store = synthetic_store(sites, args.articles)
+    if not args.record:
+        server = ReplayServer(store, latency=args.origin_latency).start()
+        print(f"Replaying {len(store)} responses from {server.base_url}")
+
+    results = []
+    try:
+        for name in args.scripts:
+            results.append(await BenchHarness(args, store, server).run(name))
+    finally:
+        if server is not None:
+            server.stop()
+    if args.record:
+        store.save(args.record)
+        print(f"Recorded {len(store)} responses to {args.record}")
+    return results
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    for name in ("recordings", "record", "out"):
+        if getattr(args, name):
+            setattr(args, name, os.path.abspath(getattr(args, name)))
+
+    # Index, author cache and snapshots are written relative to the working
+    # directory, so every benchmark starts from an empty one
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="capture-bench-") as workdir:
+        os.chdir(workdir)
+        try:
+            results = asyncio.run(run_benchmarks(args))
+        finally:
+            os.chdir(cwd)
+
+    for result in results:
+        print_result(result)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.out}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
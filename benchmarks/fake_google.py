@@ -0,0 +1,126 @@
+import itertools
+import random
+import threading
+import time
+import httplib2
+from googleapiclient.errors import HttpError
+
+
+# Stands in for google_clients.GoogleClients: no token, no connections
+class FakeGoogleClients:
+    def close(self):
+        pass
+
+
+# Latency and failure profile for a fake Google API. Every call sleeps
+# `latency` seconds (+/- jitter) plus its payload over `bandwidth_mbps`, and
+# fails with a 429 quota error with probability `quota_error_rate`.
+class ApiProfile:
+    def __init__(self, latency=0.2, jitter=0.05, quota_error_rate=0.0, bandwidth_mbps=50.0, seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.quota_error_rate = quota_error_rate
+        self.bandwidth_mbps = bandwidth_mbps
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.quota_errors = 0
+
+    def call(self, payload_bytes=0):
+        with self._lock:
+            self.calls += 1
+            delay = self.latency + self._random.uniform(-self.jitter, self.jitter)
+            fail = self._random.random() < self.quota_error_rate
+            if fail:
+                self.quota_errors += 1
+        delay += payload_bytes * 8 / (self.bandwidth_mbps * 1_000_000)
+        time.sleep(max(0.0, delay))
+        if fail:
+            raise HttpError(httplib2.Response({"status": 429}), b'{"error": "rateLimitExceeded"}')
+
+
+class _Request:
+    def __init__(self, profile, result, payload_bytes=0):
+        self.profile = profile
+        self.result = result
+        self.payload_bytes = payload_bytes
+
+    def execute(self):
+        self.profile.call(self.payload_bytes)
+        return self.result() if callable(self.result) else self.result
+
+
+# Resumable upload: every next_chunk() sends one chunk of the MediaIoBaseUpload
+class _UploadRequest:
+    def __init__(self, profile, media, file_id):
+        self.profile = profile
+        self.media = media
+        self.file_id = file_id
+        self.offset = 0
+
+    def next_chunk(self):
+        size = self.media.size()
+        chunk = min(self.media.chunksize(), size - self.offset)
+        self.profile.call(chunk)
+        self.offset += chunk
+        if self.offset >= size:
+            return None, {'id': self.file_id}
+        return None, None
+
+
+# Stand-in for build('drive', 'v3'): folder creation and resumable uploads
+class FakeDriveService:
+    def __init__(self, profile=None):
+        self.profile = profile or ApiProfile()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self.files_created = 0
+        self.bytes_uploaded = 0
+
+    def files(self):
+        return self
+
+    def _next_id(self):
+        with self._lock:
+            self.files_created += 1
+            return f"fake-file-{next(self._ids)}"
+
+    def create(self, body=None, media_body=None, fields=None):
+        file_id = self._next_id()
+        if media_body is None:
+            return _Request(self.profile, {'id': file_id})
+        with self._lock:
+            self.bytes_uploaded += media_body.size()
+        return _UploadRequest(self.profile, media_body, file_id)
+
+
+# Stand-in for build('sheets', 'v4'): header updates and row appends
+class FakeSheetsService:
+    def __init__(self, profile=None):
+        self.profile = profile or ApiProfile()
+        self._lock = threading.Lock()
+        self.rows = {}
+
+    def spreadsheets(self):
+        return self
+
+    def values(self):
+        return self
+
+    def update(self, spreadsheetId=None, range=None, valueInputOption=None, body=None):
+        return _Request(self.profile, {'updatedRows': 1})
+
+    def append(self, spreadsheetId=None, range=None, valueInputOption=None,
+               insertDataOption=None, body=None):
+        rows = body['values']
+        sheet = range.split("!", 1)[0]
+
+        def result():
+            with self._lock:
+                self.rows.setdefault(sheet, []).extend(rows)
+            return {'updates': {'updatedRows': len(rows)}}
+
+        return _Request(self.profile, result)
+
+    def rows_written(self):
+        return sum(len(rows) for rows in self.rows.values())
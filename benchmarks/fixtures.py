@@ -0,0 +1,185 @@
+import json
+import random
+from benchmarks.replay_server import RecordingStore
+
+# Synthetic pages for a replayed run when no recordings are available. They
+# carry the markup each outlet's selectors, link pattern and media triggers look
+# for, with article-sized bodies, so every stage of a capture does real work.
+
+PARAGRAPHS_PER_ARTICLE = 30
+WORDS = (
+    "council budget province federal election minister housing transit climate "
+    "hospital school report police court community winter market health data "
+    "artificial intelligence research funding announcement residents families"
+).split()
+
+STYLESHEET = """
+body { font-family: Georgia, serif; margin: 0 auto; max-width: 900px; line-height: 1.5; }
+header, footer { background: #222; color: #eee; padding: 1em; }
+article p { margin: 0 0 1em; }
+.hero { width: 100%; height: 480px; background: #ccd; }
+"""
+
+# 1x1 transparent PNG, served for every image URL the fixtures reference
+PIXEL_PNG = bytes.fromhex(
+    "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+    "1f15c4890000000d49444154789c6360000002000100e221bc330000000049454e44ae426082"
+)
+
+
+def _paragraphs(rng, n, ai_every=11):
+    paragraphs = []
+    for i in range(n):
+        words = rng.choices(WORDS, k=rng.randint(40, 80))
+        if i % ai_every == ai_every - 1:
+            words.insert(5, "ChatGPT")
+        paragraphs.append(" ".join(words).capitalize() + ".")
+    return paragraphs
+
+
+def _page(title, stylesheet_url, body, head=""):
+    return (
+        "<!DOCTYPE html><html><head><meta charset='utf-8'>"
+        f"<title>{title}</title><link rel='stylesheet' href='{stylesheet_url}'>{head}</head>"
+        f"<body><header>{title}</header>{body}<footer>Footer</footer></body></html>"
+    )
+
+
+def _homepage(title, stylesheet_url, hrefs):
+    links = "".join(
+        f"<li><a href='{href}'>Story {n}</a><img src='/img/thumb-{n}.png' width='120' height='80'></li>"
+        for n, href in enumerate(hrefs)
+    )
+    return _page(title, stylesheet_url, f"<main><ul>{links}</ul></main>")
+
+
+def _add_assets(store, origin):
+    store.add(f"{origin}/static/site.css", 200, {"content-type": "text/css"}, STYLESHEET.encode())
+    return f"{origin}/static/site.css"
+
+
+# CBC: story IDs in the URL, an inline window.__INITIAL_STATE__ with player URLs
+# and a TTS button that loads an mp3 when clicked
+def add_cbc(store, articles, rng):
+    origin = "https://www.cbc.ca"
+    css = _add_assets(store, origin)
+    hrefs = [f"/news/canada/synthetic-story-{n}-1.{7000000 + n}" for n in range(articles)]
+    store.add_html(f"{origin}/news", _homepage("CBC News", css, hrefs))
+
+    for n, href in enumerate(hrefs):
+        story_id = 7000000 + n
+        state = {
+            "detail": {"content": {"id": story_id, "video": f"https://www.cbc.ca/player/play/{story_id}.5"}},
+            "author": [{"name": "Jane Reporter"}],
+            "related": [{"url": f"https://www.cbc.ca/player/play/video/{story_id}.9"} for _ in range(20)],
+            "filler": ["x" * 200 for _ in range(200)],
+        }
+        body = (
+            f"<h1>Synthetic CBC story {n}</h1>"
+            "<div class='bylineDetails'><span class='authorText'><a href='/news/author/jane'>Jane Reporter</a></span>"
+            f" · CBC News · <time>Posted: Oct 17, 2026 {n % 12 + 1}:00 AM ET</time></div>"
+            "<button class='ttsPlayIcon' onclick=\"document.body.insertAdjacentHTML('beforeend', "
+            f"'<audio src=&quot;https://www.cbc.ca/tts/story-{story_id}.mp3&quot;></audio>')\">Listen</button>"
+            "<article><div class='hero'></div>"
+            + "".join(f"<p>{p}</p>" for p in _paragraphs(rng, PARAGRAPHS_PER_ARTICLE))
+            + "</article>"
+            "<p class='authorprofile-biography'>Jane covers city hall. jane.reporter@cbc.ca</p>"
+            "<ul class='authorprofile-links'><li class='authorprofile-linkitem'>"
+            "<a class='authorprofile-item' href='https://twitter.com/janereporter'>@janereporter</a></li></ul>"
+            f"<script>window.__INITIAL_STATE__ = {json.dumps(state)};</script>"
+        )
+        store.add_html(f"{origin}{href}", _page(f"CBC story {n}", css, body))
+        store.add(f"https://www.cbc.ca/tts/story-{story_id}.mp3", 200, {"content-type": "audio/mpeg"}, b"\0" * 4096)
+
+
+# Global News: ld+json video objects, embed iframes and linked author profiles
+def add_globalnews(store, articles, rng):
+    origin = "https://globalnews.ca"
+    css = _add_assets(store, origin)
+    hrefs = [f"{origin}/news/{10800000 + n}/synthetic-story-{n}/" for n in range(articles)]
+    store.add_html(f"{origin}/", _homepage("Global News", css, hrefs))
+    store.add_html(origin, _homepage("Global News", css, hrefs))
+
+    authors = [f"reporter-{k}" for k in range(max(1, articles // 3))]
+    for slug in authors:
+        profile = (
+            f"<h1>{slug}</h1><p>Reach me at {slug}@globalnews.ca or @{slug.replace('-', '_')}</p>"
+            f"<a href='https://twitter.com/{slug.replace('-', '_')}'>Twitter</a>"
+            f"<a href='https://www.linkedin.com/in/{slug}'>LinkedIn</a>"
+            "<a href='https://twitter.com/globalnews'>Global News</a>"
+        )
+        store.add_html(f"{origin}/author/{slug}/", _page(slug, css, profile))
+
+    for n, href in enumerate(hrefs):
+        video_id = 9900000 + n
+        slug = authors[n % len(authors)]
+        jsonld = {"@type": "NewsArticle", "video": {"embedUrl": f"https://globalnews.ca/video/embed/{video_id}/"}}
+        body = (
+            f"<h1>Synthetic Global News story {n}</h1>"
+            "<div id='article-byline' class='c-byline'><div class='c-byline__attribution'>"
+            f"<span><a class='c-byline__name c-byline__link' href='/author/{slug}/'>{slug.title()}</a></span>"
+            "<span class='c-byline__source c-byline__source--hasName'>Global News</span></div>"
+            "<div class='c-byline__date--pubDate'><span>Posted October 17, 2026 6:00 am</span></div></div>"
+            "<article><div class='hero'></div>"
+            + "".join(f"<p>{p}</p>" for p in _paragraphs(rng, PARAGRAPHS_PER_ARTICLE))
+            + "<p><em>With files from The Canadian Press</em></p></article>"
+            f"<iframe class='c-video__embed' src='https://globalnews.ca/video/embed/{video_id}/?placement=article'></iframe>"
+        )
+        head = f"<script type='application/ld+json'>{json.dumps(jsonld)}</script>"
+        store.add_html(href, _page(f"Global News story {n}", css, body, head))
+        store.add_html(f"https://globalnews.ca/video/embed/{video_id}/?placement=article",
+                       "<html><body><div class='player'></div></body></html>")
+
+
+# La Presse: dated .php URLs, an authorModule linking the author profile and
+# an HLS encoding on the article video
+def add_lapresse(store, articles, rng):
+    origin = "https://www.lapresse.ca"
+    css = _add_assets(store, origin)
+    hrefs = [f"/actualites/2026-10-17/synthetic-story-{n}.php" for n in range(articles)]
+    store.add_html(f"{origin}/", _homepage("La Presse", css, hrefs))
+
+    authors = [f"journaliste-{k}" for k in range(max(1, articles // 3))]
+    for slug in authors:
+        profile = (
+            f"<h1>{slug}</h1><a href='mailto:{slug}@lapresse.ca'>Courriel</a>"
+            f"<a href='https://x.com/{slug.replace('-', '_')}'>X</a>"
+            "<a href='https://twitter.com/lp_lapresse'>La Presse</a>"
+        )
+        store.add_html(f"{origin}/auteurs/{slug}", _page(slug, css, profile))
+
+    for n, href in enumerate(hrefs):
+        slug = authors[n % len(authors)]
+        encodings = json.dumps({"application/x-mpegURL": {"src": f"https://videos.lapresse.ca/{n}/master.m3u8"}})
+        body = (
+            f"<h1 class='headlines titleModule'><span class='title'>Reportage synthétique {n}</span></h1>"
+            "<div class='authorModule'><meta itemprop='url' "
+            f"content='https://www.lapresse.ca/auteurs/{slug}'>"
+            f"<div class='authorModule__details'><span class='authorModule__name'>{slug.title()}</span>"
+            "<span class='organization authorModule__organisation' itemprop='affiliation'>La Presse</span></div></div>"
+            "<time itemprop='datePublished' datetime='2026-10-17T06:00:00-04:00'></time>"
+            "<article><div class='hero'></div>"
+            + "".join(f"<p>{p}</p>" for p in _paragraphs(rng, PARAGRAPHS_PER_ARTICLE))
+            + "<p class='credit photoModule__caption photoModule__caption--credit'>Photo La Presse</p>"
+            + f"<video data-video-encodings='{encodings}'></video></article>"
+        )
+        store.add_html(f"{origin}{href}", _page(f"La Presse {n}", css, body))
+
+
+FIXTURES = {
+    "cbc": add_cbc,
+    "globalnews": add_globalnews,
+    "lapresse": add_lapresse,
+}
+
+
+# One store with `articles` synthetic articles for each outlet (by file_prefix)
+def synthetic_store(sites, articles, seed=0):
+    store = RecordingStore()
+    rng = random.Random(seed)
+    for site in sites:
+        FIXTURES[site](store, articles, rng)
+    for n in range(articles):
+        for origin in ("https://www.cbc.ca", "https://globalnews.ca", "https://www.lapresse.ca"):
+            store.add(f"{origin}/img/thumb-{n}.png", 200, {"content-type": "image/png"}, PIXEL_PNG)
+    return store
@@ -0,0 +1,210 @@
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote, urlsplit
+import httpx
+from network_policy import NetworkPolicy
+
+# Response headers that no longer describe a body once it has been decoded
+HOP_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection"}
+
+
+def _strip_fragment(url):
+    return url.split("#", 1)[0]
+
+
+# Recorded responses keyed by URL, kept in memory and saved as one file per
+# body plus a manifest.json mapping each URL to its file, status and headers
+class RecordingStore:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.responses = {}
+
+    def add(self, url, status, headers, body):
+        headers = {k.lower(): v for k, v in headers.items() if k.lower() not in HOP_HEADERS}
+        with self._lock:
+            self.responses[_strip_fragment(url)] = (status, headers, body)
+
+    def add_html(self, url, html):
+        self.add(url, 200, {"content-type": "text/html; charset=utf-8"}, html.encode("utf-8"))
+
+    def get(self, url):
+        return self.responses.get(_strip_fragment(url))
+
+    def __contains__(self, url):
+        return _strip_fragment(url) in self.responses
+
+    def __len__(self):
+        return len(self.responses)
+
+    def save(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        manifest = {}
+        for n, (url, (status, headers, body)) in enumerate(sorted(self.responses.items())):
+            name = f"{n:05d}.bin"
+            with open(os.path.join(directory, name), "wb") as f:
+                f.write(body)
+            manifest[url] = {"file": name, "status": status, "headers": headers}
+        with open(os.path.join(directory, "manifest.json"), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=1)
+
+    @classmethod
+    def load(cls, directory):
+        store = cls()
+        with open(os.path.join(directory, "manifest.json"), encoding="utf-8") as f:
+            manifest = json.load(f)
+        for url, entry in manifest.items():
+            with open(os.path.join(directory, entry["file"]), "rb") as f:
+                store.add(url, entry["status"], entry["headers"], f.read())
+        return store
+
+
+# Serves a RecordingStore on 127.0.0.1 at /replay?u=<original url>, sleeping
+# `latency` seconds per response to stand in for the origin's round-trip
+class ReplayServer:
+    def __init__(self, store, latency=0.0):
+        self.store = store
+        self.latency = latency
+        self.served = 0
+        self.missing = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = parse_qs(urlsplit(self.path).query).get("u", [""])[0]
+                recorded = server.store.get(url)
+                if server.latency:
+                    time.sleep(server.latency)
+                if recorded is None:
+                    server.missing += 1
+                    self.send_error(404)
+                    return
+                server.served += 1
+                status, headers, body = recorded
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            do_POST = do_GET
+
+            def log_message(self, format, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def url_for(self, url):
+        return f"{self.base_url}/replay?u={quote(_strip_fragment(url), safe='')}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+# NetworkPolicy for a replayed run: requests the outlet's own policy would block
+# are still aborted (so request counts match a live run), recorded URLs are
+# fetched from the ReplayServer and everything else is aborted as unrecorded
+class ReplayPolicy(NetworkPolicy):
+    def __init__(self, server, base_policy=None):
+        base_policy = base_policy or NetworkPolicy()
+        super().__init__(base_policy.blocked_domains, base_policy.blocked_resource_types,
+                         base_policy.allowed_domains)
+        self.server = server
+        self.unrecorded = 0
+
+    # Every request has to be redirected to the ReplayServer
+    def routes_requests(self):
+        return True
+
+    async def _handle_route(self, route):
+        request = route.request
+        if self.should_block(request.url, request.resource_type):
+            await super()._handle_route(route)
+        elif request.url in self.server.store:
+            self.allowed_requests += 1
+            response = await route.fetch(url=self.server.url_for(request.url))
+            await route.fulfill(response=response)
+        else:
+            self.unrecorded += 1
+            await route.abort()
+
+    def report(self, label=""):
+        super().report(label)
+        prefix = f"[{label}] " if label else ""
+        print(f"{prefix}  {self.unrecorded} requests had no recording and were aborted")
+
+
+# NetworkPolicy for a recording run: the outlet's own policy applies as usual
+# and every allowed response is copied into `store`
+class RecordingPolicy(NetworkPolicy):
+    def __init__(self, store, base_policy=None):
+        base_policy = base_policy or NetworkPolicy()
+        super().__init__(base_policy.blocked_domains, base_policy.blocked_resource_types,
+                         base_policy.allowed_domains)
+        self.store = store
+
+    # Every allowed response has to pass through a route to be recorded
+    def routes_requests(self):
+        return True
+
+    async def _handle_route(self, route):
+        request = route.request
+        if self.should_block(request.url, request.resource_type):
+            await super()._handle_route(route)
+            return
+        self.allowed_requests += 1
+        try:
+            response = await route.fetch()
+            body = await response.body()
+        except Exception:
+            await route.abort()
+            return
+        self.store.add(request.url, response.status, response.headers, body)
+        await route.fulfill(response=response, body=body)
+
+
+# httpx transport that sends every HttpFetcher request to the ReplayServer
+class ReplayTransport(httpx.AsyncBaseTransport):
+    def __init__(self, server):
+        self.server = server
+        self._inner = httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request):
+        replayed = httpx.Request(request.method, self.server.url_for(str(request.url)))
+        return await self._inner.handle_async_request(replayed)
+
+    async def aclose(self):
+        await self._inner.aclose()
+
+
+# httpx transport that fetches live and copies every response into `store`
+class RecordingTransport(httpx.AsyncBaseTransport):
+    def __init__(self, store):
+        self.store = store
+        self._inner = httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request):
+        response = await self._inner.handle_async_request(request)
+        body = await response.aread()
+        self.store.add(str(request.url), response.status_code, dict(response.headers), body)
+        headers = {k: v for k, v in response.headers.items() if k.lower() not in HOP_HEADERS}
+        return httpx.Response(response.status_code, headers=headers, content=body, request=request)
+
+    async def aclose(self):
+        await self._inner.aclose()
@@ -0,0 +1,31 @@
+import asyncio
+from capture_engine import capture_run, capture_site, parse_run_args
+import cbc_capture
+import globalnews_capture
+import lapresse_capture
+
+ADAPTERS = [cbc_capture.ADAPTER, globalnews_capture.ADAPTER, lapresse_capture.ADAPTER]
+GLOBAL_MAX_CONCURRENT_ARTICLES = 8 # Article pages in flight across all outlets combined
+
+# Capture every outlet in one process: one headless Chromium with an isolated
+# context per outlet, one set of Google service clients and upload pool, and a
+# global budget on open article pages. Each outlet still respects its own
+# MAX_CONCURRENT_ARTICLES, which keeps any one site from starving the others of
+# the shared budget. With resume=True each outlet's interrupted run is continued.
+async def main(resume=False):
+    budget = asyncio.Semaphore(GLOBAL_MAX_CONCURRENT_ARTICLES)
+    async with capture_run("capture_all", resume=resume) as run:
+        results = await asyncio.gather(
+            *(capture_site(run.browser, adapter, run.drive_service, run.sheets_service, run.uploader,
+                           budget, run.index, run.fetcher, run.authors, run.queue)
+              for adapter in ADAPTERS),
+            return_exceptions=True
+        )
+
+    for adapter, result in zip(ADAPTERS, results):
+        if isinstance(result, Exception):
+            print(f"[{adapter.name}] Capture failed: {result}")
+
+if __name__ == "__main__":
+    args = parse_run_args("Capture every outlet in one browser.")
+    asyncio.run(main(resume=args.resume))
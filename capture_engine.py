@@ -0,0 +1,583 @@
+import argparse
+import asyncio
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+import os
+import re
+from typing import Awaitable, Callable, Optional
+from playwright.async_api import async_playwright
+from ai_matcher import format_matches, matcher_for
+from author_cache import AuthorCache
+from capture_index import CaptureIndex, FINGERPRINT_SCRIPT, canonical_url, parse_fingerprint
+from capture_pool import run_capture_pool, DEFAULT_CONCURRENCY
+from drive_uploader import DriveUploader
+from google_clients import GoogleClients
+from http_fetch import HttpFetcher
+import metrics
+from network_policy import NetworkPolicy
+from oauth_manager import CredentialManager
+from page_pool import PagePool, PAGES_PER_CONTEXT, CONTEXT_MEMORY_LIMIT_MB
+from readiness import wait_until_ready, network_idle
+from scroller import scroll_for_links, DEFAULT_MAX_SCROLLS
+from sheet_writer import SheetWriter
+from snapshots import attrs, body_text, parse_html, prune_snapshots, save_snapshot, snapshot_path
+from work_queue import ArticleState, WorkQueue
+
+PDF_MARGIN = {"top": "10mm", "bottom": "10mm", "left": "10mm", "right": "10mm"}
+
+# Artifacts are rendered to memory and uploaded from there; set this to also
+# keep a copy of each one on local disk under LOCAL_ARTIFACT_DIR
+KEEP_LOCAL_ARTIFACTS = False
+LOCAL_ARTIFACT_DIR = 'captures'
+
+# Artifact types an outlet can ask for in SiteAdapter.artifact_formats; all are
+# captured in the same page visit. JPEG/WebP use SiteAdapter.screenshot_quality.
+ARTIFACT_MIMETYPES = {
+    "pdf": "application/pdf",
+    "png": "image/png",
+    "jpeg": "image/jpeg",
+    "webp": "image/webp",
+}
+DEFAULT_ARTIFACT_FORMATS = ("pdf", "png")
+
+# Keep each article's serialized DOM (after media triggers) as gzipped HTML
+# under snapshots.SNAPSHOT_DIR, so extraction can be re-run with reextract.py;
+# snapshots older than snapshots.SNAPSHOT_RETENTION_DAYS are pruned every run
+SAVE_SNAPSHOTS = True
+
+
+# Everything the engine needs to know about one news outlet. The outlet's module
+# supplies the site-specific pieces: which homepage links are articles, how to
+# read an article in one round-trip and how to turn that into a sheet row.
+#
+#   bundle_script: JS arrow function evaluated once per article before the PDF,
+#       returning a JSON bundle with at least "title" (plus whatever byline,
+#       dates, paragraphs, links, media and contacts the outlet needs)
+#   static_bundle(url, html) -> dict, optional, extra bundle keys parsed from the
+#       article's HTML: the rendered DOM when it is read anyway (SAVE_SNAPSHOTS)
+#       or the outlet sets static_bundle_rendered, else the server HTML fetched
+#       over HTTP while the browser loads the article
+#   trigger_media(page) -> dict or None, optional, run after the PDF to expose
+#       media links; any keys it returns (e.g. media URLs seen on the network)
+#       are added to the bundle
+#   build_row(page, pages, url, bundle, fetcher, authors) -> list of sheet cells
+#       matching `header`; pages is the outlet's PagePool, fetcher the run's
+#       HttpFetcher and authors its AuthorCache, all for author profile lookups
+#   snapshot_row(url, html) -> the same row rebuilt from a saved HTML snapshot,
+#       optional, used by reextract.py without a browser
+#   filename_title(title) -> str, optional, the title as it appears in artifact
+#       file names (default safe_title_for_filename)
+#   value_input_option: how Sheets reads appended rows, "RAW" or "USER_ENTERED"
+#       (parses dates, numbers and links)
+@dataclass
+class SiteAdapter:
+    name: str
+    homepage_url: str
+    base_url: str
+    link_pattern: re.Pattern
+    file_prefix: str
+    article_file_prefix: str
+    capture_folder_id: str
+    spreadsheet_id: str
+    sheet_name: str
+    header: list
+    bundle_script: str
+    build_row: Callable[..., Awaitable[list]]
+    static_bundle: Optional[Callable[[str, str], dict]] = None
+    static_bundle_rendered: bool = False
+    trigger_media: Optional[Callable[..., Awaitable[Optional[dict]]]] = None
+    excluded_urls: set = field(default_factory=set)
+    homepage_ready_signals: list = field(default_factory=lambda: [network_idle()])
+    homepage_ready_cap_ms: int = 2000
+    article_ready_signals: list = field(default_factory=list)
+    article_ready_cap_ms: int = 2000
+    article_goto_timeout_ms: int = 60000
+    scroll_homepage: bool = True
+    homepage_max_scrolls: int = DEFAULT_MAX_SCROLLS
+    network_policy: NetworkPolicy = field(default_factory=NetworkPolicy)
+    context_options: dict = field(default_factory=dict)
+    headless: bool = True
+    max_concurrent_articles: int = DEFAULT_CONCURRENCY
+    pages_per_context: int = PAGES_PER_CONTEXT
+    context_memory_limit_mb: int = CONTEXT_MEMORY_LIMIT_MB
+    artifact_formats: tuple = DEFAULT_ARTIFACT_FORMATS
+    screenshot_quality: int = 80
+    snapshot_row: Optional[Callable[[str, str], list]] = None
+    filename_title: Optional[Callable[[str], str]] = None
+    value_input_option: str = "RAW"
+
+
+# Command line shared by the capture scripts
+def parse_run_args(description):
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--resume", action="store_true",
+                        help="continue the last interrupted run instead of starting from the homepage")
+    return parser.parse_args()
+
+
+# One CredentialManager for the whole process, refreshing the token in the
+# background, and Drive and Sheets services usable from any thread (each
+# thread calls through its own authorized client). Call clients.close() once
+# the run is over.
+def authenticate_google_services():
+    clients = GoogleClients(CredentialManager().start())
+    return clients, clients.drive(), clients.sheets()
+
+
+# Create a new folder in Google Drive with the current date
+def create_dated_capture_folder(drive_service, parent_folder_id):
+    date_str = datetime.now().strftime("%Y-%m-%d")
+    folder_metadata = {
+        'name': date_str + " Capture",
+        'mimeType': 'application/vnd.google-apps.folder',
+        'parents': [parent_folder_id],
+    }
+    folder = drive_service.files().create(
+        body=folder_metadata,
+        fields='id'
+    ).execute()
+    folder_id = folder['id']
+    print(f"Created capture folder for {date_str} with ID {folder_id}")
+    return folder_id
+
+
+async def render_pdf(page):
+    return await page.pdf(
+        format="A4",
+        print_background=True,
+        margin=PDF_MARGIN
+    )
+
+
+# WebP is not a Playwright screenshot type, so a PNG is re-encoded with Pillow
+def _png_to_webp(png_bytes, quality):
+    from io import BytesIO
+    from PIL import Image
+
+    out = BytesIO()
+    with Image.open(BytesIO(png_bytes)) as image:
+        image.save(out, format="WEBP", quality=quality)
+    return out.getvalue()
+
+
+# Render every requested artifact for the page as it is now, returning
+# (extension, bytes) pairs. Re-encoding runs in a worker thread so a large
+# full-page screenshot never holds up the event loop.
+async def render_artifacts(page, formats, quality=80):
+    artifacts = []
+    for fmt in formats:
+        with metrics.span(f"render_{fmt}"):
+            if fmt == "pdf":
+                data = await render_pdf(page)
+            elif fmt == "png":
+                data = await page.screenshot(full_page=True, type="png")
+            elif fmt == "jpeg":
+                data = await page.screenshot(full_page=True, type="jpeg", quality=quality)
+            elif fmt == "webp":
+                png = await page.screenshot(full_page=True, type="png")
+                data = await asyncio.to_thread(_png_to_webp, png, quality)
+            else:
+                raise ValueError(f"Unsupported artifact format: {fmt}")
+        artifacts.append((fmt, data))
+    return artifacts
+
+
+def _spool_to_disk(name, data):
+    os.makedirs(LOCAL_ARTIFACT_DIR, exist_ok=True)
+    with open(os.path.join(LOCAL_ARTIFACT_DIR, name), 'wb') as f:
+        f.write(data)
+
+
+# Upload a rendered artifact straight from memory, spooling it to disk first
+# only when KEEP_LOCAL_ARTIFACTS is set
+async def store_artifact(uploader, name, data, folder_id, mimetype='application/pdf'):
+    if KEEP_LOCAL_ARTIFACTS:
+        await asyncio.to_thread(_spool_to_disk, name, data)
+    return await uploader.upload(name, data, folder_id, mimetype)
+
+
+# Render and queue every artifact format the outlet wants under `basename`, or
+# only `formats` when given; returns the upload futures in the same order
+async def capture_artifacts(page, adapter, uploader, basename, folder_id, formats=None):
+    uploads = []
+    formats = adapter.artifact_formats if formats is None else formats
+    for fmt, data in await render_artifacts(page, formats, adapter.screenshot_quality):
+        name = f"{basename}.{fmt}"
+        print(f"Rendered {name}")
+        uploads.append(await store_artifact(uploader, name, data, folder_id, ARTIFACT_MIMETYPES[fmt]))
+    return uploads
+
+
+def safe_title_for_filename(title):
+    return "".join(
+        c for c in title if c.isalnum() or c in (" ", "-")
+    ).replace(" ", "_")[:60]
+
+
+# Shared AI keyword scan over the article paragraphs plus any site-specific
+# extra text blocks (e.g. CBC's AI disclosure toggletips) from the bundle.
+# Every matched keyword is reported with its count, e.g. "True - ChatGPT (2)".
+def check_ai_mention(texts, languages=("en",)):
+    return format_matches(matcher_for(tuple(languages)).scan(" ".join(t for t in texts if t)))
+
+
+# Extract all article links from the homepage, reading every href in one call
+async def extract_article_links(page, adapter):
+    await page.wait_for_selector("a")
+    hrefs = await page.eval_on_selector_all("a", "nodes => nodes.map(n => n.getAttribute('href'))")
+    article_urls = []
+    seen = set()
+
+    for href in hrefs:
+        if href:
+            full_url = href if href.startswith("http") else f"{adapter.base_url}{href}"
+            if full_url in adapter.excluded_urls:
+                continue
+            if adapter.link_pattern.match(full_url) and canonical_url(full_url) not in seen:
+                seen.add(canonical_url(full_url))
+                article_urls.append(full_url)
+
+    print(f"Extracted {len(article_urls)} relevant article URLs")
+    return article_urls
+
+
+async def capture_homepage(page, adapter, uploader, folder_id):
+    with metrics.labels(url=adapter.homepage_url), metrics.span("homepage"):
+        with metrics.span("goto"):
+            await page.goto(adapter.homepage_url, wait_until="domcontentloaded", timeout=120000)
+        with metrics.span("ready"):
+            await wait_until_ready(page, adapter.homepage_ready_signals, cap_ms=adapter.homepage_ready_cap_ms)
+        if adapter.scroll_homepage:
+            with metrics.span("scroll"):
+                await scroll_for_links(page, adapter.link_pattern, max_scrolls=adapter.homepage_max_scrolls)
+
+        article_urls = await extract_article_links(page, adapter)
+        for url in article_urls:
+            print(url)
+        metrics.count("article_links", len(article_urls))
+
+        date_str = datetime.now().strftime("%Y-%m-%d")
+        basename = f"{adapter.file_prefix}_homepage_{date_str}"
+        await capture_artifacts(page, adapter, uploader, basename, folder_id)
+        return article_urls
+
+
+# The outlet's bundle and the capture-index fingerprint, fetched in one evaluate
+def bundle_expression(adapter):
+    return f"() => ({{...({adapter.bundle_script})(), fingerprint: ({FINGERPRINT_SCRIPT})()}})"
+
+
+# Server HTML fetched over HTTP while the browser loaded the article, or the
+# rendered DOM when that fetch failed or no fetcher is in use
+async def static_html_for(page, url, fetch):
+    if fetch is not None:
+        try:
+            return await fetch
+        except Exception as e:
+            print(f"HTTP fetch of {url} failed ({e}), reading markup from the page")
+            metrics.count("static_fetch_fallbacks")
+    return await page.content()
+
+
+# Body text and every link of an author profile page, in one round-trip
+PROFILE_SCRIPT = """() => ({
+    text: document.body ? document.body.innerText : '',
+    hrefs: Array.from(document.querySelectorAll('a[href]')).map(a => a.getAttribute('href')),
+})"""
+PROFILE_READY_SIGNALS = [network_idle()]
+PROFILE_READY_CAP_MS = 1000
+
+
+# (body text, hrefs) of an author profile page. Profiles are static markup, so
+# they are fetched over HTTP; a pooled browser page is only used when that
+# fetch fails or no fetcher is in use.
+async def read_profile(pages, fetcher, url):
+    if fetcher is not None:
+        try:
+            tree = parse_html(await fetcher.get_text(url))
+            return body_text(tree), attrs(tree, "a[href]", "href")
+        except Exception as e:
+            print(f"HTTP fetch of {url} failed ({e}), opening it in the browser")
+            metrics.count("static_fetch_fallbacks")
+
+    async with pages.page() as page:
+        await page.goto(url, wait_until="domcontentloaded", timeout=60000)
+        await wait_until_ready(page, PROFILE_READY_SIGNALS, cap_ms=PROFILE_READY_CAP_MS)
+        profile = await page.evaluate(PROFILE_SCRIPT)
+        return profile["text"] or "", profile["hrefs"]
+
+
+# Record each artifact in the work queue as soon as Drive accepts it, so a
+# resumed run only uploads the ones that are still missing
+def record_uploads(run, url, uploads):
+    for fmt, upload in uploads.items():
+        def uploaded(done, fmt=fmt):
+            if not done.cancelled() and done.exception() is None:
+                run.mark_uploaded(url, fmt, done.result())
+        upload.add_done_callback(uploaded)
+
+
+# Capture-index entries waiting on their articles' sheet rows. An article is
+# only recorded in the index once its row has been appended (written(), the
+# SheetWriter's on_written) and Drive has accepted its first artifact (the PDF,
+# unless the outlet does not capture one), so an article whose row never made
+# it to the sheet is captured again by the next run instead of being skipped.
+class PendingIndex:
+    def __init__(self, index, site):
+        self.index = index
+        self.site = site
+        self._entries = {}
+
+    # upload: the first artifact's Drive file ID, or the future resolving to it
+    def add(self, url, last_modified, text_hash, upload):
+        self._entries[url] = (last_modified, text_hash, upload)
+
+    def written(self, urls):
+        for url in urls:
+            entry = self._entries.pop(url, None)
+            if entry is not None:
+                self._record(url, *entry)
+
+    def _record(self, url, last_modified, text_hash, upload):
+        if isinstance(upload, str):
+            self.index.record(url, self.site, last_modified, text_hash, upload)
+            return
+
+        def uploaded(done):
+            if not done.cancelled() and done.exception() is None:
+                self.index.record(url, self.site, last_modified, text_hash, done.result())
+        upload.add_done_callback(uploaded)
+
+
+# Returns the article's sheet row, or None when the capture index shows it has
+# not changed since a previous run. Artifact uploads run in the background; the
+# article's index entry goes to `pending` (a PendingIndex) until its row is
+# written.
+# With a work queue `run`, each stage is committed as it completes, and a
+# resumed article only repeats the stages that never finished: only artifacts
+# Drive never accepted are rendered and uploaded again, and one already
+# extracted is not re-read (nor its page opened at all, if it was uploaded too).
+# Every stage is timed as a span labelled with the article URL (see metrics.py).
+async def capture_article(pages, adapter, url, uploader, folder_id, index=None, fetcher=None,
+                          authors=None, run=None, pending=None):
+    with metrics.labels(url=url), metrics.span("article"):
+        try:
+            row = await _capture_article(pages, adapter, url, uploader, folder_id, index, fetcher,
+                                         authors, run, pending)
+        except Exception:
+            metrics.count("article_failures")
+            raise
+        metrics.count("articles_captured" if row is not None else "articles_skipped")
+        return row
+
+
+async def _capture_article(pages, adapter, url, uploader, folder_id, index, fetcher, authors, run,
+                           pending):
+    state = run.state(url) if run is not None else ArticleState(url)
+    if state.done:
+        return None
+    if state.uploaded and state.row is not None:
+        print(f"Resuming article {url}: already uploaded and extracted")
+        return None if state.written else state.row
+    fresh = not state.file_ids and state.row is None
+    print(f"{'Processing' if fresh else 'Resuming'} article {url}")
+
+    # The rendered DOM is serialized anyway when snapshots are saved, so the
+    # server HTML is only fetched when nothing else would read the markup
+    rendered = SAVE_SNAPSHOTS or adapter.static_bundle_rendered
+    fetch = None
+    if adapter.static_bundle and not rendered and fetcher is not None and state.row is None:
+        fetch = asyncio.create_task(fetcher.get_text(url))
+    try:
+        async with pages.page() as page:
+            with metrics.span("goto"):
+                await page.goto(url, wait_until="domcontentloaded", timeout=adapter.article_goto_timeout_ms)
+            with metrics.span("ready"):
+                await wait_until_ready(page, adapter.article_ready_signals, cap_ms=adapter.article_ready_cap_ms)
+
+            with metrics.span("extract_bundle"):
+                bundle = await page.evaluate(bundle_expression(adapter))
+            last_modified, text_hash = parse_fingerprint(bundle.pop("fingerprint"))
+            if fresh and index is not None and index.is_unchanged(url, last_modified, text_hash):
+                print(f"Skipping unchanged article: {url}")
+                if run is not None:
+                    run.mark_skipped(url)
+                return None
+
+            title = bundle.get("title") or "No title found"
+            print(f"Title: {title}")
+            date_str = datetime.now().strftime("%Y-%m-%d")
+            filename_title = adapter.filename_title or safe_title_for_filename
+            basename = f"{adapter.article_file_prefix}_{filename_title(title)}_{date_str}"
+            missing = [fmt for fmt in adapter.artifact_formats if fmt not in state.file_ids]
+            uploads = {}
+            if missing:
+                uploads = dict(zip(missing, await capture_artifacts(
+                    page, adapter, uploader, basename, folder_id, formats=missing
+                )))
+                if run is not None:
+                    run.mark_rendered(url, adapter.artifact_formats)
+                    record_uploads(run, url, uploads)
+            if state.row is not None:
+                return None if state.written else state.row
+
+            if adapter.trigger_media:
+                with metrics.span("trigger_media"):
+                    bundle.update(await adapter.trigger_media(page) or {})
+
+            html = None
+            if rendered and (SAVE_SNAPSHOTS or adapter.static_bundle):
+                with metrics.span("page_content"):
+                    html = await page.content()
+            if SAVE_SNAPSHOTS:
+                with metrics.span("snapshot"):
+                    path = snapshot_path(adapter.file_prefix, basename, url)
+                    await asyncio.to_thread(save_snapshot, path, url, adapter.file_prefix, html)
+
+            if adapter.static_bundle:
+                if html is None:
+                    with metrics.span("static_html"):
+                        html = await static_html_for(page, url, fetch)
+                with metrics.span("extract_static"):
+                    bundle.update(await asyncio.to_thread(adapter.static_bundle, url, html))
+
+            with metrics.span("extract_row"):
+                row = await adapter.build_row(page, pages, url, bundle, fetcher, authors)
+            if run is not None:
+                run.mark_extracted(url, row)
+            if pending is not None and adapter.artifact_formats:
+                first = adapter.artifact_formats[0]
+                pending.add(url, last_modified, text_hash, state.file_ids.get(first) or uploads[first])
+            return row
+    finally:
+        if fetch is not None and not fetch.done():
+            fetch.cancel()
+
+
+# Capture one outlet on an already running browser, in isolated contexts that its
+# PagePool recycles: homepage snapshot, then every article through the worker
+# pool with its row handed to the outlet's SheetWriter in homepage order.
+# `budget` is the scheduler's global concurrency semaphore when several outlets
+# share the browser; `index` is the capture index used to skip articles
+# archived unchanged by an earlier run; `fetcher` is the shared HttpFetcher for
+# everything read from static markup and `authors` the author contact cache.
+# `queue` is the run's WorkQueue: the article list and every article's progress
+# are persisted there, and when it is resuming, the outlet's interrupted run is
+# continued in its Drive folder instead of starting again from the homepage.
+async def capture_site(browser, adapter, drive_service, sheets_service, uploader,
+                       budget=None, index=None, fetcher=None, authors=None, queue=None):
+    with metrics.labels(site=adapter.name):
+        await _capture_site(browser, adapter, drive_service, sheets_service, uploader,
+                            budget, index, fetcher, authors, queue)
+
+
+async def _capture_site(browser, adapter, drive_service, sheets_service, uploader,
+                        budget, index, fetcher, authors, queue):
+    writer = SheetWriter(sheets_service, adapter.spreadsheet_id, adapter.sheet_name, adapter.header,
+                         value_input_option=adapter.value_input_option)
+    await writer.start()
+    run = queue.resumable_run(adapter.name) if queue is not None else None
+
+    pages = PagePool(
+        browser, adapter.context_options, adapter.network_policy, label=adapter.name,
+        pages_per_context=adapter.pages_per_context, memory_limit_mb=adapter.context_memory_limit_mb
+    )
+    try:
+        if run is not None:
+            capture_folder_id = run.folder_id
+            article_urls = run.urls()
+            print(f"[{adapter.name}] Resuming run #{run.run_id} with {len(article_urls)} article URLs")
+        else:
+            capture_folder_id = create_dated_capture_folder(drive_service, adapter.capture_folder_id)
+            async with pages.page() as page:
+                article_urls = await capture_homepage(page, adapter, uploader, capture_folder_id)
+            print(f"[{adapter.name}] Filtered {len(article_urls)} article URLs after extraction.")
+            if queue is not None:
+                run = queue.start_run(adapter.name, capture_folder_id, article_urls)
+        pending = PendingIndex(index, adapter.name) if index is not None else None
+
+        def written(urls):
+            if run is not None:
+                run.mark_written(urls)
+            if pending is not None:
+                pending.written(urls)
+        writer.on_written = written
+
+        async def capture(url):
+            row = await capture_article(
+                pages, adapter, url, uploader, capture_folder_id, index, fetcher, authors, run, pending
+            )
+            return None if row is None else (url, row)
+
+        async def write(result):
+            url, row = result
+            await writer.add(row, key=url)
+
+        await run_capture_pool(
+            article_urls, capture, concurrency=adapter.max_concurrent_articles,
+            on_result=write, budget=budget
+        )
+    finally:
+        await pages.close()
+        await writer.close()
+
+    pages.report()
+    adapter.network_policy.report(adapter.name)
+
+
+# Everything one capture run shares between its outlets
+@dataclass
+class RunResources:
+    browser: object
+    drive_service: object
+    sheets_service: object
+    uploader: DriveUploader
+    index: CaptureIndex
+    fetcher: HttpFetcher
+    authors: AuthorCache
+    queue: WorkQueue
+
+
+# Set up a capture run (Google clients, upload pool, capture index, HTTP
+# fetcher, author cache, work queue and a Chromium) and tear it all down in
+# order when the block exits: the browser first, then every queued upload is
+# drained before the work queue is closed, and the run metrics are exported
+# under run_name last.
+@asynccontextmanager
+async def capture_run(run_name, resume=False, headless=True):
+    metrics.reset()
+    prune_snapshots()
+    clients, drive_service, sheets_service = authenticate_google_services()
+    uploader = DriveUploader(drive_service)
+    index = CaptureIndex()
+    fetcher = HttpFetcher()
+    authors = AuthorCache()
+    queue = WorkQueue(resume=resume)
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=headless)
+        try:
+            yield RunResources(browser, drive_service, sheets_service, uploader, index, fetcher, authors, queue)
+        finally:
+            await browser.close()
+            await fetcher.close()
+            fetcher.report()
+            await uploader.drain()
+            uploader.close()
+            uploader.report()
+            queue.finish()
+            queue.close()
+            index.close()
+            authors.report()
+            authors.close()
+            clients.close()
+            metrics.export(run_name)
+
+
+# Full capture run for a single outlet in its own browser; with resume=True its
+# last interrupted run is continued from the work queue
+async def run_site(adapter, resume=False):
+    async with capture_run(adapter.file_prefix, resume=resume, headless=adapter.headless) as run:
+        await capture_site(run.browser, adapter, run.drive_service, run.sheets_service, run.uploader,
+                           index=run.index, fetcher=run.fetcher, authors=run.authors, queue=run.queue)
@@ -0,0 +1,90 @@
+from datetime import datetime
+import hashlib
+import sqlite3
+from urllib.parse import urlsplit, urlunsplit
+
+CAPTURE_INDEX_DB = 'capture_index.db' # Local record of every article archived so far
+
+# Last-modified date and article text, read alongside the extraction bundle before page.pdf()
+FINGERPRINT_SCRIPT = """() => {
+    const modified =
+        document.querySelector('meta[property="article:modified_time"]')?.content ||
+        document.querySelector('time[itemprop="dateModified"]')?.getAttribute('datetime') ||
+        null;
+    const article = document.querySelector('article');
+    const paragraphs = article ? Array.from(article.querySelectorAll('p')) : [];
+    const text = paragraphs.length
+        ? paragraphs.map(p => p.textContent.trim()).join('\\n')
+        : (article || document.body).innerText;
+    return {modified, text};
+}"""
+
+
+# Homepages link the same story with tracking parameters, fragments and
+# trailing slashes; strip them so one article always maps to one index row
+def canonical_url(url):
+    parts = urlsplit(url.strip())
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, "", ""))
+
+
+def content_hash(text):
+    return hashlib.sha256(" ".join(text.split()).encode("utf-8")).hexdigest()
+
+
+# Turn the result of FINGERPRINT_SCRIPT into (last_modified, content_hash)
+def parse_fingerprint(fingerprint):
+    return fingerprint.get("modified"), content_hash(fingerprint.get("text") or "")
+
+
+# SQLite index of archived articles keyed by canonical URL, used to skip
+# articles whose content has not changed since they were last captured
+class CaptureIndex:
+    def __init__(self, path=CAPTURE_INDEX_DB):
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            """CREATE TABLE IF NOT EXISTS articles (
+                url TEXT PRIMARY KEY,
+                site TEXT,
+                last_modified TEXT,
+                content_hash TEXT,
+                drive_file_id TEXT,
+                captured_at TEXT
+            )"""
+        )
+        self.conn.commit()
+
+    def lookup(self, url):
+        return self.conn.execute(
+            "SELECT last_modified, content_hash, drive_file_id FROM articles WHERE url = ?",
+            (canonical_url(url),)
+        ).fetchone()
+
+    # An article is unchanged when its modified date matches the stored one, or,
+    # when either side has no modified date, when its text hashes the same
+    def is_unchanged(self, url, last_modified, text_hash):
+        row = self.lookup(url)
+        if row is None:
+            return False
+        stored_modified, stored_hash, _ = row
+        if last_modified and stored_modified:
+            return last_modified == stored_modified
+        return text_hash == stored_hash
+
+    def record(self, url, site, last_modified, text_hash, drive_file_id):
+        self.conn.execute(
+            """INSERT INTO articles (url, site, last_modified, content_hash, drive_file_id, captured_at)
+               VALUES (?, ?, ?, ?, ?, ?)
+               ON CONFLICT(url) DO UPDATE SET
+                   site = excluded.site,
+                   last_modified = excluded.last_modified,
+                   content_hash = excluded.content_hash,
+                   drive_file_id = excluded.drive_file_id,
+                   captured_at = excluded.captured_at""",
+            (canonical_url(url), site, last_modified, text_hash, drive_file_id,
+             datetime.now().isoformat(timespec="seconds"))
+        )
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,48 @@
+import asyncio
+
+DEFAULT_CONCURRENCY = 4 # Number of article pages kept in flight at once
+
+
+# Run capture_article(url) for every URL with at most `concurrency` running at once.
+# Results come back in the same order as `urls`; an article that raises is logged
+# and yields None so it cannot take the rest of the run down with it.
+# If on_result is given it is awaited once per article, in homepage order, as soon
+# as every earlier article has finished. A shared `budget` semaphore additionally
+# caps work across several pools running at once (one per outlet).
+async def run_capture_pool(urls, capture_article, concurrency=DEFAULT_CONCURRENCY,
+                           on_result=None, budget=None):
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    results = [None] * len(urls)
+    finished = [False] * len(urls)
+    next_index = 0
+    emit_lock = asyncio.Lock()
+
+    async def emit_ready_results():
+        nonlocal next_index
+        async with emit_lock:
+            while next_index < len(urls) and finished[next_index]:
+                index = next_index
+                next_index += 1
+                if on_result is None or results[index] is None:
+                    continue
+                try:
+                    await on_result(results[index])
+                except Exception as e:
+                    print(f"Error handling result for {urls[index]}: {e}")
+
+    async def worker(index, url):
+        async with semaphore:
+            if budget is not None:
+                await budget.acquire()
+            try:
+                results[index] = await capture_article(url)
+            except Exception as e:
+                print(f"Error processing {url}: {e}")
+            finally:
+                if budget is not None:
+                    budget.release()
+        finished[index] = True
+        await emit_ready_results()
+
+    await asyncio.gather(*(worker(i, url) for i, url in enumerate(urls)))
+    return results
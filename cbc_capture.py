@@ -1,465 +1,391 @@
 import asyncio
-from datetime import datetime
 import re
-import os
 import json
-from playwright.async_api import async_playwright, TimeoutError
-from googleapiclient.discovery import build as gsheet_build
-from googleapiclient.http import MediaFileUpload
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.auth.transport.requests import Request
-import pickle
-
-SCOPES = ['https://www.googleapis.com/auth/spreadsheets',
-          'https://www.googleapis.com/auth/drive']
-CLIENT_SECRETS_FILE = 'credentials.json' # Credentials file for Google Drive access
-TOKEN_PICKLE = 'token.json' # Token file for Google Drive access
+import time
+from capture_engine import SiteAdapter, check_ai_mention, parse_run_args, run_site
+import metrics
+from media_scanner import MediaScanner
+from network_policy import NetworkPolicy
+from readiness import (
+    wait_for_any, network_idle, selector, selector_count, audio_src,
+    event_set, initial_state, content_loaded
+)
+from snapshots import absolute, attrs, inner_text, parse_html, texts
 
 SPREADSHEET_ID = 'NAME' # Enter Google Sheet ID 
 SHEET_NAME = "NAME" # Enter Google Sheet tab name
 CBC_CAPTURE_FOLDER_ID = 'NAME' # Enter Google Drive folder ID
-
-# Getting Google Credentials for accessing Google Drive
-def get_oauth_credentials():
-    creds = None
-    if os.path.exists(TOKEN_PICKLE):
-        with open(TOKEN_PICKLE, 'rb') as token:
-            creds = pickle.load(token)
-    if not creds or not creds.valid:
-        if creds and creds.expired and creds.refresh_token:
-            creds.refresh(Request())
+MAX_CONCURRENT_ARTICLES = 4 # Number of article pages captured in parallel
+
+CBC_HOMEPAGE = "https://www.cbc.ca/news"
+ARTICLE_PATTERN = re.compile(
+    r"https?://www\.cbc\.ca/.+(-\d+(?:\.\d+)?$|/post/)"
+)
+EXCLUDED_ARTICLE_URLS = {
+    "https://www.cbc.ca/news/about-cbc-news-1.1294364",
+    "https://www.cbc.ca/news/corrections-clarifications-1.5893564",
+    "https://www.cbc.ca/news/public-appearances-1.4969965",
+    "https://www.cbc.ca/accessibility/accessibility-feedback-1.5131151"
+}
+HEADER = [
+    "Title",
+    "Author",
+    "Social/Email",
+    "Link",
+    "Date Posted/Last Updated",
+    "Additional Affiliations",
+    "Video/Audio Links",
+    "AI Mention?"
+]
+
+# Signals that a page is ready to capture; the hard caps match the old fixed sleeps
+HOMEPAGE_READY_SIGNALS = [network_idle()]
+ARTICLE_READY_SIGNALS = [selector("h1"), initial_state(), content_loaded()]
+TTS_BUTTON_SELECTOR = "button.ttsPlayPauseButton-b4Yle, .ttsPlayIcon"
+VIDEO_CONTROL_SELECTOR = "div.play-button-container, svg.videoItemPlayBtn"
+VIDEO_PLAYER_SELECTOR = "phoenix-player[src], span.phx-info-title a[href]"
+MEDIA_TRIGGER_CAP_MS = 3000 # Longest the media phase waits for controls to resolve
+
+# Requests that show a control has resolved: TTS audio and video stream manifests
+AUDIO_REQUEST_RE = re.compile(r"\.mp3(?:[?#]|$)")
+VIDEO_REQUEST_RE = re.compile(r"\.(?:m3u8|mpd)(?:[?#]|$)")
+
+# Media is left on so the TTS player can populate <audio src> after a click
+NETWORK_POLICY = NetworkPolicy(blocked_resource_types=set())
+
+async def click_all(controls):
+    await asyncio.gather(*(c.click(timeout=2000) for c in controls), return_exceptions=True)
+
+# Media URLs requested by the page are collected by a listener while every TTS
+# and video control is clicked at once. The phase ends as soon as each control
+# has resolved (one audio request or <audio src> per TTS button, one manifest
+# request or player element per video control) or MEDIA_TRIGGER_CAP_MS passes.
+# Returns the media URLs seen on the network, for row_from_bundle.
+async def trigger_player_links(page):
+    tts_buttons = await page.query_selector_all(TTS_BUTTON_SELECTOR)
+    video_controls = await page.query_selector_all(VIDEO_CONTROL_SELECTOR)
+    print(f"Found {len(tts_buttons)} TTS buttons and {len(video_controls)} video controls on article page")
+    if not tts_buttons and not video_controls:
+        return None
+    loaded_audio = await page.eval_on_selector_all("audio[src]", "nodes => nodes.length")
+    loaded_players = await page.eval_on_selector_all(VIDEO_PLAYER_SELECTOR, "nodes => nodes.length")
+
+    audio_urls, video_urls = set(), set()
+    audio_resolved, video_resolved = asyncio.Event(), asyncio.Event()
+
+    def on_request(request):
+        if AUDIO_REQUEST_RE.search(request.url):
+            audio_urls.add(request.url)
+            if len(audio_urls) >= len(tts_buttons):
+                audio_resolved.set()
+        elif VIDEO_REQUEST_RE.search(request.url):
+            video_urls.add(request.url)
+            if len(video_urls) >= len(video_controls):
+                video_resolved.set()
+
+    page.on("request", on_request)
+    try:
+        async def resolve_audio():
+            if not tts_buttons:
+                return
+            resolved = [event_set(audio_resolved), audio_src(loaded_audio + len(tts_buttons) - 1)]
+            # The first click can only load the player; a second one starts playback
+            await click_all(tts_buttons)
+            if not await wait_for_any(page, resolved, cap_ms=800):
+                await click_all(tts_buttons)
+                await wait_for_any(page, resolved, cap_ms=MEDIA_TRIGGER_CAP_MS - 800)
+
+        async def resolve_video():
+            if not video_controls:
+                return
+            await click_all(video_controls)
+            await wait_for_any(page, [
+                event_set(video_resolved),
+                selector_count(VIDEO_PLAYER_SELECTOR, loaded_players + len(video_controls) - 1),
+            ], cap_ms=MEDIA_TRIGGER_CAP_MS)
+
+        started = time.monotonic()
+        await asyncio.gather(resolve_audio(), resolve_video())
+        print(f"Media phase took {time.monotonic() - started:.1f}s: "
+              f"{len(audio_urls)} audio and {len(video_urls)} video requests seen")
+    finally:
+        page.remove_listener("request", on_request)
+
+    return {"networkMedia": {"audio": sorted(audio_urls), "video": sorted(video_urls)}}
+
+
+# Everything read from an article before its PDF is rendered, in one round-trip
+ARTICLE_BUNDLE_SCRIPT = """() => {
+    const text = el => el ? el.innerText : null;
+    const article = document.querySelector('article');
+    const byline = document.querySelector('div.bylineDetails');
+    const bio = document.querySelector('p.authorprofile-biography');
+    const social = Array.from(document.querySelectorAll(
+        'ul.authorprofile-links li.authorprofile-linkitem a.authorprofile-item'
+    ));
+    return {
+        title: text(document.querySelector('h1')),
+        byline: {
+            present: !!byline,
+            text: text(byline),
+            authors: Array.from(document.querySelectorAll('span.authorText a')).map(a => a.innerText),
+        },
+        dates: {posted: text(document.querySelector("time, .date, .posted-date, [class*='date']"))},
+        paragraphs: article ? Array.from(article.querySelectorAll('p')).map(p => p.innerText) : [],
+        toggletips: Array.from(document.querySelectorAll('div.toggletipInfoText-Us8br')).map(el => el.innerText),
+        contacts: {
+            bio: bio ? bio.innerText : text(article),
+            social: social.map(a => ({text: a.innerText, href: a.href})),
+        },
+    };
+}"""
+
+# Media links exposed once trigger_player_links has clicked the players
+MEDIA_SCRIPT = """() => {
+    return {
+        phoenix: Array.from(document.querySelectorAll(
+            "phoenix-player[src^='https://www.cbc.ca/player/play/video/']"
+        )).map(n => n.getAttribute('src')),
+        playerLinks: Array.from(document.querySelectorAll(
+            "span.phx-info-title a[href^='https://www.cbc.ca/player/play/video/']"
+        )).map(n => n.href),
+        audio: Array.from(document.querySelectorAll('audio[src]')).map(n => n.src),
+    };
+}"""
+
+# window.__INITIAL_STATE__ is an inline script in the server HTML, so it is read
+# from the HTTP response rather than serialized back out of the browser
+def read_initial_state(tree):
+    for script in tree.css("script"):
+        content = script.text()
+        if "window.__INITIAL_STATE__" in content:
+            match = re.search(r"window\.__INITIAL_STATE__\s?=\s?(\{.*\});?", content, re.S)
+            if match:
+                return match.group(1)
+    return None
+
+MEDIA_SCANNER = MediaScanner([
+    ("player", r"https://www\.cbc\.ca/player/play/[0-9\.]+", None),
+])
+
+# Player URLs and author names out of window.__INITIAL_STATE__. The parsed state
+# is walked once, running the player regex only on strings that can match,
+# instead of being serialized back to JSON to regex over. Also reports the size
+# of the state and the time spent on it. Any part of the state may be missing
+# or of another type, which only leaves the matching field empty.
+def parse_initial_state(initial_state_json):
+    if not initial_state_json:
+        return None
+    started = time.perf_counter()
+    try:
+        state = json.loads(initial_state_json)
+    except json.JSONDecodeError:
+        return None
+    if not isinstance(state, dict):
+        return None
+
+    player_urls = set()
+    detail = state.get("detail")
+    detail_content = detail.get("content") if isinstance(detail, dict) else None
+    if isinstance(detail_content, dict):
+        for val in detail_content.values():
+            if isinstance(val, str) and "https://www.cbc.ca/player/play/" in val:
+                player_urls.add(val)
+
+    stack = [state]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            values = node.values()
+            stack.extend(k for k in node if "/player/play/" in k)
+        elif isinstance(node, list):
+            values = node
         else:
-            flow = InstalledAppFlow.from_client_secrets_file(CLIENT_SECRETS_FILE, SCOPES)
-            creds = flow.run_local_server(port=0)
-        with open(TOKEN_PICKLE, 'wb') as token:
-            pickle.dump(creds, token)
-    return creds
-
-# Create a new folder in Google Drive with the current date 
-def create_dated_capture_folder(drive_service):
-    date_str = datetime.now().strftime("%Y-%m-%d")
-    folder_metadata = {
-        'name': date_str + " Capture",
-        'mimeType': 'application/vnd.google-apps.folder',
-        'parents': [CBC_CAPTURE_FOLDER_ID],
+            player_urls.update(MEDIA_SCANNER.urls(node))
+            continue
+        for val in values:
+            if isinstance(val, str):
+                if "/player/play/" in val:
+                    player_urls.update(MEDIA_SCANNER.urls(val))
+            elif isinstance(val, (dict, list)):
+                stack.append(val)
+
+    author_names = []
+    authors = state.get("author", {})
+    if isinstance(authors, dict) and "name" in authors:
+        author_names.append(authors["name"])
+    elif isinstance(authors, list):
+        for auth in authors:
+            if isinstance(auth, dict) and "name" in auth:
+                author_names.append(auth["name"])
+    if isinstance(detail_content, dict) and detail_content.get("source"):
+        author_names.append(detail_content["source"])
+
+    return {
+        "playerUrls": sorted(player_urls),
+        "authors": ", ".join(author_names) if author_names else None,
+        "bytes": len(initial_state_json.encode("utf-8")),
+        "ms": (time.perf_counter() - started) * 1000,
     }
-    folder = drive_service.files().create(
-        body=folder_metadata,
-        fields='id'
-    ).execute()
-    folder_id = folder['id']
-    print(f"Created capture folder for {date_str} with ID {folder_id}")
-    return folder_id
-
-# Extract all article links from the homepage 
-async def extract_relevant_article_links(page):
-    await page.wait_for_selector("a")
-    link_elements = await page.query_selector_all("a")
-
-    exclude_urls = {
-        "https://www.cbc.ca/news/about-cbc-news-1.1294364",
-        "https://www.cbc.ca/news/corrections-clarifications-1.5893564",
-        "https://www.cbc.ca/news/public-appearances-1.4969965",
-        "https://www.cbc.ca/accessibility/accessibility-feedback-1.5131151"
-    }
-
-    article_urls = []
-    pattern = re.compile(
-        r"https?://www\.cbc\.ca/.+(-\d+(?:\.\d+)?$|/post/)"
-    )
-
-    for elem in link_elements:
-        href = await elem.get_attribute('href')
-        if href:
-            full_url = href if href.startswith("http") else f"https://www.cbc.ca{href}"
-            if pattern.match(full_url) and full_url not in exclude_urls:
-                if full_url not in article_urls:
-                    article_urls.append(full_url)
 
-    print(f"Extracted {len(article_urls)} relevant article URLs (including kidsnews posts)")
-    return article_urls
+# Runs in a worker thread, so the state is parsed off the event loop as well
+def static_bundle(url, html):
+    return {"initialState": parse_initial_state(read_initial_state(parse_html(html)))}
 
-async def trigger_player_links(page):
-    try:
-        await page.evaluate("window.scrollTo(0, 0)")
-        await page.wait_for_timeout(500)
-    except Exception:
-        pass
-
-    # 1) TTS (audio) buttons
-    try:
-        tts_buttons = await page.query_selector_all(
-            "button.ttsPlayPauseButton-b4Yle, .ttsPlayIcon"
-        )
-        print(f"Found {len(tts_buttons)} TTS buttons on article page")
-        for idx, btn in enumerate(tts_buttons):
-            try:
-                await btn.scroll_into_view_if_needed()
-                await page.wait_for_timeout(300)
-                # Click twice with short delays
-                await btn.click(timeout=2000)
-                await page.wait_for_timeout(800)
-                await btn.click(timeout=2000)
-                await page.wait_for_timeout(1200)
-                print(f"Clicked TTS button {idx+1}/{len(tts_buttons)} twice")
-            except Exception:
-                continue
-    except Exception:
-        pass
-
-    # 2) Video play buttons (only those currently in DOM/viewport)
-    try:
-        video_buttons = []
-        for sel in ["div.play-button-container", "svg.videoItemPlayBtn"]:
-            elems = await page.query_selector_all(sel)
-            video_buttons.extend(elems)
-        print(f"Found {len(video_buttons)} video play controls on article page")
-        for idx, el in enumerate(video_buttons):
-            try:
-                await el.scroll_into_view_if_needed()
-                await page.wait_for_timeout(300)
-                await el.click(timeout=2000)
-                await page.wait_for_timeout(1000)
-                print(f"Clicked video control {idx+1}/{len(video_buttons)}")
-            except Exception:
-                continue
-    except Exception:
-        pass
-
-    # Short final wait
-    await page.wait_for_timeout(1500)
-
-
-async def extract_cbc_article_info(page):
+def parse_cbc_media(media, initial_state, network_media):
     video_audio_links = set()
 
-    # phoenix-player video src
-    try:
-        phoenix_srcs = await page.eval_on_selector_all(
-            "phoenix-player[src^='https://www.cbc.ca/player/play/video/']",
-            "nodes => nodes.map(n => n.getAttribute('src'))"
-        )
-        for src in phoenix_srcs or []:
-            if src:
-                video_audio_links.add(src)
-    except Exception:
-        pass
-
-    # phx-info-title anchors
-    try:
-        video_hrefs = await page.eval_on_selector_all(
-            "span.phx-info-title a[href^='https://www.cbc.ca/player/play/video/']",
-            "nodes => nodes.map(n => n.href)"
-        )
-        for href in video_hrefs or []:
-            video_audio_links.add(href)
-    except Exception:
-        pass
-
-    # audio mp3 srcs (TTS)
-    try:
-        audio_srcs = await page.eval_on_selector_all(
-            "audio[src]",
-            "nodes => nodes.map(n => n.src)"
-        )
-        for src in audio_srcs or []:
-            if src.endswith(".mp3"):
-                video_audio_links.add(src)
-    except Exception:
-        pass
+    # phoenix-player video src and phx-info-title anchors
+    for src in media.get("phoenix") or []:
+        if src:
+            video_audio_links.add(src)
+    for href in media.get("playerLinks") or []:
+        video_audio_links.add(href)
 
-    # window.__INITIAL_STATE__ player URLs + authors_info
-    initial_state_json = await page.evaluate("""() => {
-        const scripts = Array.from(document.querySelectorAll('script'));
-        for (const script of scripts) {
-            if (script.textContent && script.textContent.includes('window.__INITIAL_STATE__')) {
-                const content = script.textContent;
-                const match = content.match(/window\\.__INITIAL_STATE__\\s?=\\s?(\\{.*\\});?/s);
-                if (match) return match[1];
-            }
-        }
-        return null;
-    }""")
+    # audio mp3 srcs (TTS), from the DOM and from the requests the clicks made
+    for src in media.get("audio") or []:
+        if src.endswith(".mp3"):
+            video_audio_links.add(src)
+    video_audio_links.update(network_media.get("audio") or [])
 
+    # window.__INITIAL_STATE__ player URLs + authors_info
     authors_info = None
-    if initial_state_json:
-        try:
-            state = json.loads(initial_state_json)
-        except json.JSONDecodeError:
-            state = None
-
-        if state:
-            try:
-                detail = state.get("detail", {})
-                detail_content = detail.get("content", {})
-                for key, val in detail_content.items():
-                    if isinstance(val, str) and "https://www.cbc.ca/player/play/" in val:
-                        video_audio_links.add(val)
-                detail_str = json.dumps(detail)
-                for match in re.findall(r'https://www\.cbc\.ca/player/play/[0-9\.]+', detail_str):
-                    video_audio_links.add(match)
-            except Exception:
-                pass
-
-            try:
-                state_str = json.dumps(state)
-                for match in re.findall(r'https://www\.cbc\.ca/player/play/[0-9\.]+', state_str):
-                    video_audio_links.add(match)
-            except Exception:
-                pass
-
-            try:
-                authors = state.get('author', {})
-                author_names = []
-                if isinstance(authors, dict) and 'name' in authors:
-                    author_names.append(authors['name'])
-                elif isinstance(authors, list):
-                    for auth in authors:
-                        if isinstance(auth, dict) and 'name' in auth:
-                            author_names.append(auth['name'])
-                detail_content = state.get('detail', {}).get('content', {})
-                source_info = detail_content.get('source', '')
-                if source_info:
-                    author_names.append(source_info)
-                authors_info = ", ".join(author_names) if author_names else None
-            except Exception:
-                pass
+    if initial_state:
+        video_audio_links.update(initial_state["playerUrls"])
+        authors_info = initial_state["authors"]
+        print(f"__INITIAL_STATE__: {initial_state['bytes'] / 1024:.0f} KiB "
+              f"parsed in {initial_state['ms']:.1f} ms")
+        metrics.count("initial_states_parsed")
+        metrics.count("initial_state_bytes", initial_state["bytes"])
+        metrics.count("initial_state_parse_ms", round(initial_state["ms"], 3))
 
     return sorted(video_audio_links), authors_info
 
-async def check_ai_mention(page):
-    keywords = ["ChatGPT", "automated", "robot", "AI tools", "data team", "OpenAI", "Otter.ai",
-                "AI-Based", "artificial intelligence", "machine learning", "AI model",
-                "AI technology", "AI-generated", "AI-assisted"]
-    try:
-        texts = []
-
-        article_element = await page.query_selector("article")
-        if article_element:
-            paragraphs = await article_element.query_selector_all("p")
-            article_text = " ".join([await p.inner_text() for p in paragraphs])
-            texts.append(article_text)
-
-        toggletip_elements = await page.query_selector_all("div.toggletipInfoText-Us8br")
-        for el in toggletip_elements:
-            txt = await el.inner_text()
-            if txt:
-                texts.append(txt)
-
-        if not texts:
-            return "False"
-
-        full_text_lower = " ".join(texts).lower()
-        for kw in keywords:
-            if kw.lower() in full_text_lower:
-                return f"True - {kw}"
-        return "False"
-    except Exception:
-        return "False"
-
-async def extract_author_info(page):
-    try:
-        tokens = set()
-
-        bio_element = await page.query_selector("p.authorprofile-biography")
-        bio_text = ""
-        if bio_element:
-            bio_text = await bio_element.inner_text()
-        else:
-            article_element = await page.query_selector("article")
-            if article_element:
-                bio_text = await article_element.inner_text()
-
-        if bio_text:
-            for part in bio_text.split():
-                cleaned = part.strip(",.()[]")
-                if "@" in cleaned:
-                    tokens.add(cleaned)
-
-        social_texts = await page.eval_on_selector_all(
-            "ul.authorprofile-links li.authorprofile-linkitem a.authorprofile-item",
-            "nodes => nodes.map(n => n.innerText)"
-        )
-        social_hrefs = await page.eval_on_selector_all(
-            "ul.authorprofile-links li.authorprofile-linkitem a.authorprofile-item",
-            "nodes => nodes.map(n => n.href)"
-        )
-
-        if social_texts:
-            for txt in social_texts:
-                cleaned = txt.strip()
-                if cleaned:
-                    tokens.add(cleaned)
-
-        if social_hrefs:
-            for href in social_hrefs:
-                cleaned = href.strip()
-                if cleaned:
-                    tokens.add(cleaned)
-
-        return ", ".join(sorted(tokens)) if tokens else ""
-    except Exception:
-        return ""
-
-async def save_pdf_with_metadata(playwright_page, url, drive_service, folder_id):
-    await playwright_page.goto(url, wait_until="domcontentloaded", timeout=60000)
-    await playwright_page.wait_for_timeout(2000)
-
-    title_element = await playwright_page.query_selector("h1")
-    title = await title_element.inner_text() if title_element else "No title found"
-
-    byline_element = await playwright_page.query_selector("div.bylineDetails")
-    author = "No author found"
-    if byline_element:
-        author_links = await playwright_page.query_selector_all("span.authorText a")
-        if author_links:
-            authors = []
-            for link in author_links:
-                authors.append(await link.inner_text())
-            author = ", ".join(authors)
-        else:
-            byline_text = await byline_element.inner_text()
-            author = byline_text.split("·")[0].strip()
-
-    date_element = await playwright_page.query_selector(
-        "time, .date, .posted-date, [class*='date']"
-    )
-    date_posted = await date_element.inner_text() if date_element else "No date found"
-
-    date_str = datetime.now().strftime("%Y-%m-%d")
-    safe_title = "".join(
-        c for c in title if c.isalnum() or c in (" ", "-")
-    ).replace(" ", "_")[:60]
-    pdf_file = f"cbc_{safe_title}_{date_str}.pdf"
-
-    print(f"Title: {title}")
+def parse_author_info(contacts):
+    tokens = set()
+
+    bio_text = contacts.get("bio") or ""
+    for part in bio_text.split():
+        cleaned = part.strip(",.()[]")
+        if "@" in cleaned:
+            tokens.add(cleaned)
+
+    for item in contacts.get("social") or []:
+        for value in (item.get("text"), item.get("href")):
+            cleaned = (value or "").strip()
+            if cleaned:
+                tokens.add(cleaned)
+
+    return ", ".join(sorted(tokens)) if tokens else ""
+
+def parse_author(byline):
+    if not byline.get("present"):
+        return "No author found"
+    if byline.get("authors"):
+        return ", ".join(byline["authors"])
+    return (byline.get("text") or "").split("·")[0].strip()
+
+# Sheet row from an article bundle plus the MEDIA_SCRIPT result under "media",
+# the static_bundle keys and the media URLs trigger_player_links saw requested
+def row_from_bundle(url, bundle):
+    author = parse_author(bundle["byline"])
+    date_posted = bundle["dates"].get("posted") or "No date found"
     print(f"Author: {author}")
     print(f"Date posted: {date_posted}")
-    print(f"Saving PDF: {pdf_file}")
 
-    await playwright_page.pdf(
-        path=pdf_file,
-        format="A4",
-        print_background=True,
-        margin={"top": "10mm", "bottom": "10mm", "left": "10mm", "right": "10mm"}
+    video_audio_links, extra_author_info = parse_cbc_media(
+        bundle["media"], bundle.get("initialState"), bundle.get("networkMedia") or {}
     )
+    ai_mention = check_ai_mention(bundle["paragraphs"] + bundle["toggletips"])
+    author_info = parse_author_info(bundle["contacts"])
+
+    additional_affiliations = ", ".join(
+        x for x in [extra_author_info] if x
+    )
+
+    return [
+        bundle["title"] or "No title found",  # Title
+        author,  # Author
+        author_info,  # Social Media/Email
+        url,  # Link
+        date_posted,  # Date Posted/Last Updated
+        additional_affiliations,  # Additional Affiliations
+        "\n".join(video_audio_links) if video_audio_links else "",  # Video/Audio Flag
+        ai_mention  # AI Mention?
+    ]
+
+async def build_row(page, pages, url, bundle, fetcher, authors):
+    with metrics.span("extract_media"):
+        bundle["media"] = await page.evaluate(MEDIA_SCRIPT)
+    return row_from_bundle(url, bundle)
+
+# ARTICLE_BUNDLE_SCRIPT, MEDIA_SCRIPT and static_bundle read back out of a
+# saved snapshot
+def bundle_from_html(url, html):
+    tree = parse_html(html)
+    article = tree.css_first("article")
+    byline = tree.css_first("div.bylineDetails")
+    bio = tree.css_first("p.authorprofile-biography")
+    return {
+        "title": inner_text(tree.css_first("h1")),
+        "byline": {
+            "present": byline is not None,
+            "text": inner_text(byline),
+            "authors": texts(tree, "span.authorText a", inner_text),
+        },
+        "dates": {"posted": inner_text(tree.css_first("time, .date, .posted-date, [class*='date']"))},
+        "paragraphs": [inner_text(p) for p in article.css("p")] if article is not None else [],
+        "toggletips": texts(tree, "div.toggletipInfoText-Us8br", inner_text),
+        "contacts": {
+            "bio": inner_text(bio) if bio is not None else inner_text(article),
+            "social": [
+                {"text": inner_text(a), "href": absolute(url, a.attributes.get("href"))}
+                for a in tree.css("ul.authorprofile-links li.authorprofile-linkitem a.authorprofile-item")
+            ],
+        },
+        "media": {
+            "phoenix": attrs(tree, "phoenix-player[src^='https://www.cbc.ca/player/play/video/']", "src"),
+            "playerLinks": [
+                absolute(url, href) for href in attrs(
+                    tree, "span.phx-info-title a[href^='https://www.cbc.ca/player/play/video/']", "href"
+                )
+            ],
+            "audio": [absolute(url, src) for src in attrs(tree, "audio[src]", "src")],
+        },
+        "initialState": parse_initial_state(read_initial_state(tree)),
+    }
 
-    file_metadata = {'name': os.path.basename(pdf_file), 'parents': [folder_id]}
-    media = MediaFileUpload(pdf_file, mimetype='application/pdf', resumable=True)
-    file = drive_service.files().create(
-        body=file_metadata, media_body=media, fields='id'
-    ).execute()
-    print(f"Uploaded {pdf_file} to Google Drive with file ID {file['id']}")
-
-    return (title, author, url, date_posted)
-
-def append_to_google_sheet(data_rows, service):
-    sheet = service.spreadsheets()
-    body = {'values': data_rows}
-    result = sheet.values().append(
-        spreadsheetId=SPREADSHEET_ID,
-        range=f"{SHEET_NAME}!A:H",
-        valueInputOption="RAW",
-        insertDataOption="INSERT_ROWS",
-        body=body
-    ).execute()
-    print(f"{result.get('updates').get('updatedRows')} rows appended to Google Sheet")
-
-def ensure_header_row(service):
-    sheet = service.spreadsheets()
-    header = [[
-        "Title",
-        "Author",
-        "Social/Email",
-        "Link",
-        "Date Posted/Last Updated",
-        "Additional Affiliations",
-        "Video/Audio Links",
-        "AI Mention?"
-    ]]
-    sheet.values().update(
-        spreadsheetId=SPREADSHEET_ID,
-        range=f"{SHEET_NAME}!A1:H1",
-        valueInputOption="RAW",
-        body={'values': header}
-    ).execute()
-
-async def main():
-    creds = get_oauth_credentials()
-    drive_service = gsheet_build('drive', 'v3', credentials=creds)
-    sheet_service = gsheet_build('sheets', 'v4', credentials=creds)
-    ensure_header_row(sheet_service)
-
-    capture_folder_id = create_dated_capture_folder(drive_service)
-
-    homepage_url = "https://www.cbc.ca/news"
-    date_str = datetime.now().strftime("%Y-%m-%d")
-    homepage_pdf = f"cbc_homepage_{date_str}.pdf"
-
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=False)
-        context = await browser.new_context(
-            viewport={"width": 1600, "height": 4000},
-            ignore_https_errors=True
-        )
-        page = await context.new_page()
-
-        await page.goto(homepage_url, wait_until="domcontentloaded", timeout=120000)
-        await page.wait_for_timeout(2000)
-
-        article_urls = await extract_relevant_article_links(page)
-        print(f"Filtered {len(article_urls)} article URLs after extraction.")
-        for url in article_urls:
-            print(url)
-
-        await page.pdf(
-            path=homepage_pdf,
-            format="A4",
-            print_background=True,
-            margin={"top": "10mm", "bottom": "10mm", "left": "10mm", "right": "10mm"}
-        )
-        print(f"Homepage PDF saved as {homepage_pdf}")
-
-        file_metadata = {'name': os.path.basename(homepage_pdf), 'parents': [capture_folder_id]}
-        media = MediaFileUpload(homepage_pdf, mimetype='application/pdf', resumable=True)
-        file = drive_service.files().create(
-            body=file_metadata, media_body=media, fields='id'
-        ).execute()
-        print(f"Uploaded {homepage_pdf} to Google Drive with file ID {file['id']}")
-
-        metadata_rows = []
-        for link in article_urls:
-            article_page = await context.new_page()
-            meta = await save_pdf_with_metadata(
-                article_page, link, drive_service, capture_folder_id
-            )
-
-            await trigger_player_links(article_page)
-
-            video_audio_links, extra_author_info = await extract_cbc_article_info(article_page)
-            ai_mention = await check_ai_mention(article_page)
-            author_info = await extract_author_info(article_page)
-
-            additional_affiliations = ", ".join(
-                x for x in [extra_author_info] if x
-            )
-
-            row = (
-                meta[0],  # Title
-                meta[1],  # Author
-                author_info,  # Social Media/Email
-                meta[2],  # Link
-                meta[3],  # Date Posted/Last Updated
-                additional_affiliations,  # Additional Affiliations
-                "\n".join(video_audio_links) if video_audio_links else "",  # Video/Audio Flag
-                ai_mention  # AI Mention?
-            )
-            metadata_rows.append(row)
-            await article_page.close()
-
-        await browser.close()
-
-    append_to_google_sheet(metadata_rows, sheet_service)
+def snapshot_row(url, html):
+    return row_from_bundle(url, bundle_from_html(url, html))
+
+ADAPTER = SiteAdapter(
+    name="CBC",
+    homepage_url=CBC_HOMEPAGE,
+    base_url="https://www.cbc.ca",
+    link_pattern=ARTICLE_PATTERN,
+    excluded_urls=EXCLUDED_ARTICLE_URLS,
+    file_prefix="cbc",
+    article_file_prefix="cbc",
+    capture_folder_id=CBC_CAPTURE_FOLDER_ID,
+    spreadsheet_id=SPREADSHEET_ID,
+    sheet_name=SHEET_NAME,
+    header=HEADER,
+    bundle_script=ARTICLE_BUNDLE_SCRIPT,
+    static_bundle=static_bundle,
+    trigger_media=trigger_player_links,
+    build_row=build_row,
+    snapshot_row=snapshot_row,
+    homepage_ready_signals=HOMEPAGE_READY_SIGNALS,
+    article_ready_signals=ARTICLE_READY_SIGNALS,
+    network_policy=NETWORK_POLICY,
+    context_options={"viewport": {"width": 1600, "height": 4000}, "ignore_https_errors": True},
+    headless=False,
+    max_concurrent_articles=MAX_CONCURRENT_ARTICLES,
+)
+
+async def main(resume=False):
+    await run_site(ADAPTER, resume=resume)
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    args = parse_run_args("Capture CBC News.")
+    asyncio.run(main(resume=args.resume))
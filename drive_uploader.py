@@ -0,0 +1,139 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import io
+import random
+import socket
+import threading
+import time
+from googleapiclient.errors import HttpError
+from googleapiclient.http import MediaIoBaseUpload
+import metrics
+
+DRIVE_UPLOAD_WORKERS = 4 # Uploads running in parallel with capture
+DRIVE_MAX_QUEUED_MB = 256 # Artifact bytes waiting for or in upload before capture has to wait
+DRIVE_CHUNK_SIZE = 5 * 1024 * 1024 # Resumable upload chunk size (multiple of 256 KiB)
+DRIVE_MAX_RETRIES = 5
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+
+# Drive upload queue drained by a thread pool, so rendering the next article
+# never waits on an upload as long as uploads keep up. Queued artifacts are
+# held in memory, so once max_queued_mb of them are waiting or uploading,
+# upload() waits for some to finish before it queues another. The service must
+# be usable from several threads at once, like the per-thread services of
+# google_clients.GoogleClients.drive().
+class DriveUploader:
+    def __init__(self, service, workers=DRIVE_UPLOAD_WORKERS, chunk_size=DRIVE_CHUNK_SIZE,
+                 max_queued_mb=DRIVE_MAX_QUEUED_MB):
+        self.service = service
+        self.chunk_size = chunk_size
+        self.max_queued_bytes = max_queued_mb * 1_000_000
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="drive-upload")
+        self._space = asyncio.Event()
+        self.queued_bytes = 0
+        self.peak_queued_bytes = 0
+        self.backpressure_waits = 0
+        self._stats_lock = threading.Lock()
+        self._pending = set()
+        self._started_at = time.monotonic()
+        self.uploaded = 0
+        self.failed = 0
+        self.retries = 0
+        self.bytes_uploaded = 0
+        self.busy_seconds = 0.0
+
+    # Queue an in-memory artifact for upload as `name`, first waiting for room
+    # in the queue; returns an asyncio future resolving to the Drive file ID
+    async def upload(self, name, data, folder_id, mimetype='application/pdf'):
+        # An artifact larger than the whole budget still goes, once the queue is empty
+        size = min(len(data), self.max_queued_bytes)
+        if self.queued_bytes + size > self.max_queued_bytes:
+            self.backpressure_waits += 1
+            metrics.count("drive_backpressure_waits")
+            with metrics.span("upload_wait"):
+                while self.queued_bytes + size > self.max_queued_bytes:
+                    self._space.clear()
+                    await self._space.wait()
+        self.queued_bytes += size
+        self.peak_queued_bytes = max(self.peak_queued_bytes, self.queued_bytes)
+
+        future = asyncio.wrap_future(
+            self._executor.submit(metrics.carry_labels(self._upload), name, data, folder_id, mimetype)
+        )
+        self._pending.add(future)
+        future.add_done_callback(self._pending.discard)
+        future.add_done_callback(lambda _: self._release(size))
+        return future
+
+    def _release(self, size):
+        self.queued_bytes -= size
+        self._space.set()
+
+    def _upload(self, name, data, folder_id, mimetype):
+        started = time.monotonic()
+        try:
+            with metrics.span("drive_upload"):
+                file_id = self._upload_resumable(name, data, folder_id, mimetype)
+        except Exception as e:
+            with self._stats_lock:
+                self.failed += 1
+            metrics.count("drive_upload_failures")
+            print(f"Upload of {name} failed: {e}")
+            raise
+        metrics.count("drive_uploads")
+        metrics.count("drive_bytes_uploaded", len(data))
+        with self._stats_lock:
+            self.uploaded += 1
+            self.bytes_uploaded += len(data)
+            self.busy_seconds += time.monotonic() - started
+        print(f"Uploaded {name} to Google Drive with file ID {file_id}")
+        return file_id
+
+    # Send the file chunk by chunk; a failed chunk is retried with backoff and
+    # the upload resumes from the last chunk Drive acknowledged
+    def _upload_resumable(self, name, data, folder_id, mimetype):
+        file_metadata = {'name': name, 'parents': [folder_id]}
+        media = MediaIoBaseUpload(
+            io.BytesIO(data), mimetype=mimetype, resumable=True, chunksize=self.chunk_size
+        )
+        request = self.service.files().create(
+            body=file_metadata, media_body=media, fields='id'
+        )
+        response = None
+        attempt = 0
+        while response is None:
+            try:
+                _, response = request.next_chunk()
+                attempt = 0
+            except (HttpError, ConnectionError, socket.timeout) as e:
+                status = getattr(getattr(e, "resp", None), "status", None)
+                if isinstance(e, HttpError) and status not in RETRYABLE_STATUSES:
+                    raise
+                if attempt == DRIVE_MAX_RETRIES:
+                    raise
+                delay = min(60, 2 ** attempt) + random.uniform(0, 1)
+                attempt += 1
+                with self._stats_lock:
+                    self.retries += 1
+                metrics.count("drive_retries")
+                print(f"Upload of {name} interrupted ({status or e}), retrying in {delay:.1f}s")
+                time.sleep(delay)
+        return response['id']
+
+    # Wait for every queued upload to finish, successfully or not
+    async def drain(self):
+        while self._pending:
+            await asyncio.gather(*list(self._pending), return_exceptions=True)
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+    def report(self):
+        elapsed = time.monotonic() - self._started_at
+        mb = self.bytes_uploaded / 1_000_000
+        print(f"Drive uploads: {self.uploaded} succeeded, {self.failed} failed, "
+              f"{self.retries} retried chunks, {mb:.1f} MB in {elapsed:.0f}s "
+              f"({mb / elapsed if elapsed else 0:.2f} MB/s wall clock, "
+              f"{mb / self.busy_seconds if self.busy_seconds else 0:.2f} MB/s per upload)")
+        print(f"Drive upload queue: peak {self.peak_queued_bytes / 1_000_000:.0f} MB queued, "
+              f"capture waited for room {self.backpressure_waits} times")
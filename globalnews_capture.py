@@ -1,461 +1,337 @@
 import asyncio
-from datetime import datetime
 import re
-import os
 import json
-from playwright.async_api import async_playwright
-from googleapiclient.discovery import build as gsheet_build
-from googleapiclient.http import MediaFileUpload
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.auth.transport.requests import Request
-import pickle
-
-SCOPES = ['https://www.googleapis.com/auth/spreadsheets',
-          'https://www.googleapis.com/auth/drive']
-CLIENT_SECRETS_FILE = 'credentials.json'
-TOKEN_PICKLE = 'token.json'
+from capture_engine import SiteAdapter, check_ai_mention, parse_run_args, read_profile, run_site
+import metrics
+from media_scanner import MediaScanner, YOUTUBE_EMBED, strip_query
+from network_policy import NetworkPolicy
+from readiness import network_idle, selector, content_loaded
+from snapshots import absolute, attrs, inner_text, parse_html, text_content
+
 SPREADSHEET_ID = 'NAME' # Enter Google Sheet ID
 SHEET_NAME = "NAME" # Enter Google Sheet Tab Name
 GLOBALNEWS_CAPTURE_FOLDER_ID = 'NAME' # Enter Google Drive folder ID
-
-def get_oauth_credentials():
-    creds = None
-    if os.path.exists(TOKEN_PICKLE):
-        with open(TOKEN_PICKLE, 'rb') as token:
-            creds = pickle.load(token)
-    if not creds or not creds.valid:
-        if creds and creds.expired and creds.refresh_token:
-            creds.refresh(Request())
-        else:
-            flow = InstalledAppFlow.from_client_secrets_file(CLIENT_SECRETS_FILE, SCOPES)
-            creds = flow.run_local_server(port=0)
-        with open(TOKEN_PICKLE, 'wb') as token:
-            pickle.dump(creds, token)
-    return creds
-
-def create_dated_capture_folder(drive_service):
-    date_str = datetime.now().strftime("%Y-%m-%d")
-    folder_metadata = {
-        'name': date_str + " Capture",
-        'mimeType': 'application/vnd.google-apps.folder',
-        'parents': [GLOBALNEWS_CAPTURE_FOLDER_ID],
+MAX_CONCURRENT_ARTICLES = 4 # Number of article pages captured in parallel
+
+GLOBALNEWS_HOMEPAGE = "https://globalnews.ca"
+ARTICLE_PATTERN = re.compile(r"^https?://globalnews\.ca/news/\d+/.+")
+HEADER = [
+    "Title",
+    "Author",
+    "Social/Email",
+    "Affiliation",
+    "Link",
+    "Date Posted/Last Updated",
+    "Additional Affiliations",
+    "Video/Audio Links",
+    "AI Mention?"
+]
+
+# Signals that a page is ready to capture; the hard caps match the old fixed sleeps
+HOMEPAGE_READY_SIGNALS = [network_idle()]
+ARTICLE_READY_SIGNALS = [selector("h1"), selector("#article-byline, .c-byline"), content_loaded()]
+
+NETWORK_POLICY = NetworkPolicy()
+
+# Embed URLs carry per-placement paths and parameters after the video ID
+def normalize_embed_url(url):
+    return re.match(r"https://globalnews\.ca/video/embed/\d+", url).group(0)
+
+MEDIA_SCANNER = MediaScanner([
+    ("audio", r"https://globalnews\.ca/player/play/audio/[0-9\.]+", None),
+    ("player", r"https://globalnews\.ca/player/play(?:/video)?/[0-9\.]+", None),
+    ("embed", r'https://globalnews\.ca/video/embed/[0-9]+[^"\'\s]*', normalize_embed_url),
+    ("syndicate", r'https://globalnews\.ca/i/phoenix/player/syndicate/\?[^\s"\']+', None),
+    ("youtube", YOUTUBE_EMBED, strip_query),
+])
+
+# Everything read from an article before its PDF is rendered, in one round-trip
+ARTICLE_BUNDLE_SCRIPT = """() => {
+    const text = el => el ? el.textContent.trim() : null;
+    const attrs = (sel, name) =>
+        Array.from(document.querySelectorAll(sel)).map(n => n.getAttribute(name)).filter(Boolean);
+    const h1 = document.querySelector('h1');
+    const article = document.querySelector('article');
+    const authorLinks = Array.from(document.querySelectorAll(
+        '.c-byline__attribution span a.c-byline__name.c-byline__link'
+    ));
+    const fallbackAuthor = document.querySelector('#article-byline .c-byline__attribution span:first-child');
+    const pubDate = document.querySelector('.c-byline__date--pubDate span');
+    const modDate = document.querySelector('.c-byline__date--ModDate span, .c-byline__date--modDate span');
+    return {
+        title: h1 ? h1.innerText : null,
+        byline: {
+            authors: authorLinks.map(a => a.textContent),
+            profileLinks: authorLinks.map(a => a.getAttribute('href')).filter(Boolean),
+            fallbackAuthor: fallbackAuthor ? fallbackAuthor.textContent.trim().replace(/^By\\s+/i, '') : null,
+            affiliation: text(document.querySelector(
+                '.c-byline__source.c-byline__source--hasName, .c-byline__source.c-byline__source--noName'
+            )),
+        },
+        dates: {
+            published: pubDate ? pubDate.textContent.replace('Posted ', '').trim() : null,
+            updated: modDate ? modDate.textContent.replace('Updated ', '').trim() : null,
+        },
+        paragraphs: article ? Array.from(article.querySelectorAll('p')).map(p => p.innerText) : [],
+        credits: Array.from(document.querySelectorAll('article p em')).map(em => em.textContent),
+        media: {
+            tags: attrs('video, audio', 'src'),
+            playerLinks: Array.from(document.querySelectorAll(
+                'a[href^="https://globalnews.ca/player/play/video/"], a[href^="https://globalnews.ca/player/play/audio/"]'
+            )).map(a => a.href),
+            iframes: Array.from(document.querySelectorAll(
+                'iframe.c-video__embed, iframe[id^="miniplayer_"], ' +
+                'iframe[src*="youtube.com/embed/"], iframe[src*="youtube-nocookie.com/embed/"]'
+            )).map(n => n.src),
+        },
+    };
+}"""
+
+# JSON-LD and the markup scanned for media URLs, read from the rendered DOM
+# after the page's scripts have run (static_bundle_rendered), so player and
+# embed URLs injected by JavaScript are kept
+def static_bundle(url, html):
+    tree = parse_html(html)
+    return {
+        "markup": {
+            "jsonld": text_content(tree.css_first('script[type="application/ld+json"]')),
+            "html": html,
+        },
     }
-    folder = drive_service.files().create(
-        body=folder_metadata,
-        fields='id'
-    ).execute()
-    folder_id = folder['id']
-    print(f"Created capture folder for {date_str} with ID {folder_id}")
-    return folder_id
-
-def normalize_media_url(url: str) -> str:
-    if not url:
-        return url
-    base = url.split("#", 1)[0]
-    m = re.match(r"(https://globalnews\.ca/video/embed/(\d+))", base)
-    if m:
-        return m.group(1)
-    return base
-
-async def extract_relevant_article_links(page):
-    await page.wait_for_selector("a")
-    link_elements = await page.query_selector_all("a")
-    article_urls = []
-
-    pattern = re.compile(r"^https?://globalnews\.ca/news/\d+/.+")
-
-    for elem in link_elements:
-        href = await elem.get_attribute('href')
-        if href:
-            full_url = href if href.startswith("http") else f"https://globalnews.ca{href}"
-            if pattern.match(full_url) and full_url not in article_urls:
-                article_urls.append(full_url)
-
-    print(f"Extracted {len(article_urls)} relevant article URLs")
-    return article_urls
-
-async def extract_globalnews_article_info(page):
-    video_audio_links = set()
-
-    video_tags = await page.query_selector_all("video")
-    for v in video_tags:
-        src = await v.get_attribute("src")
-        if src:
-            video_audio_links.add(normalize_media_url(src))
-
-    audio_tags = await page.query_selector_all("audio")
-    for a in audio_tags:
-        src = await a.get_attribute("src")
-        if src:
-            video_audio_links.add(normalize_media_url(src))
-
-    anchors = await page.eval_on_selector_all(
-        'a[href^="https://globalnews.ca/player/play/video/"], '
-        'a[href^="https://globalnews.ca/player/play/audio/"]',
-        'elements => elements.map(el => el.href)'
-    )
-    for link in anchors:
-        video_audio_links.add(normalize_media_url(link))
-
-    iframe_srcs = await page.eval_on_selector_all(
-        (
-            'iframe.c-video__embed, '
-            'iframe[id^="miniplayer_"], '
-            'iframe[src*="youtube.com/embed/"], '
-            'iframe[src*="youtube-nocookie.com/embed/"]'
-        ),
-        'nodes => nodes.map(n => n.src)'
-    )
-    for src in iframe_srcs or []:
-        if not src:
-            continue
-        if "youtube.com/embed/" in src or "youtube-nocookie.com/embed/" in src:
-            video_audio_links.add(src.split("?", 1)[0])
-        else:
-            video_audio_links.add(normalize_media_url(src))
-
-    content = await page.content()
-    patterns = [
-        r'https://globalnews\.ca/player/play(?:/video)?/[0-9\.]+',
-        r'https://globalnews\.ca/player/play/audio/[0-9\.]+',
-        r'https://globalnews\.ca/video/embed/[0-9]+[^"\'\s]*',
-        r'https://globalnews\.ca/i/phoenix/player/syndicate/\?[^\s"\']+',
-        r'https://www\.youtube\.com/embed/[A-Za-z0-9_-]+',
-        r'https://www\.youtube-nocookie\.com/embed/[A-Za-z0-9_-]+',
+
+def parse_globalnews_media(media, markup):
+    urls = [
+        *(media.get("tags") or []),
+        *(media.get("playerLinks") or []),
+        *(media.get("iframes") or []),
     ]
-    for pattern in patterns:
-        for match in re.findall(pattern, content):
-            if "youtube.com/embed/" in match or "youtube-nocookie.com/embed/" in match:
-                video_audio_links.add(match.split("?", 1)[0])
-            else:
-                video_audio_links.add(normalize_media_url(match))
-
-    jsonld_element = await page.query_selector('script[type="application/ld+json"]')
-    jsonld_content = await jsonld_element.text_content() if jsonld_element else None
+
+    jsonld_content = markup.get("jsonld")
     if jsonld_content:
         try:
             data = json.loads(jsonld_content)
             if isinstance(data, dict):
-                videos = data.get("video", [])
-                if isinstance(videos, dict):
-                    videos = [videos]
-                for v in videos:
-                    for key in ["embedUrl", "contentUrl"]:
-                        url = v.get(key)
-                        if url:
-                            if "youtube.com/embed/" in url or "youtube-nocookie.com/embed/" in url:
-                                video_audio_links.add(url.split("?", 1)[0])
-                            else:
-                                video_audio_links.add(normalize_media_url(url))
-
-                audios = data.get("audio", [])
-                if isinstance(audios, dict):
-                    audios = [audios]
-                for a in audios:
-                    for key in ["embedUrl", "contentUrl"]:
-                        url = a.get(key)
-                        if url:
-                            video_audio_links.add(normalize_media_url(url))
+                for kind in ["video", "audio"]:
+                    objects = data.get(kind, [])
+                    if isinstance(objects, dict):
+                        objects = [objects]
+                    for obj in objects:
+                        urls.extend(obj.get(key) for key in ["embedUrl", "contentUrl"])
         except json.JSONDecodeError:
             pass
 
-    additional_authors = ""
-    em_elements = await page.query_selector_all("article p em")
-    for em in em_elements:
-        text = (await em.text_content()).strip()
+    video_audio_links = {MEDIA_SCANNER.normalize(url) for url in urls if url}
+    video_audio_links |= MEDIA_SCANNER.urls(markup.get("html") or "")
+    return sorted(video_audio_links)
+
+def parse_additional_authors(credits):
+    for text in credits:
+        text = (text or "").strip()
         if text.lower().startswith("with files by") or text.lower().startswith("with files from"):
-            additional_authors = text.strip("—").strip()
-            break
-
-    return sorted(video_audio_links), additional_authors
-
-async def check_ai_mention(page):
-    keywords = ["ChatGPT", "automated", "robot", "AI tools", "data team", "OpenAI", "Otter.ai",
-                "AI-Based", "artificial intelligence", "machine learning", "AI model",
-                "AI technology", "AI-generated", "AI-assisted"]
-    try:
-        article_element = await page.query_selector("article")
-        if not article_element:
-            return "False"
-        paragraphs = await article_element.query_selector_all("p")
-        text_content = " ".join([await p.inner_text() for p in paragraphs])
-    except Exception:
-        return "False"
-
-    text_lower = text_content.lower()
-    for kw in keywords:
-        if kw.lower() in text_lower:
-            return f"True - {kw}"
-    return "False"
-
-async def extract_author_contacts(context, profile_urls):
+            return text.strip("—").strip()
+    return ""
+
+def parse_profile_contacts(text, hrefs):
     contacts = set()
-    seen_profiles = set()
 
-    for purl in profile_urls or []:
-        if not purl or purl in seen_profiles:
+    for m in re.findall(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}", text):
+        contacts.add(f"mailto:{m}")
+
+    for m in re.findall(r"@([A-Za-z0-9_]{2,})", text):
+        handle = m.lower()
+        if handle in {"am640", "globalnews"}:
             continue
-        seen_profiles.add(purl)
+        contacts.add(f"https://twitter.com/{handle}")
 
-        page = await context.new_page()
-        try:
-            await page.goto(purl, wait_until="domcontentloaded", timeout=60000)
-            await page.wait_for_timeout(1000)
-
-            try:
-                text = await page.inner_text("body")
-            except Exception:
-                text = ""
-
-            for m in re.findall(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}", text):
-                contacts.add(f"mailto:{m}")
-
-            for m in re.findall(r"@([A-Za-z0-9_]{2,})", text):
-                handle = m.lower()
-                if handle in {"am640", "globalnews"}:
-                    continue
-                contacts.add(f"https://twitter.com/{handle}")
-
-            links = await page.query_selector_all("a[href]")
-            for a in links:
-                href = await a.get_attribute("href")
-                if not href:
-                    continue
-
-                if ("twitter.com/am640" in href or "x.com/am640" in href or
-                        "twitter.com/globalnews" in href or "x.com/globalnews" in href):
-                    continue
-                if "linkedin.com/company/global-television" in href:
-                    continue
-
-                if "twitter.com/intent/tweet" in href:
-                    continue
-                if href.startswith("mailto:?"):
-                    continue
-
-                if href.startswith("mailto:") and "@" in href:
-                    contacts.add(href)
-                    continue
-
-                m_tw = re.match(r"^https?://(twitter|x)\.com/([^/?#]+)$", href)
-                if m_tw:
-                    handle = m_tw.group(2).lower()
-                    if handle in {"am640", "globalnews"}:
-                        continue
-                    contacts.add(href)
-                    continue
-
-                if re.match(r"^https?://(www\.)?linkedin\.com/in/[^/?#]+", href):
-                    contacts.add(href)
-                    continue
-
-        except Exception:
-            pass
-        finally:
-            await page.close()
+    for href in hrefs:
+        if not href:
+            continue
 
-    return "\n".join(sorted(contacts))
+        if ("twitter.com/am640" in href or "x.com/am640" in href or
+                "twitter.com/globalnews" in href or "x.com/globalnews" in href):
+            continue
+        if "linkedin.com/company/global-television" in href:
+            continue
 
-async def save_pdf_with_metadata(playwright_page, url, drive_service, folder_id):
-    await playwright_page.goto(url, wait_until="domcontentloaded", timeout=60000)
-    await playwright_page.wait_for_timeout(2000)
-
-    title_element = await playwright_page.query_selector("h1")
-    title = await title_element.inner_text() if title_element else "No title found"
-
-    authors = []
-    author_profile_links = []
-    try:
-        author_elements = await playwright_page.query_selector_all(
-            ".c-byline__attribution span a.c-byline__name.c-byline__link"
-        )
-        for author_elem in author_elements:
-            text = await author_elem.text_content()
-            href = await author_elem.get_attribute("href")
-            if text:
-                authors.append(text.strip())
-            if href:
-                full = href if href.startswith("http") else f"https://globalnews.ca{href}"
-                author_profile_links.append(full)
-    except Exception:
-        pass
-
-    if not authors:
-        try:
-            author_text = await playwright_page.eval_on_selector(
-                "#article-byline .c-byline__attribution span:first-child",
-                "el => el.textContent.trim().replace(/^By\\s+/i, '')"
-            )
-            if author_text:
-                authors = [author_text]
-        except Exception:
-            authors = []
-
-    affiliation = ""
-    try:
-        affiliation = await playwright_page.eval_on_selector(
-            ".c-byline__source.c-byline__source--hasName, .c-byline__source.c-byline__source--noName",
-            "el => el.textContent.trim()"
-        )
-    except Exception:
-        affiliation = ""
+        if "twitter.com/intent/tweet" in href:
+            continue
+        if href.startswith("mailto:?"):
+            continue
+
+        if href.startswith("mailto:") and "@" in href:
+            contacts.add(href)
+            continue
 
+        m_tw = re.match(r"^https?://(twitter|x)\.com/([^/?#]+)$", href)
+        if m_tw:
+            handle = m_tw.group(2).lower()
+            if handle in {"am640", "globalnews"}:
+                continue
+            contacts.add(href)
+            continue
+
+        if re.match(r"^https?://(www\.)?linkedin\.com/in/[^/?#]+", href):
+            contacts.add(href)
+            continue
+
+    return contacts
+
+# One profile's contacts, through the author cache when there is one
+async def profile_contacts(pages, fetcher, authors, purl):
+    async def fetch():
+        with metrics.span("author_profile"):
+            text, hrefs = await read_profile(pages, fetcher, purl)
+        return parse_profile_contacts(text, hrefs)
+
+    if authors is None:
+        return await fetch()
+    return await authors.get(purl, fetch)
+
+async def extract_author_contacts(pages, fetcher, authors, profile_urls):
+    contacts = set()
+    profiles = list(dict.fromkeys(purl for purl in profile_urls or [] if purl))
+
+    results = await asyncio.gather(
+        *(profile_contacts(pages, fetcher, authors, purl) for purl in profiles),
+        return_exceptions=True
+    )
+    for result in results:
+        if isinstance(result, Exception):
+            continue
+        contacts |= result
+
+    return "\n".join(sorted(contacts))
+
+def parse_byline(byline):
+    authors = [a.strip() for a in byline.get("authors") or [] if a]
+    if not authors and byline.get("fallbackAuthor"):
+        authors = [byline["fallbackAuthor"]]
+    profile_links = [
+        href if href.startswith("http") else f"https://globalnews.ca{href}"
+        for href in byline.get("profileLinks") or []
+    ]
     authors_str = ", ".join(authors) if authors else "No author found"
-    affiliation_str = affiliation if affiliation else "No affiliation found"
-
-    date_posted = "No date found"
-    publish_date = ""
-    updated_date = ""
-
-    try:
-        publish_date = await playwright_page.eval_on_selector(
-            ".c-byline__date--pubDate span",
-            "el => el.textContent.replace('Posted ', '').trim()"
-        )
-    except Exception:
-        pass
-
-    try:
-        updated_date = await playwright_page.eval_on_selector(
-            ".c-byline__date--ModDate span, .c-byline__date--modDate span",
-            "el => el.textContent.replace('Updated ', '').trim()"
-        )
-    except Exception:
-        pass
+    affiliation_str = byline.get("affiliation") or "No affiliation found"
+    return authors_str, affiliation_str, profile_links
 
+def parse_date_posted(dates):
+    publish_date = dates.get("published")
+    updated_date = dates.get("updated")
     if publish_date and updated_date:
-        date_posted = f"{publish_date} (Updated: {updated_date})"
+        return f"{publish_date} (Updated: {updated_date})"
     elif publish_date:
-        date_posted = publish_date
+        return publish_date
     elif updated_date:
-        date_posted = f"Updated: {updated_date}"
+        return f"Updated: {updated_date}"
+    return "No date found"
 
-    date_str = datetime.now().strftime("%Y-%m-%d")
-    safe_title = "".join(c for c in title if c.isalnum() or c in (" ", "-")).replace(" ", "_")[:60]
-    pdf_file = f"globalnews_story_{safe_title}_{date_str}.pdf"
-
-    print(f"Title: {title}")
+# Sheet row from an article bundle and the contacts found on its author profiles
+def row_from_bundle(url, bundle, social_email):
+    authors_str, affiliation_str, _ = parse_byline(bundle["byline"])
+    date_posted = parse_date_posted(bundle["dates"])
     print(f"Authors: {authors_str}")
     print(f"Affiliation: {affiliation_str}")
     print(f"Date posted: {date_posted}")
-    print(f"Saving PDF: {pdf_file}")
 
-    await playwright_page.pdf(
-        path=pdf_file,
-        format="A4",
-        print_background=True,
-        margin={"top": "10mm", "bottom": "10mm", "left": "10mm", "right": "10mm"}
-    )
+    video_audio_links = parse_globalnews_media(bundle["media"], bundle["markup"])
+    ai_mention = check_ai_mention(bundle["paragraphs"])
+    additional_affiliations = ", ".join(x for x in [parse_additional_authors(bundle["credits"])] if x)
+
+    return [
+        bundle["title"] or "No title found",  # Title
+        authors_str,  # Author
+        social_email,  # Social/Email
+        affiliation_str,  # Affiliation
+        url,  # Link
+        date_posted,  # Date Posted/Last Updated
+        additional_affiliations,  # Additional Affiliations
+        "\n".join(video_audio_links) if video_audio_links else "",  # Video/Audio Flag
+        ai_mention  # AI Mention?
+    ]
+
+async def build_row(page, pages, url, bundle, fetcher, authors):
+    _, _, author_profile_links = parse_byline(bundle["byline"])
+    social_email = await extract_author_contacts(pages, fetcher, authors, author_profile_links)
+    return row_from_bundle(url, bundle, social_email)
+
+# ARTICLE_BUNDLE_SCRIPT and static_bundle read back out of a saved snapshot
+def bundle_from_html(url, html):
+    tree = parse_html(html)
+    h1 = tree.css_first("h1")
+    article = tree.css_first("article")
+    author_links = tree.css(".c-byline__attribution span a.c-byline__name.c-byline__link")
+    fallback_author = text_content(tree.css_first("#article-byline .c-byline__attribution span:first-child"))
+    pub_date = tree.css_first(".c-byline__date--pubDate span")
+    mod_date = tree.css_first(".c-byline__date--ModDate span, .c-byline__date--modDate span")
+    return {
+        "title": inner_text(h1),
+        "byline": {
+            "authors": [a.text(deep=True) for a in author_links],
+            "profileLinks": [a.attributes.get("href") for a in author_links if a.attributes.get("href")],
+            "fallbackAuthor": re.sub(r"^By\s+", "", fallback_author, flags=re.I) if fallback_author else None,
+            "affiliation": text_content(tree.css_first(
+                ".c-byline__source.c-byline__source--hasName, .c-byline__source.c-byline__source--noName"
+            )),
+        },
+        "dates": {
+            "published": pub_date.text(deep=True).replace("Posted ", "", 1).strip() if pub_date else None,
+            "updated": mod_date.text(deep=True).replace("Updated ", "", 1).strip() if mod_date else None,
+        },
+        "paragraphs": [inner_text(p) for p in article.css("p")] if article is not None else [],
+        "credits": [em.text(deep=True) for em in tree.css("article p em")],
+        "media": {
+            "tags": attrs(tree, "video, audio", "src"),
+            "playerLinks": [
+                absolute(url, href) for href in attrs(
+                    tree,
+                    'a[href^="https://globalnews.ca/player/play/video/"], '
+                    'a[href^="https://globalnews.ca/player/play/audio/"]',
+                    "href"
+                )
+            ],
+            "iframes": [
+                absolute(url, src) for src in attrs(
+                    tree,
+                    'iframe.c-video__embed, iframe[id^="miniplayer_"], '
+                    'iframe[src*="youtube.com/embed/"], iframe[src*="youtube-nocookie.com/embed/"]',
+                    "src"
+                )
+            ],
+        },
+        **static_bundle(url, html),
+    }
 
-    file_metadata = {'name': os.path.basename(pdf_file), 'parents': [folder_id]}
-    media = MediaFileUpload(pdf_file, mimetype='application/pdf', resumable=True)
-    file = drive_service.files().create(
-        body=file_metadata, media_body=media, fields='id'
-    ).execute()
-    print(f"Uploaded {pdf_file} to Google Drive with file ID {file['id']}")
-
-    return (title, authors_str, affiliation_str, url, date_posted, author_profile_links)
-
-def ensure_header_row(service):
-    sheet = service.spreadsheets()
-    header = [[
-        "Title",
-        "Author",
-        "Social/Email",
-        "Affiliation",
-        "Link",
-        "Date Posted/Last Updated",
-        "Additional Affiliations",
-        "Video/Audio Links",
-        "AI Mention?"
-    ]]
-    sheet.values().update(
-        spreadsheetId=SPREADSHEET_ID,
-        range=f"{SHEET_NAME}!A1:I1",
-        valueInputOption="RAW",
-        body={'values': header}
-    ).execute()
-
-def append_to_google_sheet(data_rows, service):
-    sheet = service.spreadsheets()
-    body = {'values': data_rows}
-    result = sheet.values().append(
-        spreadsheetId=SPREADSHEET_ID,
-        range=f"{SHEET_NAME}!A:I",
-        valueInputOption="RAW",
-        insertDataOption="INSERT_ROWS",
-        body=body
-    ).execute()
-    print(f"{result.get('updates').get('updatedRows')} rows appended to Google Sheet")
-
-async def main():
-    creds = get_oauth_credentials()
-    drive_service = gsheet_build('drive', 'v3', credentials=creds)
-    sheet_service = gsheet_build('sheets', 'v4', credentials=creds)
-
-    capture_folder_id = create_dated_capture_folder(drive_service)
-
-    homepage_url = "https://globalnews.ca"
-    date_str = datetime.now().strftime("%Y-%m-%d")
-    homepage_pdf = f"globalnews_homepage_{date_str}.pdf"
-
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        context = await browser.new_context(
-            viewport={"width": 1600, "height": 4000},
-            ignore_https_errors=True
-        )
-        page = await context.new_page()
-
-        await page.goto(homepage_url, wait_until="domcontentloaded", timeout=120000)
-        await page.wait_for_timeout(2000)
-
-        article_urls = await extract_relevant_article_links(page)
-        print(f"Filtered {len(article_urls)} article URLs after extraction.")
-        for url in article_urls:
-            print(url)
-
-        await page.pdf(
-            path=homepage_pdf,
-            format="A4",
-            print_background=True,
-            margin={"top": "10mm", "bottom": "10mm", "left": "10mm", "right": "10mm"}
-        )
-        print(f"Homepage PDF saved as {homepage_pdf}")
-        file_metadata = {'name': os.path.basename(homepage_pdf), 'parents': [capture_folder_id]}
-        media = MediaFileUpload(homepage_pdf, mimetype='application/pdf', resumable=True)
-        drive_service.files().create(
-            body=file_metadata, media_body=media, fields='id'
-        ).execute()
-
-        metadata_rows = []
-        for link in article_urls:
-            article_page = await context.new_page()
-            meta = await save_pdf_with_metadata(article_page, link, drive_service, capture_folder_id)
-            video_audio_links, additional_author_info = await extract_globalnews_article_info(article_page)
-            ai_mention = await check_ai_mention(article_page)
-            additional_affiliations = ", ".join(x for x in [additional_author_info] if x)
-
-            social_email = await extract_author_contacts(context, meta[5])
-
-            row = (
-                meta[0],  # Title
-                meta[1],  # Author
-                social_email,  # Social/Email
-                meta[2],  # Affiliation
-                meta[3],  # Link
-                meta[4],  # Date Posted/Last Updated
-                additional_affiliations,  # Additional Affiliations
-                "\n".join(video_audio_links) if video_audio_links else "",  # Video/Audio Flag
-                ai_mention  # AI Mention?
-            )
-            metadata_rows.append(row)
-            await article_page.close()
-
-        await browser.close()
-
-    ensure_header_row(sheet_service)
-    append_to_google_sheet(metadata_rows, sheet_service)
+# Author profile pages are not part of the snapshot, so offline rows leave
+# Social/Email empty rather than going back to the live site for them
+def snapshot_row(url, html):
+    return row_from_bundle(url, bundle_from_html(url, html), "")
+
+ADAPTER = SiteAdapter(
+    name="Global News",
+    homepage_url=GLOBALNEWS_HOMEPAGE,
+    base_url="https://globalnews.ca",
+    link_pattern=ARTICLE_PATTERN,
+    file_prefix="globalnews",
+    article_file_prefix="globalnews_story",
+    capture_folder_id=GLOBALNEWS_CAPTURE_FOLDER_ID,
+    spreadsheet_id=SPREADSHEET_ID,
+    sheet_name=SHEET_NAME,
+    header=HEADER,
+    bundle_script=ARTICLE_BUNDLE_SCRIPT,
+    static_bundle=static_bundle,
+    static_bundle_rendered=True,
+    build_row=build_row,
+    snapshot_row=snapshot_row,
+    homepage_ready_signals=HOMEPAGE_READY_SIGNALS,
+    article_ready_signals=ARTICLE_READY_SIGNALS,
+    network_policy=NETWORK_POLICY,
+    context_options={"viewport": {"width": 1600, "height": 4000}, "ignore_https_errors": True},
+    max_concurrent_articles=MAX_CONCURRENT_ARTICLES,
+)
+
+async def main(resume=False):
+    await run_site(ADAPTER, resume=resume)
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    args = parse_run_args("Capture Global News.")
+    asyncio.run(main(resume=args.resume))
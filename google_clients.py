@@ -0,0 +1,77 @@
+import json
+import threading
+from googleapiclient.discovery import build, build_from_document
+from googleapiclient.discovery_cache import get_static_doc
+
+DRIVE_API = ('drive', 'v3')
+SHEETS_API = ('sheets', 'v4')
+
+
+# Stands in for a service object: every attribute is looked up on the calling
+# thread's own service, so one proxy can be handed to any number of threads.
+# Requests must be executed on the thread that created them.
+class ThreadLocalService:
+    def __init__(self, clients, api, version):
+        self._clients = clients
+        self._api = api
+        self._version = version
+
+    def __getattr__(self, name):
+        return getattr(self._clients.service(self._api, self._version), name)
+
+
+# Google API clients for every worker thread in the process. A service wraps a
+# single httplib2.Http, which is not thread-safe, so each thread gets its own
+# authorized Http from the CredentialManager (kept alive between requests, so a
+# thread's uploads and appends reuse its connections) and builds its services on
+# it. The discovery document of each API is parsed once and shared, so building
+# a thread's service does not read or fetch it again.
+class GoogleClients:
+    def __init__(self, credentials):
+        self.credentials = credentials
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._documents = {}
+        self._https = []
+
+    def _document(self, api, version):
+        with self._lock:
+            if (api, version) not in self._documents:
+                doc = get_static_doc(api, version)
+                self._documents[(api, version)] = json.loads(doc) if doc else None
+            return self._documents[(api, version)]
+
+    def _http(self):
+        if not hasattr(self._local, "http"):
+            self._local.http = self.credentials.authorized_http()
+            with self._lock:
+                self._https.append(self._local.http)
+        return self._local.http
+
+    # The calling thread's service for api/version, built on first use
+    def service(self, api, version):
+        if not hasattr(self._local, "services"):
+            self._local.services = {}
+        services = self._local.services
+        if (api, version) not in services:
+            document = self._document(api, version)
+            if document is None:
+                # No bundled document for this API: let build() fetch it
+                services[(api, version)] = build(api, version, http=self._http())
+            else:
+                services[(api, version)] = build_from_document(document, http=self._http())
+        return services[(api, version)]
+
+    def drive(self):
+        return ThreadLocalService(self, *DRIVE_API)
+
+    def sheets(self):
+        return ThreadLocalService(self, *SHEETS_API)
+
+    # Stop refreshing the token and close every thread's connections
+    def close(self):
+        self.credentials.stop()
+        with self._lock:
+            https, self._https = self._https, []
+        for http in https:
+            http.close()
@@ -0,0 +1,53 @@
+import time
+import httpx
+
+HTTP_MAX_CONNECTIONS = 16 # Pooled connections shared by every outlet in the run
+HTTP_TIMEOUT = 20.0 # Seconds before a static fetch gives up
+HTTP_USER_AGENT = (
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
+)
+
+
+# Pooled async HTTP client for markup that needs no rendering: article server
+# HTML (JSON-LD, __INITIAL_STATE__) and author profile pages. Connections are
+# kept alive and reused across outlets, so a lookup costs one request instead
+# of a browser tab.
+class HttpFetcher:
+    def __init__(self, max_connections=HTTP_MAX_CONNECTIONS, timeout=HTTP_TIMEOUT, transport=None):
+        self.client = httpx.AsyncClient(
+            headers={
+                "User-Agent": HTTP_USER_AGENT,
+                "Accept-Language": "en-CA,en;q=0.9,fr-CA;q=0.8",
+            },
+            limits=httpx.Limits(
+                max_connections=max_connections, max_keepalive_connections=max_connections
+            ),
+            timeout=timeout,
+            follow_redirects=True,
+            transport=transport,
+        )
+        self._started_at = time.monotonic()
+        self.fetched = 0
+        self.failed = 0
+        self.bytes_fetched = 0
+
+    # Body of url as text; raises httpx.HTTPError on network errors and non-2xx
+    async def get_text(self, url):
+        try:
+            response = await self.client.get(url)
+            response.raise_for_status()
+        except httpx.HTTPError:
+            self.failed += 1
+            raise
+        self.fetched += 1
+        self.bytes_fetched += len(response.content)
+        return response.text
+
+    async def close(self):
+        await self.client.aclose()
+
+    def report(self):
+        elapsed = time.monotonic() - self._started_at
+        print(f"HTTP fetches: {self.fetched} succeeded, {self.failed} failed, "
+              f"{self.bytes_fetched / 1_000_000:.1f} MB in {elapsed:.0f}s")
@@ -1,22 +1,16 @@
 import asyncio
-import os
-from datetime import datetime
 import re
 import json
-from playwright.async_api import async_playwright
-from googleapiclient.discovery import build
-from googleapiclient.http import MediaFileUpload
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.auth.transport.requests import Request
-import pickle
+from capture_engine import SiteAdapter, check_ai_mention, parse_run_args, read_profile, run_site
+import metrics
+from network_policy import NetworkPolicy
+from readiness import selector, content_loaded
+from snapshots import attrs, inner_text, parse_html, text_content, texts
 
-SCOPES = ['https://www.googleapis.com/auth/spreadsheets',
-          'https://www.googleapis.com/auth/drive']
-CLIENT_SECRETS_FILE = 'credentials.json'
-TOKEN_PICKLE = 'token.json'
 SPREADSHEET_ID = "NAME" # Enter Google Sheet ID
 SHEET_NAME = "NAME" # Enter Google Sheet Tab name
 LAPRESSE_CAPTURE_FOLDER_ID = "NAME" # Enter Google Drive folder ID
+MAX_CONCURRENT_ARTICLES = 4 # Number of article pages captured in parallel
 LA_PRESSE_HOMEPAGE = "https://www.lapresse.ca/"
 ARTICLE_PATTERN = re.compile(
     r"^https?://www\.lapresse\.ca/.+/\d{4}-\d{2}-\d{2}/.+\.php$"
@@ -26,262 +20,141 @@ EXCLUDED_ARTICLE_URLS = {
     "fin-de-l-acces-aux-nouvelles-sur-facebook-instagram-et-google/"
     "comment-continuer-de-vous-informer-efficacement-et-gratuitement.php"
 }
+HEADER = [
+    "Title",
+    "Author",
+    "Social/Email",
+    "Link",
+    "Date Posted/Last Updated",
+    "Additional Affiliations",
+    "Video/Audio Links",
+    "AI Mention?"
+]
+
+# Signals that a page is ready to capture; the hard caps match the old fixed sleeps
+HOMEPAGE_READY_SIGNALS = [selector("a[href$='.php']")]
+ARTICLE_READY_SIGNALS = [
+    selector("h1.headlines"),
+    selector("div.authorModule, time[itemprop='datePublished']"),
+    content_loaded(),
+]
+
+NETWORK_POLICY = NetworkPolicy()
+
+# Everything read from an article before its PDF is rendered, in one round-trip
+ARTICLE_BUNDLE_SCRIPT = """() => {
+    const text = el => el ? el.textContent.trim() : null;
+    const texts = sel => Array.from(document.querySelectorAll(sel)).map(el => el.textContent.trim());
+    const attrs = (sel, name) =>
+        Array.from(document.querySelectorAll(sel)).map(n => n.getAttribute(name)).filter(Boolean);
+    const article = document.querySelector('article');
+    const profileMeta = document.querySelector('div.authorModule meta[itemprop="url"]');
+    const profileLink = document.querySelector('div.authorModule a[href^="/auteurs/"]');
+    return {
+        title: text(document.querySelector('h1.headlines.titleModule span.title')),
+        byline: {
+            authors: texts('div.authorModule__details span.authorModule__name'),
+            affiliation: text(document.querySelector('div.authorModule__details span.authorModule__affiliation')),
+            organisation: text(document.querySelector(
+                'span.organization.authorModule__organisation[itemprop="affiliation"]'
+            )),
+        },
+        credits: texts('p.credit.photoModule__caption.photoModule__caption--credit').filter(t => t),
+        dates: {
+            published: document.querySelector('time[itemprop="datePublished"]')?.getAttribute('datetime') || null,
+            updated: document.querySelector('time[itemprop="dateModified"]')?.getAttribute('datetime') || null,
+        },
+        paragraphs: article ? Array.from(article.querySelectorAll('p')).map(p => p.innerText) : [],
+        media: {
+            sources: attrs('video, audio, video source, audio source', 'src'),
+            encodings: attrs('video[data-video-encodings]', 'data-video-encodings'),
+            audioUrls: attrs('div[data-audio-url], audio[data-audio-url]', 'data-audio-url'),
+        },
+        contacts: {
+            profileUrl: profileMeta?.getAttribute('content') || profileLink?.getAttribute('href') || null,
+            hrefs: attrs('a[href]', 'href'),
+        },
+    };
+}"""
+
+def scan_links_for_contacts(hrefs):
+    local_contacts = set()
+
+    for href in hrefs:
+        if not href:
+            continue
 
-def create_dated_capture_folder(drive_service):
-    date_str = datetime.now().strftime("%Y-%m-%d")
-    folder_metadata = {
-        'name': date_str + " Capture",
-        'mimeType': 'application/vnd.google-apps.folder',
-        'parents': [LAPRESSE_CAPTURE_FOLDER_ID],
-    }
-    folder = drive_service.files().create(
-        body=folder_metadata,
-        fields='id'
-    ).execute()
-    folder_id = folder['id']
-    print(f"Created capture folder for {date_str} with ID {folder_id}")
-    return folder_id
-
-def authenticate_google_services():
-    creds = None
-    if os.path.exists('token.pickle'):
-        with open('token.pickle', 'rb') as token:
-            creds = pickle.load(token)
-    if not creds or not creds.valid:
-        if creds and creds.expired and creds.refresh_token:
-            creds.refresh(Request())
-        else:
-            flow = InstalledAppFlow.from_client_secrets_file(CLIENT_SECRETS_FILE, SCOPES)
-            creds = flow.run_local_server(port=0)
-        with open('token.pickle', 'wb') as token:
-            pickle.dump(creds, token)
-    drive_service = build('drive', 'v3', credentials=creds)
-    sheets_service = build('sheets', 'v4', credentials=creds)
-    return drive_service, sheets_service
-
-async def scroll_to_bottom(page, scroll_delay=1000, max_scrolls=20):
-    previous_height = await page.evaluate("document.body.scrollHeight")
-    scrolls = 0
-    while scrolls < max_scrolls:
-        await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-        await page.wait_for_timeout(scroll_delay)
-        new_height = await page.evaluate("document.body.scrollHeight")
-        if new_height == previous_height:
-            break
-        previous_height = new_height
-        scrolls += 1
-
-async def extract_article_links(page):
-    elems = await page.query_selector_all("a")
-    seen_urls = set()
-    urls = []
-    for elem in elems:
-        href = await elem.get_attribute('href')
-        if href:
-            if not href.startswith("http"):
-                href = "https://www.lapresse.ca" + href
-
-            if href in EXCLUDED_ARTICLE_URLS:
-                continue
-
-            if ARTICLE_PATTERN.match(href) and href not in seen_urls:
-                seen_urls.add(href)
-                urls.append(href)
-    return urls
-
-async def check_ai_mention(page):
-    keywords = ["ChatGPT", "automated", "robot", "AI tools", "data team", "OpenAI", "Otter.ai",
-                "AI-Based", "artificial intelligence", "machine learning", "AI model",
-                "AI technology", "AI-generated", "AI-assisted"]
-    try:
-        article_element = await page.query_selector("article")
-        if not article_element:
-            return "False"
-        paragraphs = await article_element.query_selector_all("p")
-        text_content = " ".join([await p.inner_text() for p in paragraphs])
-    except Exception:
-        return "False"
-    text_lower = text_content.lower()
-    for kw in keywords:
-        if kw.lower() in text_lower:
-            return f"True - {kw}"
-    return "False"
-
-async def extract_author_contacts(context, article_page):
-    contacts = set()
-    profile_url = None
-
-    try:
-        profile_url = await article_page.eval_on_selector(
-            'div.authorModule meta[itemprop="url"]',
-            'el => el.getAttribute("content")'
-        )
-    except Exception:
-        profile_url = None
-
-    if not profile_url:
-        try:
-            href = await article_page.eval_on_selector(
-                'div.authorModule a[href^="/auteurs/"]',
-                'el => el.getAttribute("href")'
-            )
-            if href:
-                profile_url = href if href.startswith("http") else "https://www.lapresse.ca" + href
-        except Exception:
-            profile_url = None
-
-    async def scan_page_for_contacts(page):
-        local_contacts = set()
-        try:
-            links = await page.query_selector_all("a[href]")
-        except Exception:
-            return local_contacts
+        if "intent/tweet" in href:
+            continue
 
-        for a in links:
-            href = await a.get_attribute("href")
-            if not href:
-                continue
+        if href.startswith("mailto:") and "@" in href:
+            local_contacts.add(href)
+            continue
 
-            if "intent/tweet" in href:
+        m_tw = re.match(r"^https?://(twitter|x)\.com/([^/?#]+)$", href)
+        if m_tw:
+            handle = m_tw.group(2).lower()
+            if handle in {"lp_lapresse"}:
                 continue
+            local_contacts.add(href)
+            continue
 
-            if href.startswith("mailto:") and "@" in href:
-                local_contacts.add(href)
-                continue
+        if re.match(r"^https?://(www\.)?linkedin\.com/in/[^/?#]+", href):
+            local_contacts.add(href)
+            continue
 
-            m_tw = re.match(r"^https?://(twitter|x)\.com/([^/?#]+)$", href)
-            if m_tw:
-                handle = m_tw.group(2).lower()
-                if handle in {"lp_lapresse"}:
-                    continue
-                local_contacts.add(href)
-                continue
+    return local_contacts
 
-            if re.match(r"^https?://(www\.)?linkedin\.com/in/[^/?#]+", href):
-                local_contacts.add(href)
-                continue
+async def extract_author_contacts(pages, fetcher, authors, bundle_contacts):
+    contacts = scan_links_for_contacts(bundle_contacts.get("hrefs") or [])
 
-        return local_contacts
+    profile_url = bundle_contacts.get("profileUrl")
+    if profile_url and not profile_url.startswith("http"):
+        profile_url = "https://www.lapresse.ca" + profile_url
 
-    contacts |= await scan_page_for_contacts(article_page)
+    async def fetch():
+        with metrics.span("author_profile"):
+            _, hrefs = await read_profile(pages, fetcher, profile_url)
+        return scan_links_for_contacts(hrefs)
 
     if profile_url:
-        p = await context.new_page()
         try:
-            await p.goto(profile_url, wait_until="domcontentloaded", timeout=60000)
-            await p.wait_for_timeout(1000)
-            contacts |= await scan_page_for_contacts(p)
+            contacts |= await fetch() if authors is None else await authors.get(profile_url, fetch)
         except Exception:
             pass
-        finally:
-            await p.close()
 
     return "\n".join(sorted(contacts))
 
-async def extract_article_data(page):
-    title = "No title"
-    try:
-        title = await page.eval_on_selector(
-            'h1.headlines.titleModule span.title',
-            'el => el.textContent.trim()'
-        )
-    except Exception:
-        pass
-
+def parse_author(byline):
     author_name = None
-    try:
-        author_names = await page.eval_on_selector_all(
-            'div.authorModule__details span.authorModule__name',
-            'els => els.map(el => el.textContent.trim())'
-        )
-        if author_names:
-            author_name = ", ".join(author_names)
-        else:
-            affiliation_fallback = await page.eval_on_selector(
-                'div.authorModule__details span.authorModule__affiliation',
-                'el => el.textContent.trim()'
-            )
-            if affiliation_fallback:
-                author_name = affiliation_fallback
-    except Exception:
-        try:
-            affiliation_fallback = await page.eval_on_selector(
-                'div.authorModule__details span.authorModule__affiliation',
-                'el => el.textContent.trim()'
-            )
-            if affiliation_fallback:
-                author_name = affiliation_fallback
-        except Exception:
-            author_name = None
+    if byline.get("authors"):
+        author_name = ", ".join(byline["authors"])
+    elif byline.get("affiliation"):
+        author_name = byline["affiliation"]
 
     if not author_name or author_name.lower() in ["", "unknown"]:
-        try:
-            org_name = await page.eval_on_selector(
-                'span.organization.authorModule__organisation[itemprop="affiliation"]',
-                'el => el.textContent.trim()'
-            )
-            if org_name:
-                author_name = org_name
-        except Exception:
-            pass
-
-    affiliation = "La Presse"
-
-    additional_affiliation = ""
-    try:
-        credit_texts = await page.eval_on_selector_all(
-            'p.credit.photoModule__caption.photoModule__caption--credit',
-            'els => els.map(el => el.textContent.trim()).filter(t => t)'
-        )
-        if credit_texts:
-            additional_affiliation = "\n".join(credit_texts)
-    except Exception:
-        additional_affiliation = ""
+        if byline.get("organisation"):
+            author_name = byline["organisation"]
 
-    date_published = None
-    date_updated = None
-    try:
-        date_published = await page.eval_on_selector(
-            'time[itemprop="datePublished"]',
-            'el => el.getAttribute("datetime")'
-        )
-    except Exception:
-        pass
-    try:
-        date_updated = await page.eval_on_selector(
-            'time[itemprop="dateModified"]',
-            'el => el.getAttribute("datetime")'
-        )
-    except Exception:
-        pass
+    if not author_name or author_name.strip() == "":
+        author_name = "Unknown"
+    return author_name
 
+def parse_date_posted(dates):
+    date_published = dates.get("published")
+    date_updated = dates.get("updated")
     if date_published and date_updated and date_updated != date_published:
-        date_posted = f"{date_published} (Updated: {date_updated})"
+        return f"{date_published} (Updated: {date_updated})"
     elif date_published:
-        date_posted = date_published
+        return date_published
     elif date_updated:
-        date_posted = f"Updated: {date_updated}"
-    else:
-        date_posted = "No date found"
+        return f"Updated: {date_updated}"
+    return "No date found"
 
-    media_urls = set()
+def parse_media_urls(media):
+    media_urls = set(media.get("sources") or [])
 
-    media_elements = await page.query_selector_all("video, audio")
-    for media in media_elements:
-        src = await media.get_attribute('src')
-        if src:
-            media_urls.add(src)
-        source_elems = await media.query_selector_all("source")
-        for source in source_elems:
-            src = await source.get_attribute('src')
-            if src:
-                media_urls.add(src)
-
-    video_elems = await page.query_selector_all("video[data-video-encodings]")
-    for v in video_elems:
-        enc = await v.get_attribute("data-video-encodings")
-        if not enc:
-            continue
+    for enc in media.get("encodings") or []:
         try:
             data = json.loads(enc)
             hls = data.get("application/x-mpegURL") or {}
@@ -292,161 +165,104 @@ async def extract_article_data(page):
         except Exception:
             continue
 
-    audio_divs = await page.query_selector_all("div[data-audio-url]")
-    for div in audio_divs:
-        aurl = await div.get_attribute("data-audio-url")
-        if aurl:
-            media_urls.add(aurl)
-
-    audio_tags = await page.query_selector_all("audio[data-audio-url]")
-    for a in audio_tags:
-        aurl = await a.get_attribute("data-audio-url")
-        if aurl:
-            media_urls.add(aurl)
-
-    if not author_name or author_name.strip() == "":
-        author_name = "Unknown"
-
+    media_urls.update(media.get("audioUrls") or [])
+    return sorted(media_urls)
+
+# La Presse file names keep underscores and drop trailing spaces from the title
+def filename_title(title):
+    safe_title = "".join(c for c in title if c.isalnum() or c in (" ", "-", "_")).rstrip()
+    return safe_title.replace(" ", "_")[:60]
+
+# Sheet row from an article bundle and the author's contact links
+def row_from_bundle(url, bundle, social_email):
+    ai_mention = check_ai_mention(bundle["paragraphs"], languages=("fr", "en"))
+    media_urls = parse_media_urls(bundle["media"])
+    media_links_str = "\n".join(media_urls) if media_urls else ""
+    return [
+        bundle["title"] or "No title",
+        parse_author(bundle["byline"]),
+        social_email,
+        url,
+        parse_date_posted(bundle["dates"]),
+        "\n".join(bundle["credits"]),
+        media_links_str,
+        ai_mention,
+    ]
+
+async def build_row(page, pages, url, bundle, fetcher, authors):
+    social_email = await extract_author_contacts(pages, fetcher, authors, bundle["contacts"])
+    return row_from_bundle(url, bundle, social_email)
+
+# ARTICLE_BUNDLE_SCRIPT read back out of a saved snapshot
+def bundle_from_html(url, html):
+    tree = parse_html(html)
+    article = tree.css_first("article")
+    profile_meta = tree.css_first('div.authorModule meta[itemprop="url"]')
+    profile_link = tree.css_first('div.authorModule a[href^="/auteurs/"]')
+    published = tree.css_first('time[itemprop="datePublished"]')
+    updated = tree.css_first('time[itemprop="dateModified"]')
     return {
-        "title": title or "No title",
-        "author": author_name,
-        "affiliation": affiliation,
-        "additional_affiliation": additional_affiliation,
-        "date_posted": date_posted,
-        "media_urls": sorted(media_urls),
+        "title": text_content(tree.css_first("h1.headlines.titleModule span.title")),
+        "byline": {
+            "authors": texts(tree, "div.authorModule__details span.authorModule__name"),
+            "affiliation": text_content(tree.css_first("div.authorModule__details span.authorModule__affiliation")),
+            "organisation": text_content(tree.css_first(
+                'span.organization.authorModule__organisation[itemprop="affiliation"]'
+            )),
+        },
+        "credits": [t for t in texts(tree, "p.credit.photoModule__caption.photoModule__caption--credit") if t],
+        "dates": {
+            "published": published.attributes.get("datetime") if published else None,
+            "updated": updated.attributes.get("datetime") if updated else None,
+        },
+        "paragraphs": [inner_text(p) for p in article.css("p")] if article is not None else [],
+        "media": {
+            "sources": attrs(tree, "video, audio, video source, audio source", "src"),
+            "encodings": attrs(tree, "video[data-video-encodings]", "data-video-encodings"),
+            "audioUrls": attrs(tree, "div[data-audio-url], audio[data-audio-url]", "data-audio-url"),
+        },
+        "contacts": {
+            "profileUrl": (profile_meta.attributes.get("content") if profile_meta else None)
+                or (profile_link.attributes.get("href") if profile_link else None),
+            "hrefs": attrs(tree, "a[href]", "href"),
+        },
     }
 
-async def save_pdf_and_upload(page, url, drive_service, folder_id, prefix="lapresse"):
-    await page.goto(url, wait_until='domcontentloaded', timeout=90000)
-    await page.wait_for_timeout(2000)
-    article_data = await extract_article_data(page)
-    ai_mention = await check_ai_mention(page)
-    date_str = datetime.now().strftime("%Y-%m-%d")
-    safe_title = "".join(
-        c for c in article_data["title"] if c.isalnum() or c in (" ", "-", "_")
-    ).rstrip()
-    safe_title = safe_title.replace(" ", "_")[:60]
-    pdf_filename = f"{prefix}_story_{safe_title}_{date_str}.pdf"
-    await page.pdf(
-        path=pdf_filename,
-        format='A4',
-        print_background=True,
-        margin={"top": "10mm", "bottom": "10mm", "left": "10mm", "right": "10mm"}
-    )
-    file_metadata = {'name': pdf_filename, 'parents': [folder_id]}
-    media = MediaFileUpload(pdf_filename, mimetype='application/pdf')
-    uploaded_file = drive_service.files().create(
-        body=file_metadata, media_body=media, fields='id'
-    ).execute()
-    article_data["ai_mention"] = ai_mention
-    return article_data, pdf_filename, uploaded_file.get('id')
-
-async def append_to_sheet(sheets_service, data_row):
-    loop = asyncio.get_running_loop()
-
-    def append_sync():
-        sheet_range = f"{SHEET_NAME}!A1"
-        body = {'values': [data_row]}
-        result = sheets_service.spreadsheets().values().append(
-            spreadsheetId=SPREADSHEET_ID,
-            range=sheet_range,
-            valueInputOption="USER_ENTERED",
-            insertDataOption="INSERT_ROWS",
-            body=body
-        ).execute()
-        return result
-
-    result = await loop.run_in_executor(None, append_sync)
-    return result
-
-async def ensure_header_row(sheets_service):
-    loop = asyncio.get_running_loop()
-
-    def update_sync():
-        header = [[
-            "Title",
-            "Author",
-            "Social/Email",
-            "Link",
-            "Date Posted/Last Updated",
-            "Additional Affiliations",
-            "Video/Audio Links",
-            "AI Mention?"
-        ]]
-        return sheets_service.spreadsheets().values().update(
-            spreadsheetId=SPREADSHEET_ID,
-            range=f"{SHEET_NAME}!A1:H1",
-            valueInputOption="RAW",
-            body={'values': header}
-        ).execute()
-
-    await loop.run_in_executor(None, update_sync)
-
-async def main():
-    drive_service, sheets_service = authenticate_google_services()
-    await ensure_header_row(sheets_service)
-
-    capture_folder_id = create_dated_capture_folder(drive_service)
-
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        context = await browser.new_context()
-        page = await context.new_page()
-
-        await page.goto(LA_PRESSE_HOMEPAGE, wait_until="domcontentloaded", timeout=90000)
-        await page.wait_for_timeout(5000)
-
-        await scroll_to_bottom(page, scroll_delay=1000, max_scrolls=30)
-
-        homepage_pdf = f"lapresse_homepage_{datetime.now().strftime('%Y-%m-%d')}.pdf"
-        await page.pdf(
-            path=homepage_pdf,
-            format='A4',
-            print_background=True,
-            margin={"top": "10mm", "bottom": "10mm", "left": "10mm", "right": "10mm"}
-        )
-        file_metadata = {'name': homepage_pdf, 'parents': [capture_folder_id]}
-        media = MediaFileUpload(homepage_pdf, mimetype='application/pdf')
-        drive_service.files().create(
-            body=file_metadata, media_body=media, fields='id'
-        ).execute()
-        print(f"Uploaded homepage PDF: {homepage_pdf}")
-
-        article_urls = await extract_article_links(page)
-        print(f"Found {len(article_urls)} article URLs on homepage after scrolling.")
-
-        processed_urls = set()
-        for url in article_urls:
-            if url in processed_urls:
-                print(f"Skipping duplicate article URL: {url}")
-                continue
-            print(f"Processing article {url}")
-            article_page = await context.new_page()
-            try:
-                article_data, pdf_filename, file_id = await save_pdf_and_upload(
-                    article_page, url, drive_service, capture_folder_id
-                )
-                social_email = await extract_author_contacts(context, article_page)
-                media_links_str = "\n".join(article_data["media_urls"]) if article_data["media_urls"] else ""
-                sheet_row = [
-                    article_data["title"],
-                    article_data["author"],
-                    social_email,
-                    url,
-                    article_data["date_posted"],
-                    article_data.get("additional_affiliation", ""),
-                    media_links_str,
-                    article_data.get("ai_mention", "False"),
-                ]
-                append_result = await append_to_sheet(sheets_service, sheet_row)
-                print(f"Appended row to sheet for article: {article_data['title']}")
-                processed_urls.add(url)
-            except Exception as e:
-                print(f"Error processing {url}: {e}")
-            finally:
-                await article_page.close()
+# The author profile page is not part of the snapshot, so offline rows only
+# carry the contact links found on the article page itself
+def snapshot_row(url, html):
+    bundle = bundle_from_html(url, html)
+    social_email = "\n".join(sorted(scan_links_for_contacts(bundle["contacts"]["hrefs"])))
+    return row_from_bundle(url, bundle, social_email)
+
+ADAPTER = SiteAdapter(
+    name="La Presse",
+    homepage_url=LA_PRESSE_HOMEPAGE,
+    base_url="https://www.lapresse.ca",
+    link_pattern=ARTICLE_PATTERN,
+    excluded_urls=EXCLUDED_ARTICLE_URLS,
+    file_prefix="lapresse",
+    article_file_prefix="lapresse_story",
+    capture_folder_id=LAPRESSE_CAPTURE_FOLDER_ID,
+    spreadsheet_id=SPREADSHEET_ID,
+    sheet_name=SHEET_NAME,
+    header=HEADER,
+    bundle_script=ARTICLE_BUNDLE_SCRIPT,
+    build_row=build_row,
+    snapshot_row=snapshot_row,
+    filename_title=filename_title,
+    value_input_option="USER_ENTERED",
+    homepage_ready_signals=HOMEPAGE_READY_SIGNALS,
+    homepage_ready_cap_ms=5000,
+    article_ready_signals=ARTICLE_READY_SIGNALS,
+    article_goto_timeout_ms=90000,
+    network_policy=NETWORK_POLICY,
+    max_concurrent_articles=MAX_CONCURRENT_ARTICLES,
+)
 
-        await browser.close()
+async def main(resume=False):
+    await run_site(ADAPTER, resume=resume)
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    args = parse_run_args("Capture La Presse.")
+    asyncio.run(main(resume=args.resume))
@@ -0,0 +1,51 @@
+import os
+import re
+
+# YouTube embeds (including privacy-enhanced ones), found on every outlet
+YOUTUBE_EMBED = r"https://(?:www\.)?youtube(?:-nocookie)?\.com/embed/[A-Za-z0-9_-]+"
+
+
+def strip_fragment(url):
+    return url.split("#", 1)[0]
+
+
+def strip_query(url):
+    return strip_fragment(url).split("?", 1)[0]
+
+
+# Every media URL kind an outlet cares about, compiled into one alternation of
+# named groups so a page is scanned once however many kinds there are. Each
+# kind is (name, pattern, normalize); earlier kinds win where patterns overlap,
+# and normalize (default: drop the fragment) is applied to every match.
+# The literal prefix the patterns share (usually "https://") is factored out
+# of the alternation, which lets the regex engine skip ahead to candidate
+# positions instead of trying every kind at every character.
+class MediaScanner:
+    def __init__(self, kinds):
+        self.normalizers = {name: normalize or strip_fragment for name, _, normalize in kinds}
+        patterns = [pattern for _, pattern, _ in kinds]
+        prefix = os.path.commonprefix(patterns)
+        prefix = prefix[:next((i for i, c in enumerate(prefix) if re.escape(c) != c), len(prefix))]
+        # A quantifier right after the prefix applies to its last character
+        while prefix and any(p[len(prefix):len(prefix) + 1] in ("?", "*", "+", "{") for p in patterns):
+            prefix = prefix[:-1]
+        self.pattern = re.compile(re.escape(prefix) + "(?:" + "|".join(
+            f"(?P<{name}>{pattern[len(prefix):]})" for name, pattern, _ in kinds
+        ) + ")")
+
+    # {kind: set of normalized URLs} for every media URL in text
+    def scan(self, text):
+        found = {}
+        for m in self.pattern.finditer(text):
+            kind = m.lastgroup
+            found.setdefault(kind, set()).add(self.normalizers[kind](m.group(0)))
+        return found
+
+    def urls(self, text):
+        return set().union(*self.scan(text).values())
+
+    # Normalize one URL read from an attribute or JSON-LD the way a match of
+    # its kind would be; URLs of no known kind only lose their fragment
+    def normalize(self, url):
+        m = self.pattern.match(url)
+        return self.normalizers[m.lastgroup](url) if m else strip_fragment(url)
@@ -0,0 +1,216 @@
+from collections import Counter
+from contextlib import contextmanager
+import contextvars
+from datetime import datetime
+import json
+import os
+import threading
+import time
+
+METRICS_DIR = 'metrics' # Per-run JSON-lines files and the Prometheus textfile
+PROMETHEUS_FILE = '{run}.prom' # One per entry point, overwritten by its next run, for node_exporter's textfile collector
+
+# Labels (site, url) of whatever is being captured in the current task. Tasks
+# and to_thread calls inherit them, so spans deep in the engine or an outlet
+# module are attributed to the right article without passing them around.
+_labels = contextvars.ContextVar("metric_labels", default={})
+
+
+def percentile(values, q):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+
+def _prom_value(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _prom_labels(labels):
+    return ",".join(f'{k}="{_prom_value(v)}"' for k, v in sorted(labels.items()))
+
+
+# Spans (one timed stage of one article), labelled counters and peak gauges
+# for one run. Safe to record into from the event loop and from upload threads
+# alike.
+class RunMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+        self.spans = []
+        self.counters = Counter()
+        self.peaks = {}
+
+    def record_span(self, stage, started_at, duration, ok, error=None, **labels):
+        span = {**_labels.get(), **labels, "stage": stage, "start": round(started_at, 3),
+                "duration_s": round(duration, 4), "ok": ok}
+        if error:
+            span["error"] = error
+        span = {k: v for k, v in span.items() if v is not None}
+        with self._lock:
+            self.spans.append(span)
+
+    # Counters and peaks are kept per site, not per article
+    def _aggregate_key(self, name, labels):
+        labels = {k: v for k, v in {**_labels.get(), **labels}.items() if v is not None and k != "url"}
+        return name, tuple(sorted(labels.items()))
+
+    def count(self, name, n=1, **labels):
+        key = self._aggregate_key(name, labels)
+        with self._lock:
+            self.counters[key] += n
+
+    # Highest value seen for a gauge, e.g. a browser context's JS heap
+    def peak(self, name, value, **labels):
+        key = self._aggregate_key(name, labels)
+        with self._lock:
+            self.peaks[key] = max(self.peaks.get(key, value), value)
+
+    # Durations per (site, stage); failed spans included
+    def stage_durations(self, by_site=True):
+        durations = {}
+        with self._lock:
+            spans = list(self.spans)
+        for span in spans:
+            key = (span.get("site", ""), span["stage"]) if by_site else span["stage"]
+            durations.setdefault(key, []).append(span["duration_s"])
+        return durations
+
+    def summary(self, by_site=True):
+        return {
+            key: {
+                "count": len(values),
+                "p50_ms": round(percentile(values, 50) * 1000, 1),
+                "p95_ms": round(percentile(values, 95) * 1000, 1),
+                "total_s": round(sum(values), 2),
+            }
+            for key, values in sorted(self.stage_durations(by_site).items())
+        }
+
+    def write_jsonl(self, path):
+        with self._lock:
+            spans = list(self.spans)
+            counters = list(self.counters.items())
+            peaks = list(self.peaks.items())
+        with open(path, "w", encoding="utf-8") as f:
+            for span in spans:
+                f.write(json.dumps({"type": "span", **span}) + "\n")
+            for (name, labels), value in counters:
+                f.write(json.dumps({"type": "counter", "name": name, **dict(labels), "value": value}) + "\n")
+            for (name, labels), value in peaks:
+                f.write(json.dumps({"type": "peak", "name": name, **dict(labels), "value": value}) + "\n")
+
+    # Stage latency summaries plus every counter, in the Prometheus text format.
+    # Every series carries run=<run_name>, so the files of the separately run
+    # outlet scripts can sit side by side in the collector's directory.
+    # Written to a temporary file and renamed, so a scrape never sees half a file.
+    def write_prometheus(self, path, run_name):
+        run = {"run": run_name}
+        lines = [
+            "# HELP capture_stage_seconds Time spent in each capture stage of the last run.",
+            "# TYPE capture_stage_seconds summary",
+        ]
+        for (site, stage), values in sorted(self.stage_durations().items()):
+            labels = {**run, "site": site, "stage": stage}
+            for q in (50, 95):
+                lines.append(f"capture_stage_seconds{{{_prom_labels({**labels, 'quantile': q / 100})}}} "
+                             f"{percentile(values, q):.4f}")
+            lines.append(f"capture_stage_seconds_sum{{{_prom_labels(labels)}}} {sum(values):.4f}")
+            lines.append(f"capture_stage_seconds_count{{{_prom_labels(labels)}}} {len(values)}")
+
+        with self._lock:
+            counters = sorted(self.counters.items())
+        for name in sorted({name for (name, _), _ in counters}):
+            lines.append(f"# TYPE capture_{name}_total counter")
+            for (counter, labels), value in counters:
+                if counter == name:
+                    lines.append(f"capture_{name}_total{{{_prom_labels({**run, **dict(labels)})}}} {value}")
+
+        with self._lock:
+            peaks = sorted(self.peaks.items())
+        for name in sorted({name for (name, _), _ in peaks}):
+            lines.append(f"# TYPE capture_{name} gauge")
+            for (gauge, labels), value in peaks:
+                if gauge == name:
+                    lines.append(f"capture_{name}{{{_prom_labels({**run, **dict(labels)})}}} {value:.1f}")
+
+        lines.append("# TYPE capture_last_run_timestamp_seconds gauge")
+        lines.append(f"capture_last_run_timestamp_seconds{{{_prom_labels(run)}}} {time.time():.0f}")
+        lines.append("# TYPE capture_last_run_duration_seconds gauge")
+        lines.append(f"capture_last_run_duration_seconds{{{_prom_labels(run)}}} {time.time() - self.started_at:.1f}")
+
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp, path)
+
+    def report(self):
+        summary = self.summary()
+        if not summary:
+            return
+        print(f"{'site':<14}{'stage':<16}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'total s':>10}")
+        for (site, stage), s in summary.items():
+            print(f"{site:<14}{stage:<16}{s['count']:>7}{s['p50_ms']:>10}{s['p95_ms']:>10}{s['total_s']:>10}")
+
+
+RUN_METRICS = RunMetrics()
+
+
+# Start recording into a fresh RunMetrics, e.g. for each benchmark run
+def reset():
+    global RUN_METRICS
+    RUN_METRICS = RunMetrics()
+    return RUN_METRICS
+
+
+# Attach labels to every span and counter recorded inside the block
+@contextmanager
+def labels(**new_labels):
+    token = _labels.set({**_labels.get(), **new_labels})
+    try:
+        yield
+    finally:
+        _labels.reset(token)
+
+
+# Time a stage of the current article; usable around sync and awaited code alike
+@contextmanager
+def span(stage, **span_labels):
+    started_at = time.time()
+    started = time.perf_counter()
+    try:
+        yield
+    except BaseException as e:
+        RUN_METRICS.record_span(stage, started_at, time.perf_counter() - started, False,
+                                error=type(e).__name__, **span_labels)
+        raise
+    RUN_METRICS.record_span(stage, started_at, time.perf_counter() - started, True, **span_labels)
+
+
+def count(name, n=1, **counter_labels):
+    RUN_METRICS.count(name, n, **counter_labels)
+
+
+def peak(name, value, **gauge_labels):
+    RUN_METRICS.peak(name, value, **gauge_labels)
+
+
+# fn bound to the caller's labels, for handing to a plain executor (which,
+# unlike asyncio.to_thread, does not carry context variables across)
+def carry_labels(fn):
+    context = contextvars.copy_context()
+    return lambda *args, **kwargs: context.run(fn, *args, **kwargs)
+
+
+# Write metrics/<run>-<timestamp>.jsonl and metrics/<run>.prom, and print the
+# per-stage summary
+def export(run_name):
+    os.makedirs(METRICS_DIR, exist_ok=True)
+    stamp = datetime.fromtimestamp(RUN_METRICS.started_at).strftime("%Y-%m-%dT%H-%M-%S")
+    jsonl_path = os.path.join(METRICS_DIR, f"{run_name}-{stamp}.jsonl")
+    prom_path = os.path.join(METRICS_DIR, PROMETHEUS_FILE.format(run=run_name))
+    RUN_METRICS.write_jsonl(jsonl_path)
+    RUN_METRICS.write_prometheus(prom_path, run_name)
+    RUN_METRICS.report()
+    print(f"Run metrics written to {jsonl_path} and {prom_path}")
@@ -0,0 +1,212 @@
+from collections import Counter
+from urllib.parse import urlsplit
+
+# Ad networks, analytics beacons and recommendation widgets that never affect
+# what ends up in an article PDF
+DEFAULT_BLOCKED_DOMAINS = {
+    "doubleclick.net",
+    "googlesyndication.com",
+    "googletagservices.com",
+    "googletagmanager.com",
+    "google-analytics.com",
+    "adservice.google.com",
+    "amazon-adsystem.com",
+    "adnxs.com",
+    "criteo.com",
+    "criteo.net",
+    "rubiconproject.com",
+    "pubmatic.com",
+    "openx.net",
+    "casalemedia.com",
+    "indexww.com",
+    "bidswitch.net",
+    "moatads.com",
+    "scorecardresearch.com",
+    "chartbeat.com",
+    "chartbeat.net",
+    "quantserve.com",
+    "krxd.net",
+    "permutive.com",
+    "permutive.app",
+    "hotjar.com",
+    "nr-data.net",
+    "facebook.net",
+    "taboola.com",
+    "outbrain.com",
+}
+
+# Autoplay video/audio segments; media URLs are read from the DOM, not downloaded
+DEFAULT_BLOCKED_RESOURCE_TYPES = {"media"}
+
+# Resources a faithful capture needs; these are never blocked by resource type
+CAPTURE_CRITICAL_RESOURCE_TYPES = {"document", "stylesheet", "font", "image"}
+
+# Failure Chromium reports for a request blocked through CDP
+BLOCKED_BY_CLIENT = "net::ERR_BLOCKED_BY_CLIENT"
+
+# CDP Network.ResourceType names for Playwright's lowercase resource types
+CDP_RESOURCE_TYPES = {
+    "xhr": "XHR",
+    "texttrack": "TextTrack",
+    "eventsource": "EventSource",
+    "websocket": "WebSocket",
+    "cspviolationreport": "CSPViolationReport",
+    "signedexchange": "SignedExchange",
+}
+
+# Typical transfer size of a blocked request, used for the savings estimate
+# when no response of the same type was allowed to compare with (media is
+# always blocked, so there never is one)
+TYPICAL_BLOCKED_BYTES = {
+    "media": 1_000_000,
+    "script": 60_000,
+    "image": 30_000,
+    "xhr": 5_000,
+    "fetch": 5_000,
+}
+
+
+def _domain_matches(host, domains):
+    return any(host == d or host.endswith("." + d) for d in domains)
+
+
+# Per-site request filter installed on a BrowserContext. Requests to blocked
+# domains, or of blocked resource types, are aborted before they leave the
+# browser; allowed_domains always win so a site can whitelist its own CDN.
+# Playwright turns off the HTTP cache of a context with any route installed, so
+# blocking is done over each page's CDP session instead (prepare_page): blocked
+# domains through Network.setBlockedURLs, and blocked resource types (plus any
+# blocked domain with an allowed subdomain) through Fetch interception scoped
+# to just those requests. Stylesheets, fonts and scripts keep coming from the
+# browser cache. Subclasses that must see every request (the benchmark's replay
+# and recording policies) return True from routes_requests() to use a route.
+class NetworkPolicy:
+    def __init__(self, blocked_domains=DEFAULT_BLOCKED_DOMAINS,
+                 blocked_resource_types=DEFAULT_BLOCKED_RESOURCE_TYPES,
+                 allowed_domains=()):
+        self.blocked_domains = set(blocked_domains)
+        self.blocked_resource_types = set(blocked_resource_types) - CAPTURE_CRITICAL_RESOURCE_TYPES
+        self.allowed_domains = set(allowed_domains)
+        self.blocked_by_domain = Counter()
+        self.blocked_by_type = Counter()
+        self.allowed_requests = 0
+        self.allowed_bytes = 0
+        self._bytes_by_type = Counter()
+        self._responses_by_type = Counter()
+
+    def should_block(self, url, resource_type):
+        host = (urlsplit(url).hostname or "").lower()
+        if not host or _domain_matches(host, self.allowed_domains):
+            return False
+        if _domain_matches(host, self.blocked_domains):
+            return True
+        return resource_type in self.blocked_resource_types
+
+    def routes_requests(self):
+        return False
+
+    # Blocked domains that contain an allowed one can't go to setBlockedURLs,
+    # which has no exceptions; their requests are checked one by one instead
+    def _intercepted_domains(self):
+        return {d for d in self.blocked_domains if any(_domain_matches(a, {d}) for a in self.allowed_domains)}
+
+    def blocked_url_patterns(self):
+        patterns = []
+        for domain in sorted(self.blocked_domains - self._intercepted_domains()):
+            patterns += [f"*://{domain}/*", f"*://*.{domain}/*"]
+        return patterns
+
+    def fetch_patterns(self):
+        patterns = [
+            {"urlPattern": "*", "resourceType": CDP_RESOURCE_TYPES.get(t, t.capitalize()), "requestStage": "Request"}
+            for t in sorted(self.blocked_resource_types)
+        ]
+        for domain in sorted(self._intercepted_domains()):
+            patterns += [{"urlPattern": p, "requestStage": "Request"} for p in (f"*://{domain}/*", f"*://*.{domain}/*")]
+        return patterns
+
+    async def install(self, context):
+        if self.routes_requests():
+            await context.route("**/*", self._handle_route)
+        else:
+            context.on("requestfailed", self._record_failed)
+        context.on("requestfinished", self._record_finished)
+
+    # Called with a CDP session on each new page of the context, before its
+    # first navigation; the session must stay open for the blocks to hold
+    async def prepare_page(self, session):
+        if self.routes_requests():
+            return
+        await session.send("Network.enable")
+        await session.send("Network.setBlockedURLs", {"urls": self.blocked_url_patterns()})
+        patterns = self.fetch_patterns()
+        if patterns:
+            session.on("Fetch.requestPaused", lambda event: self._handle_paused(session, event))
+            await session.send("Fetch.enable", {"patterns": patterns})
+
+    # Only requests matching fetch_patterns() pause here; blocked ones are
+    # counted when they show up as failed
+    async def _handle_paused(self, session, event):
+        if self.should_block(event["request"]["url"], event["resourceType"].lower()):
+            await session.send("Fetch.failRequest", {"requestId": event["requestId"], "errorReason": "BlockedByClient"})
+        else:
+            await session.send("Fetch.continueRequest", {"requestId": event["requestId"]})
+
+    def _record_blocked(self, url, resource_type):
+        host = (urlsplit(url).hostname or "").lower()
+        self.blocked_by_domain[host] += 1
+        self.blocked_by_type[resource_type] += 1
+
+    def _record_failed(self, request):
+        if request.failure == BLOCKED_BY_CLIENT:
+            self._record_blocked(request.url, request.resource_type)
+        else:
+            self.allowed_requests += 1
+
+    async def _handle_route(self, route):
+        request = route.request
+        if self.should_block(request.url, request.resource_type):
+            self._record_blocked(request.url, request.resource_type)
+            await route.abort()
+        else:
+            self.allowed_requests += 1
+            await route.continue_()
+
+    # Bytes actually transferred, which unlike content-length is also known
+    # for compressed and chunked responses
+    async def _record_finished(self, request):
+        if not self.routes_requests():
+            self.allowed_requests += 1
+        try:
+            sizes = await request.sizes()
+        except Exception:
+            return
+        size = sizes["responseHeadersSize"] + sizes["responseBodySize"]
+        self.allowed_bytes += size
+        self._bytes_by_type[request.resource_type] += size
+        self._responses_by_type[request.resource_type] += 1
+
+    # Blocked requests never report a size, so savings are estimated from the
+    # average size of allowed responses of the same resource type, or from a
+    # typical size for types that are never allowed
+    def estimated_bytes_saved(self):
+        saved = 0
+        for resource_type, count in self.blocked_by_type.items():
+            responses = self._responses_by_type[resource_type]
+            if responses:
+                saved += count * self._bytes_by_type[resource_type] // responses
+            else:
+                saved += count * TYPICAL_BLOCKED_BYTES.get(resource_type, 0)
+        return saved
+
+    def report(self, label=""):
+        blocked = sum(self.blocked_by_type.values())
+        total = blocked + self.allowed_requests
+        prefix = f"[{label}] " if label else ""
+        print(f"{prefix}Network policy blocked {blocked} of {total} requests "
+              f"(~{self.estimated_bytes_saved() / 1_000_000:.1f} MB saved, "
+              f"{self.allowed_bytes / 1_000_000:.1f} MB downloaded)")
+        for resource_type, count in self.blocked_by_type.most_common():
+            print(f"{prefix}  blocked {count} {resource_type} requests")
+        for host, count in self.blocked_by_domain.most_common(10):
+            print(f"{prefix}  blocked {count} requests to {host}")
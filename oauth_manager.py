@@ -0,0 +1,124 @@
+from datetime import datetime
+import os
+import pickle
+import threading
+import google_auth_httplib2
+import httplib2
+from google.auth.transport.requests import Request
+from google.oauth2.credentials import Credentials
+from google_auth_oauthlib.flow import InstalledAppFlow
+
+SCOPES = ['https://www.googleapis.com/auth/spreadsheets',
+          'https://www.googleapis.com/auth/drive']
+CLIENT_SECRETS_FILE = 'credentials.json' # OAuth client downloaded from Google Cloud
+TOKEN_FILE = 'token.json' # Authorized-user token, as JSON
+LEGACY_TOKEN_FILES = ('token.json', 'token.pickle') # Pickled tokens written by older runs
+TOKEN_REFRESH_MARGIN = 600 # Seconds before expiry at which the token is refreshed
+TOKEN_RETRY_INTERVAL = 30 # Seconds between attempts after a failed refresh
+HTTP_TIMEOUT = 60 # Seconds before a Google API request gives up
+
+
+def _load_pickled(path):
+    try:
+        with open(path, 'rb') as f:
+            creds = pickle.load(f)
+    except Exception:
+        return None
+    return creds if isinstance(creds, Credentials) else None
+
+
+# OAuth credentials shared by every outlet and worker thread in the process.
+# The token is loaded from token.json (pickled tokens from older runs are
+# migrated to JSON on first use) and, once start() is called, refreshed by a
+# background thread TOKEN_REFRESH_MARGIN seconds before it expires, so no
+# Drive upload or Sheets call ever stalls on a refresh. Every client gets its
+# own AuthorizedHttp from authorized_http(), since httplib2.Http is not
+# thread-safe, but all of them read the one refreshed token.
+class CredentialManager:
+    def __init__(self, client_secrets_file=CLIENT_SECRETS_FILE, token_file=TOKEN_FILE,
+                 scopes=SCOPES, refresh_margin=TOKEN_REFRESH_MARGIN):
+        self.client_secrets_file = client_secrets_file
+        self.token_file = token_file
+        self.scopes = scopes
+        self.refresh_margin = refresh_margin
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.refreshes = 0
+        self.failed_refreshes = 0
+        self.creds = self._load()
+
+    def _load(self):
+        creds = None
+        try:
+            creds = Credentials.from_authorized_user_file(self.token_file, self.scopes)
+        except (OSError, ValueError, UnicodeDecodeError):
+            for path in LEGACY_TOKEN_FILES:
+                if os.path.exists(path):
+                    creds = _load_pickled(path)
+                    if creds is not None:
+                        print(f"Migrating OAuth token from {path} to {self.token_file}")
+                        break
+
+        if creds and creds.valid:
+            self._save(creds)
+        elif creds and creds.refresh_token:
+            creds.refresh(Request())
+            self._save(creds)
+        else:
+            flow = InstalledAppFlow.from_client_secrets_file(self.client_secrets_file, self.scopes)
+            creds = flow.run_local_server(port=0)
+            self._save(creds)
+        return creds
+
+    # Written to a temporary file and renamed, so a crash never leaves half a token
+    def _save(self, creds):
+        tmp = f"{self.token_file}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write(creds.to_json())
+        os.replace(tmp, self.token_file)
+
+    def _seconds_until_refresh(self):
+        if self.creds.expiry is None:
+            return None
+        return (self.creds.expiry - datetime.utcnow()).total_seconds() - self.refresh_margin
+
+    def refresh(self):
+        with self._lock:
+            self.creds.refresh(Request())
+            self.refreshes += 1
+            self._save(self.creds)
+
+    def _refresh_periodically(self):
+        while True:
+            wait = self._seconds_until_refresh()
+            if wait is None:
+                return
+            if self._stop.wait(max(0, wait)):
+                return
+            try:
+                self.refresh()
+                print(f"Refreshed OAuth token, valid until {self.creds.expiry:%H:%M:%S} UTC")
+            except Exception as e:
+                self.failed_refreshes += 1
+                print(f"OAuth token refresh failed ({e}), retrying in {TOKEN_RETRY_INTERVAL}s")
+                if self._stop.wait(TOKEN_RETRY_INTERVAL):
+                    return
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._refresh_periodically, name="oauth-refresh", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    # A new authorized HTTP client for one thread's (or one service's) requests
+    def authorized_http(self, timeout=HTTP_TIMEOUT):
+        return google_auth_httplib2.AuthorizedHttp(self.creds, http=httplib2.Http(timeout=timeout))
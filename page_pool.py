@@ -0,0 +1,172 @@
+import asyncio
+from contextlib import asynccontextmanager
+import metrics
+
+PAGES_PER_CONTEXT = 100 # Page leases (articles, profiles) before a context is recycled
+CONTEXT_MEMORY_LIMIT_MB = 1024 # JS heap across a context's pages that triggers recycling
+
+
+# One browser context owned by the pool, with its idle pages and memory stats
+class _PooledContext:
+    def __init__(self, context, number):
+        self.context = context
+        self.number = number
+        self.leases = 0
+        self.leased = 0
+        self.idle = []
+        self.cdp = {}
+        self.heap = {}
+        self.peak_heap = 0
+        self.retiring = False
+
+    def heap_mb(self):
+        return sum(self.heap.values()) / 1_000_000
+
+
+# Page pool for one outlet. Pages are leased with `async with pool.page() as
+# page`, navigated to about:blank when returned and handed to the next lease
+# instead of being closed. A context is retired once it has served
+# pages_per_context leases or its pages' JS heap (Performance.getMetrics,
+# sampled as each page is returned) passes memory_limit_mb; it is closed once
+# its last leased page comes back, and later leases get a fresh context with
+# the outlet's options and network policy.
+class PagePool:
+    def __init__(self, browser, context_options=None, network_policy=None, label="",
+                 pages_per_context=PAGES_PER_CONTEXT, memory_limit_mb=CONTEXT_MEMORY_LIMIT_MB):
+        self.browser = browser
+        self.context_options = context_options or {}
+        self.network_policy = network_policy
+        self.label = label
+        self.pages_per_context = pages_per_context
+        self.memory_limit_mb = memory_limit_mb
+        self._lock = asyncio.Lock()
+        self._current = None
+        self._contexts = []
+        self.pages_created = 0
+        self.leases = 0
+        self.contexts_created = 0
+        self.peak_heap_mb = 0.0
+        self._closed_stats = []
+
+    async def _new_context(self):
+        context = await self.browser.new_context(**self.context_options)
+        if self.network_policy is not None:
+            await self.network_policy.install(context)
+        self.contexts_created += 1
+        pooled = _PooledContext(context, self.contexts_created)
+        self._contexts.append(pooled)
+        return pooled
+
+    def _retire(self, pooled, reason):
+        if not pooled.retiring:
+            pooled.retiring = True
+            print(f"[{self.label}] Recycling context #{pooled.number} after {pooled.leases} pages "
+                  f"({reason}, {pooled.heap_mb():.0f} MB JS heap)")
+
+    async def _close_context(self, pooled):
+        self._closed_stats.append(self._context_stats(pooled))
+        metrics.count("browser_contexts")
+        metrics.count("page_leases", pooled.leases)
+        metrics.peak("context_peak_js_heap_mb", pooled.peak_heap)
+        self._contexts.remove(pooled)
+        if self._current is pooled:
+            self._current = None
+        await pooled.context.close()
+
+    @asynccontextmanager
+    async def page(self):
+        async with self._lock:
+            pooled = self._current
+            if pooled is None or pooled.retiring:
+                pooled = self._current = await self._new_context()
+            pooled.leases += 1
+            pooled.leased += 1
+            self.leases += 1
+            if pooled.leases >= self.pages_per_context:
+                self._retire(pooled, "page limit")
+            page = pooled.idle.pop() if pooled.idle else None
+
+        reusable = False
+        try:
+            if page is None:
+                page = await pooled.context.new_page()
+                self.pages_created += 1
+                if self.network_policy is not None:
+                    await self.network_policy.prepare_page(await self._session(pooled, page))
+            yield page
+            reusable = True
+        finally:
+            await self._release(pooled, page, reusable)
+
+    async def _release(self, pooled, page, reusable):
+        if page is not None and not page.is_closed():
+            try:
+                await self._sample(pooled, page)
+                if reusable and not pooled.retiring:
+                    await page.goto("about:blank")
+                    # The blank page's heap, so the idle page does not count
+                    # toward the memory limit with the article it just left
+                    await self._sample(pooled, page)
+                    pooled.idle.append(page)
+                else:
+                    await self._discard(pooled, page)
+            except Exception:
+                await self._discard(pooled, page)
+        pooled.leased -= 1
+
+        if pooled.heap_mb() > self.memory_limit_mb:
+            self._retire(pooled, "memory limit")
+        if pooled.retiring and pooled.leased == 0 and pooled in self._contexts:
+            await self._close_context(pooled)
+
+    async def _discard(self, pooled, page):
+        pooled.heap.pop(page, None)
+        pooled.cdp.pop(page, None)
+        try:
+            await page.close()
+        except Exception:
+            pass
+
+    # The page's CDP session, kept for its lifetime (blocked URLs set through it
+    # only hold while it stays attached)
+    async def _session(self, pooled, page):
+        if page not in pooled.cdp:
+            session = await pooled.context.new_cdp_session(page)
+            await session.send("Performance.enable")
+            pooled.cdp[page] = session
+        return pooled.cdp[page]
+
+    # Record the page's JS heap
+    async def _sample(self, pooled, page):
+        session = await self._session(pooled, page)
+        result = await session.send("Performance.getMetrics")
+        metrics = {m["name"]: m["value"] for m in result["metrics"]}
+        pooled.heap[page] = metrics.get("JSHeapTotalSize", 0)
+        pooled.peak_heap = max(pooled.peak_heap, pooled.heap_mb())
+        self.peak_heap_mb = max(self.peak_heap_mb, pooled.peak_heap)
+
+    def _context_stats(self, pooled):
+        return {
+            "context": pooled.number,
+            "leases": pooled.leases,
+            "open_pages": len(pooled.idle) + pooled.leased,
+            "js_heap_mb": round(pooled.heap_mb(), 1),
+            "peak_js_heap_mb": round(pooled.peak_heap, 1),
+            "retired": pooled.retiring,
+        }
+
+    # Per-context memory stats for every context of the run, closed ones as
+    # they were when they closed
+    def stats(self):
+        return self._closed_stats + [self._context_stats(pooled) for pooled in self._contexts]
+
+    async def close(self):
+        for pooled in list(self._contexts):
+            await self._close_context(pooled)
+
+    def report(self):
+        print(f"[{self.label}] Page pool: {self.leases} leases served by {self.pages_created} pages "
+              f"in {self.contexts_created} contexts, peak {self.peak_heap_mb:.0f} MB JS heap per context")
+        for s in self.stats():
+            print(f"[{self.label}]   context #{s['context']}: {s['leases']} leases, "
+                  f"peak {s['peak_js_heap_mb']:.0f} MB JS heap{', retired' if s['retired'] else ''}")
@@ -0,0 +1,108 @@
+import asyncio
+import metrics
+
+# Readiness signals replace fixed wait_for_timeout sleeps. A signal is a callable
+# taking (page, timeout_ms) and returning a coroutine that resolves once the page
+# shows that concrete sign of being ready. wait_until_ready() waits for all of a
+# site's signals together, but never longer than a hard cap, so a page that never
+# settles costs no more than the old fixed sleep did. Each signal carries a
+# `label`, and every signal that misses the cap is counted under it in the run
+# metrics, so a selector that stops matching after a redesign shows up there.
+
+DEFAULT_HARD_CAP_MS = 2000
+
+
+def labelled(wait, label):
+    wait.label = label
+    return wait
+
+
+def network_idle():
+    async def wait(page, timeout):
+        await page.wait_for_load_state("networkidle", timeout=timeout)
+    return labelled(wait, "networkidle")
+
+
+def selector(css, state="attached"):
+    async def wait(page, timeout):
+        await page.wait_for_selector(css, state=state, timeout=timeout)
+    return labelled(wait, f"selector {css}")
+
+
+def js_condition(expression, arg=None, label="js condition"):
+    async def wait(page, timeout):
+        await page.wait_for_function(expression, arg=arg, timeout=timeout)
+    return labelled(wait, label)
+
+
+# Fires once more than `already_seen` <audio> elements have a populated src
+def audio_src(already_seen=0):
+    return js_condition(
+        "n => Array.from(document.querySelectorAll('audio')).filter(a => a.src).length > n",
+        already_seen,
+        label="audio src"
+    )
+
+
+# Fires once more than `already_seen` elements match `css`
+def selector_count(css, already_seen=0):
+    return js_condition(
+        "([css, n]) => document.querySelectorAll(css).length > n",
+        [css, already_seen],
+        label=f"count {css}"
+    )
+
+
+# Fires once `event`, an asyncio.Event set from a page event listener, is set
+def event_set(event):
+    async def wait(page, timeout):
+        await asyncio.wait_for(event.wait(), timeout / 1000)
+    return labelled(wait, "event")
+
+
+# Fires once web fonts have loaded and every image in the first viewport has
+# finished (loaded or failed). Selector signals already hold at DOMContentLoaded
+# in server-rendered articles, so without this the PDF and screenshot can be
+# taken before the fonts and the lead image are in.
+def content_loaded():
+    return js_condition(
+        """() => document.fonts.status === 'loaded' && Array.from(document.images).every(
+            img => img.complete || img.getBoundingClientRect().top > window.innerHeight
+        )""",
+        label="fonts and images"
+    )
+
+
+def initial_state():
+    return js_condition("() => typeof window.__INITIAL_STATE__ !== 'undefined'", label="__INITIAL_STATE__")
+
+
+# Wait until every signal has fired or cap_ms has elapsed, whichever comes first.
+# Returns True when all signals fired, False when the hard cap was hit instead.
+async def wait_until_ready(page, signals, cap_ms=DEFAULT_HARD_CAP_MS):
+    if not signals:
+        return True
+    results = await asyncio.gather(
+        *(signal(page, cap_ms) for signal in signals), return_exceptions=True
+    )
+    missed = [s for s, r in zip(signals, results) if isinstance(r, Exception)]
+    for signal in missed:
+        metrics.count("ready_signal_timeouts", signal=getattr(signal, "label", "signal"))
+    return not missed
+
+
+# Wait for the first of several signals, e.g. "an audio src appeared or the
+# network went quiet". Pending signals are cancelled once one fires.
+async def wait_for_any(page, signals, cap_ms=DEFAULT_HARD_CAP_MS):
+    if not signals:
+        return True
+    pending = {asyncio.ensure_future(signal(page, cap_ms)) for signal in signals}
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            if any(task.exception() is None for task in done):
+                return True
+        return False
+    finally:
+        for task in pending:
+            task.cancel()
@@ -0,0 +1,96 @@
+import argparse
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+import csv
+import os
+import time
+from capture_all import ADAPTERS
+from capture_engine import authenticate_google_services
+from sheet_writer import SheetWriter
+from snapshots import SNAPSHOT_DIR, find_snapshots, load_snapshot
+
+REEXTRACT_OUTPUT_DIR = 'reextracted' # One CSV per outlet is written here
+REEXTRACT_CHUNK_SIZE = 16 # Snapshots handed to a worker process at a time
+
+ADAPTERS_BY_SITE = {adapter.file_prefix: adapter for adapter in ADAPTERS}
+
+
+# Runs in a worker process: rebuild one article's sheet row from its snapshot.
+# Returns (path, site, row, error) so one bad file never stops the batch.
+def reextract_snapshot(path):
+    try:
+        url, site, html = load_snapshot(path)
+        adapter = ADAPTERS_BY_SITE[site]
+        if adapter.snapshot_row is None:
+            raise ValueError(f"{adapter.name} has no offline extractor")
+        return path, site, adapter.snapshot_row(url, html), None
+    except Exception as e:
+        return path, None, None, f"{type(e).__name__}: {e}"
+
+
+def write_csv(adapter, rows):
+    os.makedirs(REEXTRACT_OUTPUT_DIR, exist_ok=True)
+    path = os.path.join(REEXTRACT_OUTPUT_DIR, f"{adapter.file_prefix}.csv")
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(adapter.header)
+        writer.writerows(rows)
+    print(f"[{adapter.name}] Wrote {len(rows)} rows to {path}")
+
+
+async def write_sheets(rows_by_site):
+    clients, _, sheets_service = authenticate_google_services()
+    try:
+        for site, rows in rows_by_site.items():
+            adapter = ADAPTERS_BY_SITE[site]
+            writer = SheetWriter(sheets_service, adapter.spreadsheet_id, adapter.sheet_name, adapter.header,
+                                 value_input_option=adapter.value_input_option)
+            await writer.start()
+            try:
+                for row in rows:
+                    await writer.add(row)
+            finally:
+                await writer.close()
+    finally:
+        clients.close()
+
+
+# Re-run extraction over saved article snapshots without a browser: every
+# snapshot is parsed in a process pool and the rows are written per outlet,
+# in snapshot (date, then file name) order.
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild sheet rows from saved article snapshots.")
+    parser.add_argument("paths", nargs="*", default=[SNAPSHOT_DIR],
+                        help="snapshot files or directories to scan (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="worker processes (default: one per CPU)")
+    parser.add_argument("--sheet", action="store_true",
+                        help="append the rows to each outlet's Google Sheet instead of writing CSVs")
+    args = parser.parse_args()
+
+    paths = find_snapshots(args.paths)
+    print(f"Re-extracting {len(paths)} snapshots with {args.workers} workers")
+    started = time.monotonic()
+
+    rows_by_site = {}
+    failed = 0
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        for path, site, row, error in executor.map(reextract_snapshot, paths, chunksize=REEXTRACT_CHUNK_SIZE):
+            if error:
+                failed += 1
+                print(f"Error re-extracting {path}: {error}")
+                continue
+            rows_by_site.setdefault(site, []).append(row)
+
+    elapsed = time.monotonic() - started
+    print(f"Re-extracted {len(paths) - failed} snapshots ({failed} failed) in {elapsed:.1f}s")
+
+    if args.sheet:
+        asyncio.run(write_sheets(rows_by_site))
+    else:
+        for site, rows in rows_by_site.items():
+            write_csv(ADAPTERS_BY_SITE[site], rows)
+
+
+if __name__ == "__main__":
+    main()
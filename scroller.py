@@ -0,0 +1,66 @@
+DEFAULT_MAX_SCROLLS = 30 # Upper bound on scroll steps for any homepage
+SCROLL_QUIET_MS = 300 # A step ends once the page has grown and the DOM has stopped changing for this long
+SCROLL_STEP_CAP_MS = 1500 # ...or after this long if the page does not grow
+SCROLL_PATIENCE = 2 # Consecutive steps without a new article link before stopping
+
+# Runs the whole scroll loop in the page in one round-trip. Each step scrolls to
+# the bottom and waits on a MutationObserver, not a fixed delay: it ends early
+# once scrollHeight has grown and the DOM has gone quiet, so a small mutation
+# right after the scroll does not end it before the lazy-load request returns.
+# The loop stops once `patience` steps in a row turn up no article link
+# (matching the outlet's pattern) that was not on the page before.
+SCROLL_SCRIPT = """async ([pattern, maxScrolls, quietMs, stepCapMs, patience]) => {
+    const re = new RegExp(pattern);
+    const seen = new Set();
+    const collect = () => {
+        let added = 0;
+        for (const a of document.querySelectorAll('a[href]')) {
+            if (re.test(a.href) && !seen.has(a.href)) {
+                seen.add(a.href);
+                added++;
+            }
+        }
+        return added;
+    };
+    const settled = startHeight => new Promise(resolve => {
+        let quiet = null;
+        const observer = new MutationObserver(() => {
+            clearTimeout(quiet);
+            quiet = setTimeout(() => {
+                if (document.body.scrollHeight > startHeight) done();
+            }, quietMs);
+        });
+        const cap = setTimeout(done, stepCapMs);
+        function done() {
+            observer.disconnect();
+            clearTimeout(quiet);
+            clearTimeout(cap);
+            resolve();
+        }
+        observer.observe(document.body, {childList: true, subtree: true});
+    });
+
+    const initial = collect();
+    let scrolls = 0;
+    let idle = 0;
+    while (scrolls < maxScrolls && idle < patience) {
+        const step = settled(document.body.scrollHeight);
+        window.scrollTo(0, document.body.scrollHeight);
+        await step;
+        scrolls++;
+        idle = collect() ? 0 : idle + 1;
+    }
+    return {scrolls, initial, total: seen.size};
+}"""
+
+
+# Scroll the homepage until lazily loaded sections stop adding article links
+async def scroll_for_links(page, link_pattern, max_scrolls=DEFAULT_MAX_SCROLLS,
+                           quiet_ms=SCROLL_QUIET_MS, step_cap_ms=SCROLL_STEP_CAP_MS,
+                           patience=SCROLL_PATIENCE):
+    result = await page.evaluate(
+        SCROLL_SCRIPT, [link_pattern.pattern, max_scrolls, quiet_ms, step_cap_ms, patience]
+    )
+    print(f"Scrolled {result['scrolls']} times: {result['total']} article links "
+          f"({result['total'] - result['initial']} loaded by scrolling)")
+    return result
@@ -0,0 +1,138 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import random
+import time
+from googleapiclient.errors import HttpError
+import metrics
+
+SHEET_BATCH_SIZE = 25 # Rows buffered before they are appended in one request
+SHEET_FLUSH_INTERVAL = 30.0 # Seconds a buffered row may wait before it is flushed anyway
+SHEET_MAX_RETRIES = 5
+SHEETS_WORKERS = 4 # Sheets calls in flight at once, across every writer
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+# Sheets calls run here rather than on the default executor. Each thread calls
+# through its own client (see google_clients.py), so writers for different tabs
+# append in parallel; a single writer's appends stay in order behind its lock.
+_SHEETS_EXECUTOR = ThreadPoolExecutor(max_workers=SHEETS_WORKERS, thread_name_prefix="sheets")
+
+
+def column_letter(n):
+    letters = ""
+    while n > 0:
+        n, rem = divmod(n - 1, 26)
+        letters = chr(ord("A") + rem) + letters
+    return letters
+
+
+# Run request.execute(), retrying quota (429) and server (5xx) errors with
+# exponential backoff and jitter
+def execute_with_retry(request, max_retries=SHEET_MAX_RETRIES):
+    for attempt in range(max_retries + 1):
+        try:
+            return request.execute()
+        except HttpError as e:
+            status = getattr(e.resp, "status", None)
+            if status not in RETRYABLE_STATUSES or attempt == max_retries:
+                raise
+            delay = min(60, 2 ** attempt) + random.uniform(0, 1)
+            metrics.count("sheets_retries")
+            print(f"Sheets API returned {status}, retrying in {delay:.1f}s")
+            time.sleep(delay)
+
+
+# Buffered writer for one sheet tab. Rows are appended in batches once
+# batch_size rows are waiting or flush_interval seconds have passed, whichever
+# comes first, and close() flushes whatever is left so a crash mid-run loses at
+# most one batch instead of every row. Rows may be added with a key (the article
+# URL); on_written(keys) is called once their batch has been appended. Rows are
+# appended with value_input_option; the header is always written RAW.
+class SheetWriter:
+    def __init__(self, service, spreadsheet_id, sheet_name, header,
+                 batch_size=SHEET_BATCH_SIZE, flush_interval=SHEET_FLUSH_INTERVAL, on_written=None,
+                 value_input_option="RAW"):
+        self.service = service
+        self.spreadsheet_id = spreadsheet_id
+        self.sheet_name = sheet_name
+        self.header = header
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.last_column = column_letter(len(header))
+        self.on_written = on_written
+        self.value_input_option = value_input_option
+        self.rows_written = 0
+        self._buffer = []
+        self._keys = []
+        self._lock = asyncio.Lock()
+        self._timer = None
+
+    async def _run(self, fn):
+        return await asyncio.get_running_loop().run_in_executor(_SHEETS_EXECUTOR, metrics.carry_labels(fn))
+
+    async def start(self):
+        await self._run(self._write_header)
+        self._timer = asyncio.create_task(self._flush_periodically())
+
+    def _write_header(self):
+        execute_with_retry(self.service.spreadsheets().values().update(
+            spreadsheetId=self.spreadsheet_id,
+            range=f"{self.sheet_name}!A1:{self.last_column}1",
+            valueInputOption="RAW",
+            body={'values': [self.header]}
+        ))
+
+    # Timed as one span per batch, not attributed to whichever article filled it
+    def _append(self, rows):
+        with metrics.span("sheets_append", url=None):
+            result = execute_with_retry(self.service.spreadsheets().values().append(
+                spreadsheetId=self.spreadsheet_id,
+                range=f"{self.sheet_name}!A:{self.last_column}",
+                valueInputOption=self.value_input_option,
+                insertDataOption="INSERT_ROWS",
+                body={'values': rows}
+            ))
+        updated = result.get('updates', {}).get('updatedRows', len(rows))
+        metrics.count("sheet_rows_written", updated)
+        return updated
+
+    async def add(self, row, key=None):
+        self._buffer.append(list(row))
+        self._keys.append(key)
+        if len(self._buffer) >= self.batch_size:
+            await self.flush()
+
+    async def flush(self):
+        async with self._lock:
+            if not self._buffer:
+                return
+            rows, self._buffer = self._buffer, []
+            keys, self._keys = self._keys, []
+            try:
+                updated = await self._run(lambda: self._append(rows))
+            except Exception:
+                # Keep the rows (in order) so the next flush or close() retries them
+                self._buffer = rows + self._buffer
+                self._keys = keys + self._keys
+                raise
+            self.rows_written += updated
+            if self.on_written is not None:
+                self.on_written([key for key in keys if key is not None])
+            print(f"{updated} rows appended to Google Sheet {self.sheet_name}")
+
+    async def _flush_periodically(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f"Periodic flush to {self.sheet_name} failed: {e}")
+
+    async def close(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            try:
+                await self._timer
+            except asyncio.CancelledError:
+                pass
+            self._timer = None
+        await self.flush()
@@ -0,0 +1,118 @@
+from datetime import datetime, timedelta
+import gzip
+import hashlib
+import os
+import re
+import shutil
+from urllib.parse import urljoin
+from capture_index import canonical_url
+
+SNAPSHOT_DIR = 'snapshots' # Compressed article HTML kept for offline re-extraction
+SNAPSHOT_RETENTION_DAYS = 90 # Date directories older than this are deleted at the start of a run; None keeps everything
+
+# First line of every snapshot, so a file alone says where it came from
+SNAPSHOT_HEADER = "<!-- saved from url={url} site={site} captured={captured} -->\n"
+SNAPSHOT_HEADER_RE = re.compile(r"<!-- saved from url=(\S*) site=(\S*) captured=(\S*) -->")
+
+
+# snapshots/<site>/<date>/<basename>_<url hash>.html.gz; the short hash of the
+# canonical URL keeps two articles with the same title on the same day (live
+# blogs, "No title found") from overwriting each other
+def snapshot_path(site, basename, url):
+    date_str = datetime.now().strftime("%Y-%m-%d")
+    url_hash = hashlib.sha1(canonical_url(url).encode("utf-8")).hexdigest()[:8]
+    return os.path.join(SNAPSHOT_DIR, site, date_str, f"{basename}_{url_hash}.html.gz")
+
+
+def save_snapshot(path, url, site, html):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    header = SNAPSHOT_HEADER.format(
+        url=url, site=site, captured=datetime.now().isoformat(timespec="seconds")
+    )
+    with gzip.open(path, 'wt', encoding='utf-8', compresslevel=6) as f:
+        f.write(header)
+        f.write(html)
+
+
+# Delete snapshots/<site>/<date>/ directories older than retention_days, so
+# saving snapshots on every run does not fill the disk. Returns how many went.
+def prune_snapshots(retention_days=SNAPSHOT_RETENTION_DAYS, root=SNAPSHOT_DIR):
+    if retention_days is None or not os.path.isdir(root):
+        return 0
+    cutoff = (datetime.now() - timedelta(days=retention_days)).strftime("%Y-%m-%d")
+    pruned = 0
+    for site in os.listdir(root):
+        site_dir = os.path.join(root, site)
+        if not os.path.isdir(site_dir):
+            continue
+        for date_str in os.listdir(site_dir):
+            # Only directories snapshot_path() names; anything else is left alone
+            if re.fullmatch(r"\d{4}-\d{2}-\d{2}", date_str) and date_str < cutoff:
+                shutil.rmtree(os.path.join(site_dir, date_str))
+                pruned += 1
+    if pruned:
+        print(f"Pruned {pruned} snapshot directories older than {retention_days} days")
+    return pruned
+
+
+# Returns (url, site, html) for a snapshot written by save_snapshot
+def load_snapshot(path):
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        header = f.readline()
+        html = f.read()
+    m = SNAPSHOT_HEADER_RE.match(header)
+    if not m:
+        raise ValueError(f"{path} is not a capture snapshot")
+    return m.group(1), m.group(2), html
+
+
+def find_snapshots(paths):
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                found.extend(os.path.join(root, f) for f in files if f.endswith(".html.gz"))
+        elif path.endswith(".html.gz"):
+            found.append(path)
+    return sorted(found)
+
+
+# Helpers for parsing snapshots and HTTP-fetched markup the way the outlets'
+# JS bundles read the live DOM. selectolax is imported on first use.
+def parse_html(html):
+    from selectolax.lexbor import LexborHTMLParser
+
+    return LexborHTMLParser(html)
+
+
+# element.textContent.trim()
+def text_content(node):
+    return node.text(deep=True).strip() if node is not None else None
+
+
+# element.innerText, approximated by collapsing whitespace
+def inner_text(node):
+    return " ".join(node.text(deep=True).split()) if node is not None else None
+
+
+# document.body.innerText: body text without script/style contents (which are
+# removed from the tree, so read anything else from it first)
+def body_text(tree):
+    tree.strip_tags(["script", "style", "noscript", "template"])
+    if tree.body is None:
+        return ""
+    # Separate every text node so words from adjacent blocks never run together
+    return " ".join(tree.body.text(deep=True, separator=" ").split())
+
+
+def texts(tree, selector, read=text_content):
+    return [read(node) for node in tree.css(selector)]
+
+
+def attrs(tree, selector, name):
+    return [node.attributes.get(name) for node in tree.css(selector) if node.attributes.get(name)]
+
+
+# element.href / element.src: the attribute resolved against the page URL
+def absolute(url, value):
+    return urljoin(url, value) if value else value
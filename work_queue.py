@@ -0,0 +1,212 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+import json
+import sqlite3
+from typing import Optional
+
+WORK_QUEUE_DB = 'work_queue.db' # Article list and per-article progress of every run, for --resume
+
+
+def _now():
+    return datetime.now().isoformat(timespec="seconds")
+
+
+# Progress of one article in a run. Rendering, upload and extraction finish in
+# any order (uploads complete in the background), so each stage is tracked on
+# its own rather than as a single state. Uploads are tracked per artifact:
+# artifacts lists the formats rendered, file_ids maps each one Drive accepted
+# to its file ID.
+@dataclass
+class ArticleState:
+    url: str
+    rendered: bool = False
+    artifacts: Optional[list] = None
+    file_ids: dict = field(default_factory=dict)
+    row: Optional[list] = None
+    written: bool = False
+    skipped: bool = False
+
+    @property
+    def uploaded(self):
+        return self.artifacts is not None and all(fmt in self.file_ids for fmt in self.artifacts)
+
+    # Nothing left to do: unchanged since an earlier run, or archived and written
+    @property
+    def done(self):
+        return self.skipped or (self.written and self.uploaded)
+
+
+# One outlet's run: the Drive folder it uploads to and its article URLs in
+# homepage order, with each article's progress committed as it happens
+class SiteRun:
+    def __init__(self, queue, run_id, site, folder_id):
+        self.conn = queue.conn
+        self.run_id = run_id
+        self.site = site
+        self.folder_id = folder_id
+
+    def urls(self):
+        return [url for url, in self.conn.execute(
+            "SELECT url FROM articles WHERE run_id = ? ORDER BY position", (self.run_id,)
+        )]
+
+    def state(self, url):
+        row = self.conn.execute(
+            "SELECT rendered_at, artifacts, file_ids, row, written_at, skipped FROM articles "
+            "WHERE run_id = ? AND url = ?",
+            (self.run_id, url)
+        ).fetchone()
+        if row is None:
+            return ArticleState(url)
+        rendered_at, artifacts, file_ids, sheet_row, written_at, skipped = row
+        artifacts = json.loads(artifacts) if artifacts is not None else None
+        file_ids = json.loads(file_ids) if file_ids is not None else {}
+        if isinstance(file_ids, list):
+            # Written before uploads were tracked per artifact: all of them finished
+            artifacts = [str(n) for n in range(len(file_ids))]
+            file_ids = dict(zip(artifacts, file_ids))
+        return ArticleState(
+            url,
+            rendered=rendered_at is not None,
+            artifacts=artifacts,
+            file_ids=file_ids,
+            row=json.loads(sheet_row) if sheet_row is not None else None,
+            written=written_at is not None,
+            skipped=bool(skipped),
+        )
+
+    def _update(self, urls, assignment, *values):
+        self.conn.executemany(
+            f"UPDATE articles SET {assignment} WHERE run_id = ? AND url = ?",
+            [(*values, self.run_id, url) for url in urls]
+        )
+        self.conn.commit()
+
+    # artifacts: every format the article needs, including any uploaded earlier
+    def mark_rendered(self, url, artifacts):
+        self._update([url], "rendered_at = ?, artifacts = ?", _now(), json.dumps(list(artifacts)))
+
+    def mark_uploaded(self, url, artifact, file_id):
+        file_ids = self.state(url).file_ids
+        file_ids[artifact] = file_id
+        self._update([url], "file_ids = ?", json.dumps(file_ids))
+
+    def mark_extracted(self, url, row):
+        self._update([url], "row = ?", json.dumps(row))
+
+    def mark_written(self, urls):
+        self._update(urls, "written_at = ?", _now())
+
+    def mark_skipped(self, url):
+        self._update([url], "skipped = 1")
+
+    def counts(self):
+        states = [self.state(url) for url in self.urls()]
+        return {
+            "articles": len(states),
+            "done": sum(s.done for s in states),
+            "uploaded": sum(s.uploaded for s in states),
+            "extracted": sum(s.row is not None for s in states),
+            "written": sum(s.written for s in states),
+        }
+
+    # Close the run once every article is done; an unfinished run is what
+    # --resume picks up
+    def finish_if_complete(self):
+        counts = self.counts()
+        if counts["done"] == counts["articles"]:
+            self.conn.execute("UPDATE runs SET finished_at = ? WHERE id = ?", (_now(), self.run_id))
+            self.conn.commit()
+            return True
+        return False
+
+    def report(self):
+        c = self.counts()
+        print(f"[{self.site}] Work queue run #{self.run_id}: {c['done']} of {c['articles']} articles done "
+              f"({c['uploaded']} uploaded, {c['extracted']} extracted, {c['written']} written)")
+
+
+# SQLite work queue shared by every outlet in a process. Each outlet's article
+# list is stored when its homepage has been captured, and each article's stages
+# are committed as they complete, so a run interrupted by a browser crash or a
+# reboot can be resumed (resume=True) without re-capturing the homepage or
+# repeating any upload, extraction or sheet write that already finished.
+class WorkQueue:
+    def __init__(self, path=WORK_QUEUE_DB, resume=False):
+        self.resume = resume
+        self.runs = []
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(
+            """CREATE TABLE IF NOT EXISTS runs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                site TEXT,
+                folder_id TEXT,
+                started_at TEXT,
+                finished_at TEXT,
+                abandoned_at TEXT
+            );
+            CREATE TABLE IF NOT EXISTS articles (
+                run_id INTEGER,
+                position INTEGER,
+                url TEXT,
+                rendered_at TEXT,
+                artifacts TEXT,
+                file_ids TEXT,
+                row TEXT,
+                written_at TEXT,
+                skipped INTEGER DEFAULT 0,
+                PRIMARY KEY (run_id, url)
+            );"""
+        )
+        columns = {column for _, column, *_ in self.conn.execute("PRAGMA table_info(articles)")}
+        if "artifacts" not in columns:
+            self.conn.execute("ALTER TABLE articles ADD COLUMN artifacts TEXT")
+        columns = {column for _, column, *_ in self.conn.execute("PRAGMA table_info(runs)")}
+        if "abandoned_at" not in columns:
+            self.conn.execute("ALTER TABLE runs ADD COLUMN abandoned_at TEXT")
+        self.conn.commit()
+
+    # The outlet's latest run when resuming and that run never finished, else
+    # None; an older unfinished run is never picked up once a newer one exists
+    def resumable_run(self, site):
+        if not self.resume:
+            return None
+        row = self.conn.execute(
+            "SELECT id, folder_id, finished_at, abandoned_at FROM runs WHERE site = ? ORDER BY id DESC LIMIT 1",
+            (site,)
+        ).fetchone()
+        if row is None or row[2] is not None or row[3] is not None:
+            print(f"[{site}] No interrupted run to resume, starting from the homepage")
+            return None
+        run = SiteRun(self, row[0], site, row[1])
+        self.runs.append(run)
+        return run
+
+    # Starting a new run abandons the outlet's earlier unfinished ones (e.g. a
+    # run with an article that fails every time), so they never get resumed
+    def start_run(self, site, folder_id, urls):
+        self.conn.execute(
+            "UPDATE runs SET abandoned_at = ? WHERE site = ? AND finished_at IS NULL AND abandoned_at IS NULL",
+            (_now(), site)
+        )
+        cursor = self.conn.execute(
+            "INSERT INTO runs (site, folder_id, started_at) VALUES (?, ?, ?)", (site, folder_id, _now())
+        )
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO articles (run_id, position, url) VALUES (?, ?, ?)",
+            [(cursor.lastrowid, position, url) for position, url in enumerate(urls)]
+        )
+        self.conn.commit()
+        run = SiteRun(self, cursor.lastrowid, site, folder_id)
+        self.runs.append(run)
+        return run
+
+    # Once every upload has finished: close the runs that completed and report
+    def finish(self):
+        for run in self.runs:
+            run.finish_if_complete()
+            run.report()
+
+    def close(self):
+        self.conn.close()